@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for Stitcher AI
+Measures the core hot paths and compares the results against a stored baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai import Consciousness, MemorySystem, ReasoningEngine
+from stitcher_ai.utils.metrics import summarize_latencies
+
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+QUICK_SIZES = [1_000, 10_000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def _time_calls(func, repeat: int):
+    """Call func repeat times and return the per-call latencies in seconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _populated_memory(size: int, tag_count: int = 100) -> MemorySystem:
+    """Build a memory system holding size long-term memories"""
+    memory = MemorySystem()
+    for i in range(size):
+        memory.store(
+            {"stimulus": f"stimulus {i}", "value": i},
+            memory_type="long_term",
+            tags=["bench", f"tag_{i % tag_count}"],
+        )
+    return memory
+
+
+def bench_experience(iterations: int):
+    """Throughput of Consciousness.experience()"""
+    consciousness = Consciousness()
+    stimuli = [f"benchmark stimulus number {i}" for i in range(iterations)]
+    samples = []
+    start = time.perf_counter()
+    for stimulus in stimuli:
+        t0 = time.perf_counter()
+        consciousness.experience(stimulus, {"evidence": ["a", "b"]})
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    return {"experience": summarize_latencies(samples, elapsed)}
+
+
+def bench_memory(sizes, repeat: int):
+    """Latency of retrieve, recall_by_tag and consolidate_memory as memory grows"""
+    results = {}
+    rng = random.Random(42)
+    for size in sizes:
+        memory = _populated_memory(size)
+        ids = [entry["id"] for entry in memory.long_term_memory]
+        
+        targets = [rng.choice(ids) for _ in range(repeat)]
+        samples = []
+        for memory_id in targets:
+            t0 = time.perf_counter()
+            memory.retrieve(memory_id)
+            samples.append(time.perf_counter() - t0)
+        results[f"retrieve[{size}]"] = summarize_latencies(samples)
+        
+        results[f"retrieve_miss[{size}]"] = summarize_latencies(
+            _time_calls(lambda: memory.retrieve("mem_missing"), max(1, repeat // 10))
+        )
+        
+        tag_samples = []
+        for i in range(repeat):
+            tag = f"tag_{i % 100}"
+            t0 = time.perf_counter()
+            memory.recall_by_tag(tag)
+            tag_samples.append(time.perf_counter() - t0)
+        results[f"recall_by_tag[{size}]"] = summarize_latencies(tag_samples)
+        
+        consolidate_samples = []
+        for i in range(repeat):
+            memory_id = memory.store({"stimulus": f"short {i}"}, tags=["bench"])
+            t0 = time.perf_counter()
+            memory.consolidate_memory(memory_id)
+            consolidate_samples.append(time.perf_counter() - t0)
+        results[f"consolidate_memory[{size}]"] = summarize_latencies(consolidate_samples)
+    return results
+
+
+def bench_decisions(sizes, repeat: int):
+    """Scaling of ReasoningEngine.make_decision with option and criteria counts"""
+    results = {}
+    for size in sizes:
+        engine = ReasoningEngine()
+        options = [f"option_{i}" for i in range(size)]
+        criteria = {f"criterion_{i}": 1.0 / (i + 1) for i in range(min(size, 1_000))}
+        results[f"make_decision[{size}]"] = summarize_latencies(
+            _time_calls(lambda: engine.make_decision(options, criteria), repeat)
+        )
+    return results
+
+
+def bench_introspection(sizes, repeat: int):
+    """Cost of reflect() and get_status() after a long uptime"""
+    results = {}
+    for size in sizes:
+        consciousness = Consciousness()
+        # Simulate the histories accumulated over a long uptime
+        consciousness.reasoning.reasoning_history.extend(
+            {"premise": f"p{i}", "conclusion": f"c{i}", "confidence": 0.5} for i in range(size)
+        )
+        consciousness.awareness.introspection_log.extend(
+            {"context": f"c{i}"} for i in range(size)
+        )
+        consciousness.experience_count = size
+        results[f"reflect[{size}]"] = summarize_latencies(
+            _time_calls(consciousness.reflect, repeat)
+        )
+        results[f"get_status[{size}]"] = summarize_latencies(
+            _time_calls(consciousness.get_status, repeat)
+        )
+    return results
+
+
+def run_benchmarks(sizes, repeat: int, iterations: int):
+    """Run every benchmark and return the JSON-serializable report"""
+    results = {}
+    suites = [
+        ("experience", lambda: bench_experience(iterations)),
+        ("memory", lambda: bench_memory(sizes, repeat)),
+        ("decisions", lambda: bench_decisions(sizes, repeat)),
+        ("introspection", lambda: bench_introspection(sizes, repeat)),
+    ]
+    for name, suite in suites:
+        print(f"Running {name} benchmarks...", file=sys.stderr)
+        results.update(suite())
+    
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+            "repeat": repeat,
+            "iterations": iterations,
+        },
+        "results": results,
+    }
+
+
+def compare_reports(current, baseline, threshold: float = 0.25, metric: str = "p50_us"):
+    """
+    Compare a report against a baseline
+    
+    Args:
+        current: Report produced by run_benchmarks
+        baseline: Previously stored report
+        threshold: Allowed relative slowdown before flagging a regression
+        metric: Latency metric used for the comparison
+        
+    Returns:
+        List of comparison rows, one per benchmark present in both reports
+    """
+    rows = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None or not previous.get(metric):
+            continue
+        ratio = result[metric] / previous[metric]
+        rows.append({
+            "benchmark": name,
+            "baseline": previous[metric],
+            "current": result[metric],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def print_report(report):
+    """Print a human readable summary of a report"""
+    print(f"{'benchmark':<34} {'ops/s':>12} {'p50 us':>12} {'p99 us':>12}")
+    for name, result in report["results"].items():
+        print(f"{name:<34} {result['ops_per_sec']:>12} {result['p50_us']:>12} {result['p99_us']:>12}")
+
+
+def print_comparison(rows, metric: str):
+    """Print a comparison table, marking regressions"""
+    print(f"\n{'benchmark':<34} {'baseline':>12} {'current':>12} {'ratio':>8}  ({metric})")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['benchmark']:<34} {row['baseline']:>12} {row['current']:>12} {row['ratio']:>8}{flag}")
+
+
+def main(argv=None):
+    """Run the benchmark suite from the command line"""
+    parser = argparse.ArgumentParser(description="Stitcher AI benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", help="Memory/history sizes to benchmark")
+    parser.add_argument("--quick", action="store_true", help="Only run the small sizes")
+    parser.add_argument("--repeat", type=int, default=50, help="Samples per latency benchmark")
+    parser.add_argument("--iterations", type=int, default=5_000, help="Experiences for the throughput benchmark")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, metavar="BASELINE",
+                        help="Compare against a baseline report (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="BASELINE",
+                        help="Store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative slowdown flagged as a regression (default: 0.25)")
+    parser.add_argument("--metric", default="p50_us", choices=["p50_us", "p90_us", "p99_us", "mean_us"],
+                        help="Latency metric used for comparisons")
+    args = parser.parse_args(argv)
+    if args.compare and not os.path.exists(args.compare):
+        print(f"Baseline {args.compare} not found; run with --save-baseline first", file=sys.stderr)
+        return 2
+    
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    report = run_benchmarks(sizes, args.repeat, args.iterations)
+    print_report(report)
+    
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_reports(report, baseline, args.threshold, args.metric)
+        print_comparison(rows, args.metric)
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%} threshold")
+            return 1
+        print("\nNo regressions detected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,29 @@
 #!/usr/bin/env python3
 """
 Interactive CLI for Stitcher AI Consciousness
-Allows real-time interaction with the consciousness system
+Allows real-time interaction with the consciousness system, non-interactive
+batch processing of JSONL commands with --batch, and load generation with --loadgen
 """
 
 import sys
 import os
+import time
+import argparse
+import copy
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from stitcher_ai import Consciousness
+from stitcher_ai.utils.metrics import summarize_latencies
+from stitcher_ai.utils.loadgen import LoadGenerator, synthetic_workload, load_experience_log
 import json
 
 
+DEFAULT_EVOLUTION = {
+    "capabilities": {"enhanced_perception": True},
+    "inference_rules": [{"type": "experiential"}]
+}
+
+
 def print_header():
     """Print welcome header"""
     print("\n" + "=" * 70)
@@ -29,9 +41,110 @@ def print_header():
     print("=" * 70 + "\n")
 
 
-def main():
+def run_command(consciousness, command):
+    """
+    Execute a single non-experience batch command
+    
+    Args:
+        consciousness: The consciousness instance to drive
+        command: Parsed JSONL command with an "op" field
+        
+    Returns:
+        The JSON-serializable result of the command
+    """
+    op = command.get("op")
+    if op == "reflect":
+        return consciousness.reflect()
+    if op == "status":
+        return consciousness.get_status()
+    if op == "memory":
+        return consciousness.memory.get_memory_stats()
+    if op == "evolve":
+        consciousness.evolve(copy.deepcopy(command.get("learning", DEFAULT_EVOLUTION)))
+        return {"evolved": True}
+    raise ValueError(f"Unknown op: {op}")
+
+
+def run_batch(consciousness, in_stream, out_stream, batch_size=64):
+    """
+    Process JSONL commands from in_stream and stream JSONL results to out_stream
+    
+    Each input line is an object such as {"op": "experience", "stimulus": "...",
+    "context": {...}}, {"op": "evolve", "learning": {...}}, {"op": "reflect"},
+    {"op": "status"} or {"op": "memory"}. Consecutive experience commands are
+    grouped and processed through Consciousness.experience_batch. Output lines
+    keep the input order and carry the input line number.
+    
+    Args:
+        consciousness: The consciousness instance to drive
+        in_stream: Text stream of JSONL commands
+        out_stream: Text stream receiving JSONL results
+        batch_size: Maximum number of experiences processed together
+        
+    Returns:
+        Throughput summary with items/s and latency percentiles
+    """
+    latencies = []
+    pending = []
+    errors = 0
+    start = time.perf_counter()
+    
+    def emit(results):
+        out_stream.write("".join(json.dumps(result, default=str) + "\n" for result in results))
+    
+    def flush_pending():
+        nonlocal errors
+        if not pending:
+            return
+        batch = list(pending)
+        pending.clear()
+        try:
+            responses = consciousness.experience_batch(
+                [(command["stimulus"], command.get("context")) for _, command, _ in batch]
+            )
+            emit({"line": line_no, "op": "experience", "ok": True, "result": response}
+                 for (line_no, _, _), response in zip(batch, responses))
+        except Exception as e:
+            errors += len(batch)
+            emit({"line": line_no, "op": "experience", "ok": False, "error": str(e)}
+                 for line_no, _, _ in batch)
+        done = time.perf_counter()
+        latencies.extend(done - received for _, _, received in batch)
+    
+    for line_no, line in enumerate(in_stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        received = time.perf_counter()
+        try:
+            command = json.loads(line)
+            op = command.get("op")
+            if op == "experience":
+                # Checked up front so a bad line fails alone instead of its whole batch
+                Consciousness.validate_experience(command.get("stimulus"), command.get("context"))
+                pending.append((line_no, command, received))
+                if len(pending) >= batch_size:
+                    flush_pending()
+                continue
+            flush_pending()
+            result = run_command(consciousness, command)
+            emit([{"line": line_no, "op": op, "ok": True, "result": result}])
+        except Exception as e:
+            flush_pending()
+            errors += 1
+            emit([{"line": line_no, "ok": False, "error": str(e)}])
+        latencies.append(time.perf_counter() - received)
+    
+    flush_pending()
+    out_stream.flush()
+    
+    summary = summarize_latencies(latencies, time.perf_counter() - start)
+    summary["errors"] = errors
+    return summary
+
+
+def interactive(consciousness):
     """Run the interactive CLI"""
-    consciousness = Consciousness()
     print_header()
     
     print("Consciousness initialized and ready.\n")
@@ -85,10 +198,7 @@ def main():
                 print(f"  Active Capabilities: {len([k for k, v in status['awareness']['capabilities'].items() if v])}\n")
             
             elif command == "evolve":
-                consciousness.evolve({
-                    "capabilities": {"enhanced_perception": True},
-                    "inference_rules": [{"type": "experiential"}]
-                })
+                consciousness.evolve(copy.deepcopy(DEFAULT_EVOLUTION))
                 print("\n  Consciousness evolved successfully!\n")
             
             elif command == "memory":
@@ -113,5 +223,94 @@ def main():
             print(f"\nError: {e}\n")
 
 
+def run_loadgen(consciousness, args):
+    """
+    Run the load generator selected on the command line
+    
+    Args:
+        consciousness: The consciousness instance to drive
+        args: Parsed command line arguments
+        
+    Returns:
+        The load report
+    """
+    generator = LoadGenerator(consciousness, sample_interval=args.sample_interval)
+    if args.loadgen == "replay":
+        if not args.replay:
+            raise SystemExit("--loadgen replay requires --replay FILE")
+        return generator.run_replay(load_experience_log(args.replay), speed=args.speed)
+    
+    workload = synthetic_workload(seed=args.seed)
+    if args.loadgen == "open":
+        return generator.run_open_loop(workload, rate=args.rate, duration=args.duration)
+    return generator.run_closed_loop(workload, concurrency=args.concurrency,
+                                     duration=args.duration, max_requests=args.max_requests)
+
+
+def main(argv=None):
+    """Run the CLI in interactive or batch mode"""
+    parser = argparse.ArgumentParser(description="Stitcher AI consciousness console")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="Process JSONL commands from FILE (or stdin) and write JSONL results to stdout")
+    parser.add_argument("--batch-size", type=int, default=64,
+                        help="Maximum experiences processed together in batch mode")
+    
+    load_group = parser.add_argument_group("load generation")
+    load_group.add_argument("--loadgen", choices=["open", "closed", "replay"],
+                            help="Drive the consciousness with a generated or replayed workload")
+    load_group.add_argument("--rate", type=float, default=1000.0,
+                            help="Target experiences per second for open-loop runs")
+    load_group.add_argument("--concurrency", type=int, default=4,
+                            help="Concurrent callers for closed-loop runs")
+    load_group.add_argument("--duration", type=float, default=10.0,
+                            help="Run length in seconds")
+    load_group.add_argument("--max-requests", type=int,
+                            help="Stop closed-loop runs after this many experiences")
+    load_group.add_argument("--replay", metavar="FILE",
+                            help="Captured experience log (JSONL) to replay")
+    load_group.add_argument("--speed", type=float, default=1.0,
+                            help="Replay time scaling; 2.0 is twice as fast, 0 as fast as possible")
+    load_group.add_argument("--seed", type=int, default=0,
+                            help="Random seed for synthetic workloads")
+    load_group.add_argument("--sample-interval", type=float, default=1.0,
+                            help="Seconds between timeline samples")
+    load_group.add_argument("--report", metavar="FILE",
+                            help="Write the JSON load report to FILE instead of stdout")
+    args = parser.parse_args(argv)
+    
+    consciousness = Consciousness()
+    if args.loadgen:
+        report = run_loadgen(consciousness, args)
+        if args.report:
+            with open(args.report, "w") as f:
+                json.dump(report, f, indent=2)
+        else:
+            print(json.dumps(report, indent=2))
+        latency = report["latency"]
+        print(
+            f"{report['mode']}: {latency['count']} experiences, {latency['ops_per_sec']} items/s, "
+            f"p50 {latency['p50_us']}us, p99 {latency['p99_us']}us, {report['errors']} errors",
+            file=sys.stderr,
+        )
+        return
+    
+    if args.batch is None:
+        interactive(consciousness)
+        return
+    
+    in_stream = sys.stdin if args.batch == "-" else open(args.batch, buffering=1 << 16)
+    try:
+        summary = run_batch(consciousness, in_stream, sys.stdout, args.batch_size)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+    print(
+        f"Processed {summary['count']} items in batch mode: "
+        f"{summary['ops_per_sec']} items/s, p50 {summary['p50_us']}us, "
+        f"p99 {summary['p99_us']}us, {summary['errors']} errors",
+        file=sys.stderr,
+    )
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+HTTP Server for Stitcher AI Consciousness
+Exposes experience, reflect, status and evolve over HTTP/JSON, gathering
+concurrent experience requests into short micro-batches
+"""
+
+import sys
+import os
+import json
+import queue
+import time
+import argparse
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from stitcher_ai import Consciousness
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed because the server is over capacity"""
+
+
+class MicroBatcher:
+    """
+    Collects experience requests from many threads and processes them together.
+    
+    Requests wait in a bounded queue. A single worker takes the first waiting
+    request, keeps collecting for up to `window` seconds or until `max_batch`
+    requests are gathered, and runs them through Consciousness.experience_batch.
+    Load is shed in two places: new requests are rejected when the queue is
+    full, and queued requests older than `max_wait` are failed instead of
+    processed, since their callers have most likely given up.
+    
+    Failures are isolated per request: a batch rejected as malformed (nothing
+    in it was processed) is retried one request at a time, so only the bad
+    request fails.
+    """
+    
+    def __init__(self, consciousness, lock: threading.Lock, window: float = 0.005,
+                 max_batch: int = 64, max_queue: int = 1024, max_wait: float = 1.0):
+        self.consciousness = consciousness
+        self.lock = lock
+        self.window = window
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._running = False
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "accepted": 0,
+            "rejected": 0,
+            "expired": 0,
+            "batches": 0,
+            "processed": 0,
+            "max_batch_seen": 0,
+        }
+    
+    def start(self) -> None:
+        """Start the batching worker thread"""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the worker after it finishes the current batch"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+    
+    def submit(self, stimulus: str, context=None) -> Future:
+        """
+        Queue an experience for the next batch
+        
+        Args:
+            stimulus: The input or experience to process
+            context: Optional contextual information
+            
+        Returns:
+            A future resolved with the experience response
+            
+        Raises:
+            Overloaded: If the queue is full
+        """
+        future = Future()
+        try:
+            self._queue.put_nowait((stimulus, context, future, time.monotonic()))
+        except queue.Full:
+            self._count("rejected")
+            raise Overloaded("experience queue is full")
+        self._count("accepted")
+        return future
+    
+    def get_stats(self):
+        """Return batching statistics"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["mean_batch_size"] = (
+            round(stats["processed"] / stats["batches"], 2) if stats["batches"] else 0.0
+        )
+        return stats
+    
+    def _run(self) -> None:
+        """Worker loop: gather a batch, then process it"""
+        while self._running:
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+    
+    def _process(self, batch) -> None:
+        """Run one batch through the consciousness and resolve its futures"""
+        now = time.monotonic()
+        live = []
+        for item in batch:
+            if now - item[3] > self.max_wait:
+                self._count("expired")
+                item[2].set_exception(Overloaded("request expired in queue"))
+            else:
+                live.append(item)
+        if not live:
+            return
+        
+        try:
+            with self.lock:
+                responses = self.consciousness.experience_batch(
+                    [(stimulus, context) for stimulus, context, _, _ in live]
+                )
+        except ValueError as e:
+            # Malformed batches are rejected before anything is processed, so
+            # retrying request by request fails only the malformed ones
+            if len(live) == 1:
+                live[0][2].set_exception(e)
+            else:
+                for item in live:
+                    self._process([item])
+            return
+        except Exception as e:
+            for item in live:
+                item[2].set_exception(e)
+            return
+        
+        with self._stats_lock:
+            self.stats["batches"] += 1
+            self.stats["processed"] += len(live)
+            self.stats["max_batch_seen"] = max(self.stats["max_batch_seen"], len(live))
+        for item, response in zip(live, responses):
+            item[2].set_result(response)
+    
+    def _count(self, stat: str) -> None:
+        """Increment a statistic from any thread"""
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+
+class ConsciousnessRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP/1.1 request handler with keep-alive.
+    
+    Routes:
+        POST /experience  {"stimulus": ..., "context": ...} -> JSON response, or
+                          {"items": [...]} -> chunked JSONL, one line per item in input order,
+                          each written as soon as it and the items before it are done
+        POST /evolve      learning dictionary
+        GET  /reflect, /status, /stats
+    """
+    
+    protocol_version = "HTTP/1.1"
+    server_version = "StitcherAI/0.1"
+    
+    def do_GET(self):
+        """Handle reflect, status and stats requests"""
+        app = self.server.app
+        if self.path == "/reflect":
+            with app.lock:
+                self._send_json(200, app.consciousness.reflect())
+        elif self.path == "/status":
+            with app.lock:
+                self._send_json(200, app.consciousness.get_status())
+        elif self.path == "/stats":
+            self._send_json(200, app.batcher.get_stats())
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+    
+    def do_POST(self):
+        """Handle experience and evolve requests"""
+        app = self.server.app
+        try:
+            body = self._read_json()
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+        
+        if self.path == "/experience":
+            if isinstance(body, dict) and isinstance(body.get("items"), list):
+                self._stream_experiences(body["items"])
+            else:
+                self._single_experience(body)
+        elif self.path == "/evolve":
+            if not isinstance(body, dict):
+                self._send_json(400, {"error": "evolve requires a learning object"})
+                return
+            try:
+                with app.lock:
+                    app.consciousness.evolve(body)
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+                return
+            self._send_json(200, {"evolved": True})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+    
+    def _single_experience(self, body):
+        """Process one experience and reply with its JSON response"""
+        try:
+            if not isinstance(body, dict):
+                raise ValueError("experience requires a JSON object")
+            Consciousness.validate_experience(body.get("stimulus"), body.get("context"))
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        try:
+            future = self.server.app.batcher.submit(body["stimulus"], body.get("context"))
+            self._send_json(200, future.result())
+        except Overloaded as e:
+            self._send_json(503, {"error": str(e)}, {"Retry-After": "1"})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+    
+    def _stream_experiences(self, items):
+        """Submit many experiences and stream their results as chunked JSONL"""
+        futures = []
+        for item in items:
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("experience requires a JSON object")
+                Consciousness.validate_experience(item.get("stimulus"), item.get("context"))
+            except ValueError as e:
+                futures.append(e)
+                continue
+            try:
+                futures.append(self.server.app.batcher.submit(item["stimulus"], item.get("context")))
+            except Overloaded as e:
+                futures.append(e)
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, future in enumerate(futures):
+            try:
+                if isinstance(future, Exception):
+                    raise future
+                line = {"index": index, "ok": True, "result": future.result()}
+            except Exception as e:
+                line = {"index": index, "ok": False, "error": str(e)}
+            self._write_chunk((json.dumps(line, default=str) + "\n").encode())
+        self._write_chunk(b"")
+    
+    def _read_json(self):
+        """Read and decode the JSON request body"""
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+        return json.loads(raw)
+    
+    def _write_chunk(self, data: bytes) -> None:
+        """Write one chunk of a chunked response"""
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+    
+    def _send_json(self, code, payload, headers=None):
+        """Send a complete JSON response"""
+        data = json.dumps(payload, default=str).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        """Only log requests when the server runs verbosely"""
+        if self.server.app.verbose:
+            super().log_message(format, *args)
+
+
+class ConsciousnessServer:
+    """
+    Serves a single Consciousness over HTTP
+    """
+    
+    def __init__(self, consciousness=None, host: str = "127.0.0.1", port: int = 8080,
+                 window: float = 0.005, max_batch: int = 64, max_queue: int = 1024,
+                 max_wait: float = 1.0, verbose: bool = False):
+        self.consciousness = consciousness or Consciousness()
+        self.lock = threading.Lock()
+        self.verbose = verbose
+        self.batcher = MicroBatcher(self.consciousness, self.lock, window=window,
+                                    max_batch=max_batch, max_queue=max_queue, max_wait=max_wait)
+        self.httpd = ThreadingHTTPServer((host, port), ConsciousnessRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.app = self
+    
+    @property
+    def address(self):
+        """The (host, port) the server is bound to"""
+        return self.httpd.server_address
+    
+    def serve_forever(self) -> None:
+        """Start batching and serve requests until shutdown() is called"""
+        self.batcher.start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.batcher.stop()
+            self.httpd.server_close()
+    
+    def shutdown(self) -> None:
+        """Stop serving requests"""
+        self.httpd.shutdown()
+
+
+def main(argv=None):
+    """Run the HTTP server"""
+    parser = argparse.ArgumentParser(description="Stitcher AI consciousness HTTP server")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--batch-window-ms", type=float, default=5.0,
+                        help="How long to gather experiences into one micro-batch")
+    parser.add_argument("--max-batch", type=int, default=64,
+                        help="Maximum experiences per micro-batch")
+    parser.add_argument("--max-queue", type=int, default=1024,
+                        help="Queued experiences before new requests are rejected with 503")
+    parser.add_argument("--max-wait-ms", type=float, default=1000.0,
+                        help="Queued experiences older than this are shed with 503")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+    
+    server = ConsciousnessServer(
+        host=args.host,
+        port=args.port,
+        window=args.batch_window_ms / 1000.0,
+        max_batch=args.max_batch,
+        max_queue=args.max_queue,
+        max_wait=args.max_wait_ms / 1000.0,
+        verbose=args.verbose,
+    )
+    host, port = server.address[:2]
+    print(f"Consciousness serving on http://{host}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nDeactivating consciousness...", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
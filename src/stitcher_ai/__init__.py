@@ -9,10 +9,26 @@ from .core.consciousness import Consciousness
 from .core.awareness import SelfAwareness
 from .core.reasoning import ReasoningEngine
 from .core.memory import MemorySystem
+from .core.payload_store import PayloadStore
+from .core.similarity import MinHashLSH
+from .core.text_index import InvertedIndex
+from .core.association import AssociationGraph
+from .core.pool import ConsciousnessPool
+from .core.change_feed import ChangeFeed, FileSink
+from .core.shared_memory import SharedMemoryPublisher, SharedMemoryReplica
 
 __all__ = [
     "Consciousness",
     "SelfAwareness",
     "ReasoningEngine",
     "MemorySystem",
+    "PayloadStore",
+    "MinHashLSH",
+    "InvertedIndex",
+    "AssociationGraph",
+    "ConsciousnessPool",
+    "ChangeFeed",
+    "FileSink",
+    "SharedMemoryPublisher",
+    "SharedMemoryReplica",
 ]
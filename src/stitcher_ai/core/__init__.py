@@ -4,10 +4,26 @@ from .consciousness import Consciousness
 from .awareness import SelfAwareness
 from .reasoning import ReasoningEngine
 from .memory import MemorySystem
+from .payload_store import PayloadStore
+from .similarity import MinHashLSH
+from .text_index import InvertedIndex
+from .association import AssociationGraph
+from .pool import ConsciousnessPool
+from .change_feed import ChangeFeed, FileSink
+from .shared_memory import SharedMemoryPublisher, SharedMemoryReplica
 
 __all__ = [
     "Consciousness",
     "SelfAwareness",
     "ReasoningEngine",
     "MemorySystem",
+    "PayloadStore",
+    "MinHashLSH",
+    "InvertedIndex",
+    "AssociationGraph",
+    "ConsciousnessPool",
+    "ChangeFeed",
+    "FileSink",
+    "SharedMemoryPublisher",
+    "SharedMemoryReplica",
 ]
@@ -0,0 +1,305 @@
+"""
+Association Graph Module
+Sparse graph of associations between memories with spreading-activation recall
+"""
+
+from array import array
+from collections import deque
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+
+_EMPTY_INT = np.zeros(0, dtype=np.int64)
+_EMPTY_FLOAT = np.zeros(0, dtype=np.float64)
+
+
+def _build_csr(src: np.ndarray, dst: np.ndarray, weights: np.ndarray, rows: int):
+    """Return (indptr, indices, weights) of the edges grouped by source node"""
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=rows), out=indptr[1:])
+    return indptr, dst[order], weights[order]
+
+
+def _empty_csr():
+    """Return a CSR structure without rows"""
+    return np.zeros(1, dtype=np.int64), _EMPTY_INT, np.zeros(0, dtype=np.float32)
+
+
+def _gather(csr, nodes: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the targets of the edges leaving nodes and the activation they carry"""
+    indptr, indices, weights = csr
+    inside = nodes < len(indptr) - 1
+    nodes, values = nodes[inside], values[inside]
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        return _EMPTY_INT, _EMPTY_FLOAT
+    # Positions of every selected edge, without a Python loop over nodes
+    positions = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+    return indices[positions], weights[positions] * np.repeat(values, counts)
+
+
+class AssociationGraph:
+    """
+    Weighted, undirected association graph between memories.
+    
+    Each memory becomes a node, linked to the memory added just before it
+    (temporal adjacency), to the latest `tag_fanout` memories sharing each of
+    its tags, and to the similar memories passed in by the caller.
+    
+    Edges live in three tiers: a main CSR structure (row pointers, neighbour
+    indices and float32 weights in NumPy arrays), a smaller CSR delta, and an
+    append-only tail that new edges go to. A full tail is folded into the
+    delta, and a delta that grows past about sqrt(main edges * tail size) is
+    merged into main, which balances the cost of the two rebuilds so that
+    appends stay amortized cheap while every lookup stays vectorized. The main
+    merge also drops the edges of removed memories, and their node slots once
+    they outnumber live ones.
+    
+    recall() runs spreading activation: activation starts at one node and is
+    pushed along edges, split in proportion to edge weight over each node's
+    weighted degree and multiplied by `decay` per hop. Each hop is one
+    vectorized gather and reduction over the frontier's edges, keeping the
+    `max_frontier` most activated nodes, so its cost depends on the edges
+    touched rather than the graph size.
+    """
+    
+    def __init__(self, tag_fanout: int = 8, tag_weight: float = 1.0, temporal_weight: float = 0.5,
+                 similarity_weight: float = 1.0, similarity_threshold: float = 0.5,
+                 decay: float = 0.5, max_frontier: int = 10_000, tail_size: int = 16_384):
+        self.tag_fanout = tag_fanout
+        self.tag_weight = tag_weight
+        self.temporal_weight = temporal_weight
+        self.similarity_weight = similarity_weight
+        self.similarity_threshold = similarity_threshold
+        self.decay = decay
+        self.max_frontier = max_frontier
+        self.tail_size = tail_size
+        self._keys = []
+        self._nodes = {}
+        self._alive = bytearray()
+        self._degree = array("d")
+        self._tag_recent = {}
+        self._last_node = None
+        self._dead = 0
+        self._main = _empty_csr()
+        self._delta = _empty_csr()
+        self._delta_edges = (_EMPTY_INT, _EMPTY_INT, np.zeros(0, dtype=np.float32))
+        self._tail_src = array("q")
+        self._tail_dst = array("q")
+        self._tail_weights = array("f")
+    
+    def add(self, key: str, tags: Iterable[str] = (),
+            similar: Iterable[Tuple[str, float]] = ()) -> int:
+        """
+        Add a memory and its associations
+        
+        Args:
+            key: Memory ID
+            tags: Tags of the memory
+            similar: (memory ID, similarity) pairs of similar memories
+            
+        Returns:
+            Number of associations created
+        """
+        if key in self._nodes:
+            self.remove(key)
+        node = len(self._keys)
+        self._keys.append(key)
+        self._nodes[key] = node
+        self._alive.append(1)
+        self._degree.append(0.0)
+        
+        alive = self._alive
+        neighbours = []
+        if self._last_node is not None and alive[self._last_node]:
+            neighbours.append((self._last_node, self.temporal_weight))
+        for tag in dict.fromkeys(tags):
+            recent = self._tag_recent.get(tag)
+            if recent is None:
+                recent = self._tag_recent[tag] = deque(maxlen=self.tag_fanout)
+            neighbours.extend((other, self.tag_weight) for other in recent if alive[other])
+            recent.append(node)
+        for other_key, similarity in similar:
+            other = self._nodes.get(other_key)
+            if other is not None and other != node:
+                neighbours.append((other, similarity * self.similarity_weight))
+        self._last_node = node
+        
+        degree = self._degree
+        for other, weight in neighbours:
+            # Both directions, so lookups only ever follow outgoing edges
+            self._tail_src.extend((node, other))
+            self._tail_dst.extend((other, node))
+            self._tail_weights.extend((weight, weight))
+            degree[node] += weight
+            degree[other] += weight
+        if len(self._tail_src) >= self.tail_size:
+            self._fold_tail()
+        return len(neighbours)
+    
+    def remove(self, key: str) -> bool:
+        """
+        Remove a memory; its edges stop carrying activation
+        
+        Args:
+            key: Memory ID
+            
+        Returns:
+            True if the memory was in the graph
+        """
+        node = self._nodes.pop(key, None)
+        if node is None:
+            return False
+        self._alive[node] = 0
+        self._keys[node] = None
+        self._dead += 1
+        return True
+    
+    def recall(self, key: str, depth: int = 2, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Spread activation from a memory and return the most activated others
+        
+        Args:
+            key: Memory ID to start from
+            depth: Number of hops activation spreads
+            k: Maximum number of results
+            
+        Returns:
+            (memory ID, activation) pairs, most activated first
+        """
+        node = self._nodes.get(key)
+        if node is None or k <= 0:
+            return []
+        alive = np.frombuffer(self._alive, dtype=np.bool_)
+        degree = np.frombuffer(self._degree, dtype=np.float64)
+        frontier_nodes = np.array([node], dtype=np.int64)
+        frontier_values = np.ones(1, dtype=np.float64)
+        reached_nodes = []
+        reached_values = []
+        
+        for _ in range(depth):
+            node_degree = degree[frontier_nodes]
+            values = np.divide(frontier_values, node_degree, out=np.zeros_like(frontier_values),
+                               where=node_degree > 0)
+            targets, activation = self._spread(frontier_nodes, values)
+            if not len(targets):
+                break
+            frontier_nodes, inverse = np.unique(targets, return_inverse=True)
+            frontier_values = np.bincount(inverse, weights=activation) * self.decay
+            live = alive[frontier_nodes]
+            frontier_nodes, frontier_values = frontier_nodes[live], frontier_values[live]
+            if len(frontier_nodes) > self.max_frontier:
+                top = np.argpartition(-frontier_values, self.max_frontier - 1)[:self.max_frontier]
+                frontier_nodes, frontier_values = frontier_nodes[top], frontier_values[top]
+            reached_nodes.append(frontier_nodes)
+            reached_values.append(frontier_values)
+        del alive, degree
+        
+        if not reached_nodes:
+            return []
+        nodes, inverse = np.unique(np.concatenate(reached_nodes), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(reached_values))
+        others = nodes != node
+        nodes, totals = nodes[others], totals[others]
+        if k < len(nodes):
+            top = np.argpartition(-totals, k - 1)[:k]
+            nodes, totals = nodes[top], totals[top]
+        order = np.lexsort((nodes, -totals))
+        return [(self._keys[nodes[i]], float(totals[i])) for i in order]
+    
+    def neighbours(self, key: str) -> List[Tuple[str, float]]:
+        """Return the live direct associations of a memory with their summed weights"""
+        node = self._nodes.get(key)
+        if node is None:
+            return []
+        targets, weights = self._spread(np.array([node], dtype=np.int64), np.ones(1))
+        nodes, inverse = np.unique(targets, return_inverse=True)
+        totals = np.bincount(inverse, weights=weights)
+        return [(self._keys[other], float(total)) for other, total in zip(nodes, totals)
+                if self._alive[other]]
+    
+    def __len__(self) -> int:
+        return len(self._nodes)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._nodes
+    
+    @property
+    def edge_count(self) -> int:
+        """Number of directed edges stored, including those of removed memories"""
+        return len(self._main[1]) + len(self._delta[1]) + len(self._tail_src)
+    
+    def _spread(self, nodes: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the edge targets and activation leaving nodes across all edge tiers"""
+        main_targets, main_activation = _gather(self._main, nodes, values)
+        delta_targets, delta_activation = _gather(self._delta, nodes, values)
+        tail_targets, tail_activation = _EMPTY_INT, _EMPTY_FLOAT
+        if self._tail_src:
+            sources = np.frombuffer(self._tail_src, dtype=np.int64)
+            in_tail = np.isin(sources, nodes)
+            if in_tail.any():
+                lookup = np.zeros(int(nodes.max()) + 1, dtype=np.float64)
+                lookup[nodes] = values
+                tail_targets = np.frombuffer(self._tail_dst, dtype=np.int64)[in_tail]
+                tail_activation = (np.frombuffer(self._tail_weights, dtype=np.float32)[in_tail]
+                                   * lookup[sources[in_tail]])
+            del sources
+        return (np.concatenate([main_targets, delta_targets, tail_targets]),
+                np.concatenate([main_activation, delta_activation, tail_activation]))
+    
+    def _fold_tail(self) -> None:
+        """Move the tail into the delta, merging the delta into main when it has grown"""
+        delta_src, delta_dst, delta_weights = self._delta_edges
+        src = np.concatenate([delta_src, np.frombuffer(self._tail_src, dtype=np.int64)])
+        dst = np.concatenate([delta_dst, np.frombuffer(self._tail_dst, dtype=np.int64)])
+        weights = np.concatenate([delta_weights, np.frombuffer(self._tail_weights, dtype=np.float32)])
+        self._tail_src = array("q")
+        self._tail_dst = array("q")
+        self._tail_weights = array("f")
+        if len(src) > max(4 * self.tail_size, int(np.sqrt(len(self._main[1]) * self.tail_size))):
+            self._merge_main(src, dst, weights)
+        else:
+            self._delta_edges = (src, dst, weights)
+            self._delta = _build_csr(src, dst, weights, len(self._keys))
+    
+    def _merge_main(self, src: np.ndarray, dst: np.ndarray, weights: np.ndarray) -> None:
+        """Rebuild the main CSR from its edges plus the given ones, dropping removed memories"""
+        indptr, main_dst, main_weights = self._main
+        main_src = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+        src = np.concatenate([main_src, src])
+        dst = np.concatenate([main_dst, dst])
+        weights = np.concatenate([main_weights, weights])
+        rows = len(self._keys)
+        
+        if self._dead:
+            alive = np.frombuffer(self._alive, dtype=np.bool_).copy()
+            live = alive[src] & alive[dst]
+            src, dst, weights = src[live], dst[live], weights[live]
+            degree = np.bincount(src, weights=weights, minlength=rows)
+            if self._dead > len(self._nodes):
+                # Renumber the surviving nodes so removed ones stop taking space
+                remap = np.cumsum(alive) - 1
+                src, dst = remap[src], remap[dst]
+                degree = degree[alive]
+                self._keys = [key for key in self._keys if key is not None]
+                self._nodes = {key: node for node, key in enumerate(self._keys)}
+                rows = len(self._keys)
+                self._alive = bytearray(b"\x01" * rows)
+                for tag, recent in list(self._tag_recent.items()):
+                    kept = [int(remap[node]) for node in recent if alive[node]]
+                    if kept:
+                        self._tag_recent[tag] = deque(kept, maxlen=self.tag_fanout)
+                    else:
+                        del self._tag_recent[tag]
+                if self._last_node is not None:
+                    self._last_node = int(remap[self._last_node]) if alive[self._last_node] else None
+                self._dead = 0
+            self._degree = array("d", degree.tobytes())
+        
+        self._main = _build_csr(src, dst, weights, rows)
+        self._delta_edges = (_EMPTY_INT, _EMPTY_INT, np.zeros(0, dtype=np.float32))
+        self._delta = _empty_csr()
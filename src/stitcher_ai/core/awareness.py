@@ -59,6 +59,33 @@ class SelfAwareness:
         self.introspection_log.append(introspection)
         return introspection
     
+    def introspect_many(self, contexts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Perform several introspections at once
+        
+        All of the introspections share one timestamp; each gets its own copy
+        of the state and capabilities.
+        
+        Args:
+            contexts: Context for each introspection
+            
+        Returns:
+            List of introspection results, one per context
+        """
+        timestamp = datetime.now().isoformat()
+        introspections = [
+            {
+                "timestamp": timestamp,
+                "context": context,
+                "state": self.state.copy(),
+                "capabilities_active": self.capabilities.copy(),
+            }
+            for context in contexts
+        ]
+        
+        self.introspection_log.extend(introspections)
+        return introspections
+    
     def update_state(self, updates: Dict[str, Any]) -> None:
         """Update the internal state based on new information"""
         self.state.update(updates)
@@ -0,0 +1,285 @@
+"""
+Change Feed Module
+Append-only feed of memory, reasoning and evolution events for downstream consumers
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class SlowConsumerError(Exception):
+    """Raised when a subscriber's next events were dropped by retention before it read them"""
+    
+    def __init__(self, name: str, missed: int, first_seq: int):
+        super().__init__(f"subscriber {name} fell behind and missed {missed} events; "
+                         f"the oldest retained event is {first_seq}")
+        self.name = name
+        self.missed = missed
+        self.first_seq = first_seq
+
+
+class FileSink:
+    """
+    Appends feed events to a JSONL file, so the feed can be consumed offline.
+    
+    Lines are buffered and written through on flush() or close(); values that
+    are not JSON-serializable are written as strings.
+    """
+    
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+        self._file = open(path, "a", encoding="utf-8")
+    
+    def write(self, event: Dict[str, Any]) -> None:
+        """Append one event"""
+        self._file.write(json.dumps(event, default=str) + "\n")
+    
+    def flush(self) -> None:
+        """Write buffered events to the file"""
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+    
+    def close(self) -> None:
+        """Flush and close the file"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+    
+    @staticmethod
+    def read_events(path: str, after: int = 0, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Read events back from a sink file
+        
+        Args:
+            path: Path of the JSONL file
+            after: Only events with a greater sequence number are returned
+            limit: Optional maximum number of events
+            
+        Yields:
+            Events in sequence order
+        """
+        count = 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if limit is not None and count >= limit:
+                    return
+                if not line.endswith("\n"):
+                    # A partially written last line
+                    return
+                event = json.loads(line)
+                if event["seq"] > after:
+                    count += 1
+                    yield event
+
+
+class Subscription:
+    """
+    A named cursor into a ChangeFeed.
+    
+    The cursor is the sequence number of the last event read; read() returns
+    the events after it and advances it.
+    """
+    
+    def __init__(self, feed: "ChangeFeed", name: str, cursor: int):
+        self.feed = feed
+        self.name = name
+        self.cursor = cursor
+    
+    def read(self, max_events: int = 256) -> List[Dict[str, Any]]:
+        """
+        Read the next batch of events and advance the cursor
+        
+        Args:
+            max_events: Maximum number of events to return
+            
+        Returns:
+            Events in sequence order; empty when caught up
+            
+        Raises:
+            SlowConsumerError: If events after the cursor were already dropped;
+                seek() to a retained position to continue
+        """
+        events = self.feed.read(self.cursor, max_events, subscriber=self.name)
+        if events:
+            self.cursor = events[-1]["seq"]
+        return events
+    
+    def seek(self, cursor: int) -> None:
+        """Move the cursor, e.g. to feed.first_seq - 1 after falling behind"""
+        self.cursor = cursor
+    
+    @property
+    def lag(self) -> int:
+        """Number of published events not yet read"""
+        return self.feed.last_seq - self.cursor
+
+
+class ChangeFeed:
+    """
+    Append-only feed of change events with monotonically increasing sequence numbers.
+    
+    Each event is a dictionary {"seq", "time", "type", "data"}. The most
+    recent `retention` events are kept in memory; readers get the stored event
+    dictionaries themselves, not copies, and must treat them as read-only.
+    Subscribers whose unread events are dropped get a SlowConsumerError on
+    their next read and trigger `on_slow_consumer(name, lag)`, which is
+    called with the feed lock held; subscribers with more than
+    `slow_threshold` of the retention unread are reported as lagging by
+    get_stats(). An optional sink, such as a FileSink, receives every event.
+    """
+    
+    EVENT_TYPES = ("store", "consolidate", "evict", "reason", "decision", "evolve")
+    
+    def __init__(self, retention: int = 10_000, sink: Optional[FileSink] = None,
+                 slow_threshold: float = 0.8,
+                 on_slow_consumer: Optional[Callable[[str, int], None]] = None):
+        if retention < 1:
+            raise ValueError("retention must be at least 1")
+        self.retention = retention
+        self.sink = sink
+        self.slow_threshold = slow_threshold
+        self.on_slow_consumer = on_slow_consumer
+        self.last_seq = 0
+        self._events = []
+        self._start = 0
+        self._subscriptions = {}
+        self._overrun = set()
+        self._lock = threading.Lock()
+        self.stats = {
+            "published": 0,
+            "dropped": 0,
+            "overruns": 0,
+        }
+    
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained event"""
+        return self.last_seq - (len(self._events) - self._start) + 1
+    
+    def publish(self, event_type: str, data: Dict[str, Any]) -> int:
+        """
+        Append an event
+        
+        Args:
+            event_type: One of EVENT_TYPES
+            data: Event payload
+            
+        Returns:
+            The event's sequence number
+        """
+        with self._lock:
+            self.last_seq += 1
+            event = {"seq": self.last_seq, "time": time.time(), "type": event_type, "data": data}
+            self._events.append(event)
+            self.stats["published"] += 1
+            if len(self._events) - self._start > self.retention:
+                self._drop_oldest()
+            if self.sink is not None:
+                self.sink.write(event)
+            return self.last_seq
+    
+    def subscribe(self, name: str, from_seq: Optional[int] = None) -> Subscription:
+        """
+        Register a named subscriber
+        
+        Args:
+            name: Subscriber name, used in statistics and errors
+            from_seq: First sequence number to read; defaults to the next
+                event published, use 1 or first_seq to start from the oldest
+                retained event
+                
+        Returns:
+            The subscription cursor
+        """
+        with self._lock:
+            cursor = self.last_seq if from_seq is None else from_seq - 1
+            subscription = Subscription(self, name, cursor)
+            self._subscriptions[name] = subscription
+            self._overrun.discard(name)
+            return subscription
+    
+    def unsubscribe(self, name: str) -> None:
+        """Remove a subscriber"""
+        with self._lock:
+            self._subscriptions.pop(name, None)
+            self._overrun.discard(name)
+    
+    def read(self, after: int, max_events: int = 256, subscriber: str = "reader") -> List[Dict[str, Any]]:
+        """
+        Return up to max_events events with sequence numbers greater than after
+        
+        Args:
+            after: Sequence number of the last event already seen
+            max_events: Maximum number of events to return
+            subscriber: Name reported if the reader fell behind
+            
+        Returns:
+            Events in sequence order
+            
+        Raises:
+            SlowConsumerError: If events after `after` were already dropped
+        """
+        with self._lock:
+            first = self.first_seq
+            if after + 1 < first:
+                raise SlowConsumerError(subscriber, first - after - 1, first)
+            self._overrun.discard(subscriber)
+            start = self._start + (after + 1 - first)
+            return self._events[start:start + max_events]
+    
+    def flush(self) -> None:
+        """Flush the sink, if any"""
+        if self.sink is not None:
+            with self._lock:
+                self.sink.flush()
+    
+    def close(self) -> None:
+        """Close the sink, if any"""
+        if self.sink is not None:
+            with self._lock:
+                self.sink.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return publication counts and per-subscriber lag"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update({
+                "first_seq": self.first_seq,
+                "last_seq": self.last_seq,
+                "retained": len(self._events) - self._start,
+            })
+            limit = self.slow_threshold * self.retention
+            subscribers = {}
+            for name, subscription in self._subscriptions.items():
+                lag = self.last_seq - subscription.cursor
+                subscribers[name] = {
+                    "cursor": subscription.cursor,
+                    "lag": lag,
+                    "lagging": lag > limit,
+                    "overrun": name in self._overrun,
+                }
+            stats["subscribers"] = subscribers
+            stats["slow_consumers"] = sorted(name for name, info in subscribers.items()
+                                             if info["lagging"] or info["overrun"])
+            return stats
+    
+    def _drop_oldest(self) -> None:
+        """Drop the oldest event, detecting subscribers that had not read it"""
+        dropped_seq = self.first_seq
+        self._start += 1
+        self.stats["dropped"] += 1
+        # Reclaim the dropped prefix in bulk so appends stay amortized O(1)
+        if self._start > self.retention:
+            del self._events[:self._start]
+            self._start = 0
+        for name, subscription in self._subscriptions.items():
+            if subscription.cursor < dropped_seq and name not in self._overrun:
+                self._overrun.add(name)
+                self.stats["overruns"] += 1
+                if self.on_slow_consumer is not None:
+                    self.on_slow_consumer(name, self.last_seq - subscription.cursor)
@@ -0,0 +1,224 @@
+"""
+Memory Columns Module
+Columnar, slot-addressed arrays mirroring per-memory metadata for vectorized queries
+"""
+
+from typing import Any, Dict, Iterable
+
+import numpy as np
+
+
+TIER_DEAD = 0
+TIER_SHORT = 1
+TIER_LONG = 2
+
+
+class MemoryColumns:
+    """
+    Keeps the metadata of every live memory in parallel NumPy arrays.
+    
+    Each memory is assigned a slot on insertion; slot i of `timestamps`,
+    `counts` and `tiers` describes it, and `tag_slots[tag]` lists the slots of
+    the memories carrying that tag. Arrays grow by doubling so inserts are
+    amortized O(1), and slices handed out by the accessors stay valid even
+    when a later insert reallocates. Slots are append-only and therefore in
+    insertion (time) order; dropped memories leave a dead slot until
+    compact() renumbers the survivors, which happens automatically once dead
+    slots outnumber live ones unless `auto_compact` is off. `generation`
+    counts compactions, so holders of slot numbers can tell when they went
+    stale; holders registered with open_reader() can translate them with
+    remap_slots() until they call close_reader(). `time_ordered` stays True while timestamps never decrease
+    with the slot, which allows binary searching them.
+    """
+    
+    def __init__(self, initial_capacity: int = 1024, auto_compact: bool = True):
+        self.auto_compact = auto_compact
+        self.ids = []
+        self.slots = {}
+        self.tag_slots = {}
+        self.dead = 0
+        self.generation = 0
+        self.time_ordered = True
+        self._size = 0
+        self._timestamps = np.zeros(initial_capacity, dtype=np.float64)
+        self._counts = np.zeros(initial_capacity, dtype=np.int64)
+        self._tiers = np.zeros(initial_capacity, dtype=np.int8)
+        self._tag_sizes = {}
+        self._readers = 0
+        self._remaps = {}
+    
+    def add(self, memory_id: str, timestamp: float, tags: Iterable[str], tier: int) -> int:
+        """
+        Assign a slot to a new memory
+        
+        Args:
+            memory_id: ID of the memory
+            timestamp: Creation time as a POSIX timestamp
+            tags: Tags of the memory
+            tier: TIER_SHORT or TIER_LONG
+            
+        Returns:
+            The memory's slot
+        """
+        slot = self._size
+        if slot == len(self._timestamps):
+            self._grow()
+        if slot and timestamp < self._timestamps[slot - 1]:
+            self.time_ordered = False
+        self._timestamps[slot] = timestamp
+        self._counts[slot] = 0
+        self._tiers[slot] = tier
+        self._size += 1
+        self.ids.append(memory_id)
+        self.slots[memory_id] = slot
+        for tag in set(tags):
+            self._append_tag_slot(tag, slot)
+        return slot
+    
+    def remove(self, memory_id: str) -> bool:
+        """Mark a memory's slot as dead; returns False if it is unknown"""
+        slot = self.slots.pop(memory_id, None)
+        if slot is None:
+            return False
+        self._tiers[slot] = TIER_DEAD
+        self.ids[slot] = None
+        self.dead += 1
+        if self.auto_compact and self.dead > max(1024, len(self.slots)):
+            self.compact()
+        return True
+    
+    def set_tier(self, memory_id: str, tier: int) -> None:
+        """Record that a memory moved to another tier"""
+        self._tiers[self.slots[memory_id]] = tier
+    
+    def increment(self, memory_id: str) -> None:
+        """Count one retrieval of a memory"""
+        self._counts[self.slots[memory_id]] += 1
+    
+    def __len__(self) -> int:
+        return len(self.slots)
+    
+    @property
+    def size(self) -> int:
+        """Number of slots in use, including dead ones"""
+        return self._size
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Creation timestamps by slot"""
+        return self._timestamps[:self._size]
+    
+    @property
+    def counts(self) -> np.ndarray:
+        """Retrieval counts by slot"""
+        return self._counts[:self._size]
+    
+    @property
+    def tiers(self) -> np.ndarray:
+        """Tier by slot; TIER_DEAD for dropped memories"""
+        return self._tiers[:self._size]
+    
+    def tag_postings(self, tag: str) -> np.ndarray:
+        """Slots of the memories carrying a tag, possibly including dead slots"""
+        postings = self.tag_slots.get(tag)
+        if postings is None:
+            return np.zeros(0, dtype=np.int64)
+        return postings[:self._tag_sizes[tag]]
+    
+    def open_reader(self) -> int:
+        """Register a holder of slot numbers and return the current generation"""
+        self._readers += 1
+        return self.generation
+    
+    def close_reader(self) -> None:
+        """Unregister a holder of slot numbers, dropping remaps no one needs any more"""
+        self._readers -= 1
+        if not self._readers:
+            self._remaps.clear()
+    
+    def remap_slots(self, slots: np.ndarray, generation: int) -> np.ndarray:
+        """
+        Translate slots numbered in an earlier generation to the current numbering
+        
+        Order is preserved and the slots of memories dropped since are left
+        out. Only generations reached while a reader was open can be
+        translated.
+        
+        Args:
+            slots: Slots as numbered in `generation`
+            generation: Generation returned by open_reader()
+            
+        Returns:
+            The slots in the current numbering
+        """
+        for step in range(generation, self.generation):
+            slots = self._remaps[step][slots]
+            slots = slots[slots >= 0]
+        return slots
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Readers belong to the running process, not to the saved state
+        state = self.__dict__.copy()
+        state["_readers"] = 0
+        state["_remaps"] = {}
+        return state
+    
+    def compact(self) -> Dict[int, int]:
+        """
+        Drop dead slots and renumber the live ones, preserving their order
+        
+        Returns:
+            Mapping of old slot to new slot for every live memory
+        """
+        live = self.tiers != TIER_DEAD
+        old_slots = np.flatnonzero(live)
+        remap = np.full(self._size, -1, dtype=np.int64)
+        remap[old_slots] = np.arange(len(old_slots))
+        
+        capacity = max(1024, 1 << int(len(old_slots)).bit_length())
+        for name in ("_timestamps", "_counts", "_tiers"):
+            column = getattr(self, name)
+            compacted = np.zeros(capacity, dtype=column.dtype)
+            compacted[:len(old_slots)] = column[old_slots]
+            setattr(self, name, compacted)
+        self._size = len(old_slots)
+        
+        for tag in list(self.tag_slots):
+            postings = remap[self.tag_postings(tag)]
+            postings = postings[postings >= 0]
+            if len(postings):
+                self.tag_slots[tag] = postings
+                self._tag_sizes[tag] = len(postings)
+            else:
+                del self.tag_slots[tag]
+                del self._tag_sizes[tag]
+        
+        self.ids = [self.ids[slot] for slot in old_slots]
+        self.slots = {memory_id: slot for slot, memory_id in enumerate(self.ids)}
+        self.dead = 0
+        if self._readers:
+            self._remaps[self.generation] = remap
+        self.generation += 1
+        return {int(old): int(new) for new, old in enumerate(old_slots)}
+    
+    def _grow(self) -> None:
+        """Double the capacity of every column"""
+        capacity = len(self._timestamps) * 2
+        for name in ("_timestamps", "_counts", "_tiers"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+    
+    def _append_tag_slot(self, tag: str, slot: int) -> None:
+        """Append a slot to a tag's postings, growing them by doubling"""
+        postings = self.tag_slots.get(tag)
+        size = self._tag_sizes.get(tag, 0)
+        if postings is None:
+            postings = self.tag_slots[tag] = np.zeros(8, dtype=np.int64)
+        elif size == len(postings):
+            grown = np.zeros(size * 2, dtype=np.int64)
+            grown[:size] = postings
+            postings = self.tag_slots[tag] = grown
+        postings[size] = slot
+        self._tag_sizes[tag] = size + 1
@@ -4,12 +4,64 @@ The main integration point that brings together awareness, reasoning, and memory
 into a unified conscious system
 """
 
-from typing import Dict, Any, Optional
+import os
+import pickle
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime
 
 from .awareness import SelfAwareness
+from .change_feed import ChangeFeed
 from .reasoning import ReasoningEngine
 from .memory import MemorySystem
+from .inference import as_fact, parse_rule
+from .wal import WriteAheadLog
+from .worker import BackgroundWorker
+
+
+def _validate_learning(learning: Any) -> None:
+    """Raise ValueError if a learning cannot be applied"""
+    if not isinstance(learning, dict):
+        raise ValueError("learning must be a dictionary")
+    if not isinstance(learning.get("capabilities", {}), dict):
+        raise ValueError("learning capabilities must be a dictionary")
+    if not isinstance(learning.get("inference_rules", []), (list, tuple)):
+        raise ValueError("learning inference_rules must be a list")
+    for index, rule in enumerate(learning.get("inference_rules", ())):
+        try:
+            parse_rule(rule, index)
+        except TypeError as e:
+            raise ValueError(f"malformed inference rule {index}: {e}") from None
+
+
+class EvolutionTransaction:
+    """
+    Learnings staged by Consciousness.transaction().
+    
+    Learnings are validated as they are staged and only applied, all at once,
+    when the transaction block exits without an error.
+    """
+    
+    def __init__(self):
+        self.learnings = []
+    
+    def evolve(self, learning: Dict[str, Any]) -> None:
+        """
+        Stage a learning
+        
+        Args:
+            learning: Dictionary containing new insights or capabilities
+            
+        Raises:
+            ValueError: If the learning is malformed
+        """
+        _validate_learning(learning)
+        self.learnings.append(learning)
+    
+    def rollback(self) -> None:
+        """Discard every staged learning"""
+        self.learnings = []
 
 
 class Consciousness:
@@ -20,16 +72,82 @@ class Consciousness:
     This class represents the pinnacle of the consciousness architecture,
     coordinating between different cognitive subsystems to create emergent
     intelligent behavior.
+    
+    With a `durability_dir`, memory stores, consolidations and evolutions are
+    written to a write-ahead log in that directory, and the state is recovered
+    from its snapshot and log on startup. Log writes are group-committed, so
+    a crash loses at most `wal_flush_interval` seconds or `wal_flush_size`
+    records. checkpoint() folds the log into a new snapshot.
+    
+    Public operations serialize on `lock`, which is the memory system's lock,
+    so they also exclude direct calls to the public MemorySystem methods.
+    start_background_worker() moves consolidation, index maintenance, history
+    pruning and checkpoints to a BackgroundWorker thread that takes the same
+    lock and yields to incoming experiences and memory reads. Attributes such
+    as `memory.short_term_memory` or `reasoning.reasoning_history` are not
+    guarded; read them through the public methods while a worker runs.
+    
+    evolve_many() and transaction() apply many learnings atomically: one
+    batched rule update, one evolution memory, one consciousness level
+    reassessment and one log record, with the earlier state restored if
+    applying them fails.
+    
+    With a `change_feed`, memory, reasoning and evolution events are
+    published to it for downstream consumers.
     """
     
-    def __init__(self):
+    SNAPSHOT_FILE = "snapshot.pkl"
+    WAL_FILE = "wal.log"
+    
+    def __init__(self, memory: Optional[MemorySystem] = None, durability_dir: Optional[str] = None,
+                 wal_flush_interval: float = 0.05, wal_flush_size: int = 256,
+                 change_feed: Optional[ChangeFeed] = None):
         self.awareness = SelfAwareness()
         self.reasoning = ReasoningEngine()
-        self.memory = MemorySystem()
+        self.memory = memory if memory is not None else MemorySystem()
         self.activation_time = datetime.now()
         self.experience_count = 0
+        self.durability_dir = durability_dir
+        self.wal = None
+        # Shared with the memory system, so its readers exclude housekeeping too
+        self.lock = self.memory.lock
+        self.last_activity = 0.0
+        self.worker = None
+        self._facts_memory_mark = None
+        self._facts_reasoning_mark = 0
+        
+        self.change_feed = None
+        
+        if durability_dir is not None:
+            self._recover(wal_flush_interval, wal_flush_size)
+        if change_feed is not None:
+            # Attached after recovery, so replayed records are not republished
+            self.attach_change_feed(change_feed)
+    
+    @staticmethod
+    def validate_experience(stimulus: Any, context: Any = None) -> None:
+        """
+        Check that a stimulus and context can be processed as an experience
+        
+        Args:
+            stimulus: The input or experience to process
+            context: Optional contextual information
+            
+        Raises:
+            ValueError: If the stimulus is not a string, the context is neither
+                a dictionary nor None, or its evidence is not a list
+        """
+        if not isinstance(stimulus, str):
+            raise ValueError("experience requires a string 'stimulus'")
+        if context is None:
+            return
+        if not isinstance(context, dict):
+            raise ValueError("experience 'context' must be an object or null")
+        if not isinstance(context.get("evidence", []), (list, tuple)):
+            raise ValueError("experience context 'evidence' must be a list")
     
-    def experience(self, stimulus: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def experience(self, stimulus: str, context: Optional[Dict[str, Any]] = None,
+                   merge_threshold: Optional[float] = None) -> Dict[str, Any]:
         """
         Process an experience through the consciousness system
         
@@ -39,15 +157,111 @@ class Consciousness:
         Args:
             stimulus: The input or experience to process
             context: Optional contextual information
-            
+            merge_threshold: If given and the memory system has a near-duplicate
+                index, a stimulus at least this similar to a stored experience is
+                merged into it (bumping its retrieval count) instead of being
+                reasoned about and stored again
+                
         Returns:
             A comprehensive response including awareness, reasoning, and memory operations
+            
+        Raises:
+            ValueError: If the stimulus or context is malformed; nothing is processed
+        """
+        self.validate_experience(stimulus, context)
+        self.last_activity = time.monotonic()
+        with self.lock:
+            self.experience_count += 1
+            
+            if merge_threshold is not None:
+                response = self._merge_near_duplicate(stimulus, merge_threshold)
+                if response is not None:
+                    if self.wal is not None:
+                        self.wal.append("experience", {"count": self.experience_count})
+                    return response
+            
+            # Self-reflect on the current state
+            awareness_state = self.awareness.introspect(f"Processing stimulus: {stimulus[:50]}...")
+            response = self._process_experience(stimulus, context, awareness_state, datetime.now().isoformat())
+            
+            if self.wal is not None:
+                self.wal.append("experience", {"count": self.experience_count})
+            return response
+    
+    def experience_batch(self, items: List[Any]) -> List[Dict[str, Any]]:
         """
-        self.experience_count += 1
+        Process several experiences in one call
+        
+        The batch path amortizes the per-call bookkeeping of experience():
+        awareness snapshots and response timestamps are taken once per batch
+        and shared by every experience in it.
         
-        # Self-reflect on the current state
-        awareness_state = self.awareness.introspect(f"Processing stimulus: {stimulus[:50]}...")
+        Args:
+            items: Stimuli, either plain strings or (stimulus, context) pairs
+            
+        Returns:
+            One response per item, in order, as returned by experience()
+            
+        Raises:
+            ValueError: If any item is malformed; every item is checked before
+                the first one is processed, so nothing is processed then
+        """
+        pairs = [(item, None) if isinstance(item, str) else tuple(item) for item in items]
+        for index, pair in enumerate(pairs):
+            try:
+                if len(pair) != 2:
+                    raise ValueError("expected a stimulus or a (stimulus, context) pair")
+                self.validate_experience(*pair)
+            except ValueError as e:
+                raise ValueError(f"item {index}: {e}") from None
         
+        self.last_activity = time.monotonic()
+        with self.lock:
+            if not pairs:
+                return []
+            
+            timestamp = datetime.now().isoformat()
+            awareness_states = self.awareness.introspect_many(
+                [f"Processing stimulus: {stimulus[:50]}..." for stimulus, _ in pairs]
+            )
+            
+            responses = []
+            for (stimulus, context), awareness_state in zip(pairs, awareness_states):
+                self.experience_count += 1
+                responses.append(self._process_experience(stimulus, context, awareness_state, timestamp))
+            
+            if self.wal is not None:
+                self.wal.append("experience", {"count": self.experience_count})
+            return responses
+    
+    def _merge_near_duplicate(self, stimulus: str, threshold: float) -> Optional[Dict[str, Any]]:
+        """
+        Merge a stimulus into a near-identical stored experience, if there is one
+        """
+        if self.memory.near_duplicate_index is None:
+            return None
+        for match in self.memory.find_near_duplicates(stimulus, threshold):
+            entry = self.memory.retrieve(match["memory_id"])
+            content = entry["content"]
+            if not isinstance(content, dict) or not isinstance(content.get("reasoning"), dict):
+                continue
+            return {
+                "timestamp": datetime.now().isoformat(),
+                "experience_id": self.experience_count,
+                "memory_id": entry["id"],
+                "awareness": content.get("awareness"),
+                "reasoning": content["reasoning"],
+                "reflection": self._generate_reflection(stimulus, content["reasoning"]),
+                "merged": True,
+                "similarity": match["similarity"],
+            }
+        return None
+    
+    def _process_experience(self, stimulus: str, context: Optional[Dict[str, Any]],
+                            awareness_state: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        """
+        Reason about a stimulus, store it and build the response
+        """
         # Reason about the stimulus
         reasoning_result = self.reasoning.reason(stimulus, context)
         
@@ -65,7 +279,7 @@ class Consciousness:
         
         # Synthesize the response
         response = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "experience_id": self.experience_count,
             "memory_id": memory_id,
             "awareness": awareness_state,
@@ -82,15 +296,17 @@ class Consciousness:
         Returns:
             A comprehensive self-assessment
         """
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "uptime": str(datetime.now() - self.activation_time),
-            "experiences_processed": self.experience_count,
-            "self_description": self.awareness.get_self_description(),
-            "memory_stats": self.memory.get_memory_stats(),
-            "reasoning_history_length": len(self.reasoning.get_reasoning_history()),
-            "consciousness_level": self._assess_consciousness_level(),
-        }
+        self.last_activity = time.monotonic()
+        with self.lock:
+            return {
+                "timestamp": datetime.now().isoformat(),
+                "uptime": str(datetime.now() - self.activation_time),
+                "experiences_processed": self.experience_count,
+                "self_description": self.awareness.get_self_description(),
+                "memory_stats": self.memory.get_memory_stats(),
+                "reasoning_history_length": len(self.reasoning.get_reasoning_history()),
+                "consciousness_level": self._assess_consciousness_level(),
+            }
     
     def evolve(self, learning: Dict[str, Any]) -> None:
         """
@@ -98,6 +314,280 @@ class Consciousness:
         
         Args:
             learning: Dictionary containing new insights or capabilities
+            
+        Raises:
+            ValueError: If the learning is malformed
+        """
+        _validate_learning(learning)
+        with self.lock:
+            self._apply_learning(learning)
+            
+            # Store the evolution event in long-term memory
+            self.memory.store(
+                content={
+                    "type": "evolution",
+                    "learning": learning,
+                    "timestamp": datetime.now().isoformat(),
+                },
+                memory_type="long_term",
+                tags=["evolution", "learning"]
+            )
+            
+            # Update consciousness level
+            self._reassess_level()
+            
+            if self.wal is not None:
+                self.wal.append("evolve", {
+                    "learning": learning,
+                    "awareness_level": self.awareness.state.get("awareness_level"),
+                    "experience_count": self.experience_count,
+                })
+            if self.change_feed is not None:
+                self.change_feed.publish("evolve", {
+                    "learnings": [learning],
+                    "awareness_level": self.awareness.state.get("awareness_level"),
+                })
+    
+    def derive(self, max_iterations: int = 100, time_limit: Optional[float] = 1.0) -> Dict[str, Any]:
+        """
+        Forward-chain the inference rules over what the consciousness knows
+        
+        The fact base is fed with the facts stored in memories, either under
+        a "facts" key of their content or of an experience's context, and
+        with ("concluded", premise, conclusion) for each reasoning
+        conclusion. Only memories and reasoning records added since the
+        previous call are read, and facts already known are skipped, so the
+        cost of a call follows what is new rather than the agent's age.
+        
+        Args:
+            max_iterations: Maximum number of evaluation rounds
+            time_limit: Optional wall-clock budget in seconds
+            
+        Returns:
+            The result of ReasoningEngine.forward_chain()
+        """
+        with self.lock:
+            return self.reasoning.forward_chain(self._gather_facts(), max_iterations, time_limit)
+    
+    def evolve_many(self, learnings: List[Dict[str, Any]]) -> int:
+        """
+        Evolve on many learnings at once, atomically
+        
+        Args:
+            learnings: Learnings as accepted by evolve()
+            
+        Returns:
+            Number of learnings applied
+            
+        Raises:
+            ValueError: If any learning is malformed; none are applied then
+        """
+        with self.transaction() as transaction:
+            for learning in learnings:
+                transaction.evolve(learning)
+        return len(learnings)
+    
+    @contextmanager
+    def transaction(self) -> Iterator[EvolutionTransaction]:
+        """
+        Stage learnings and apply them together when the block exits
+        
+        The consciousness lock is held for the whole block. If the block
+        raises, nothing staged is applied.
+        
+        Yields:
+            The EvolutionTransaction to stage learnings on
+        """
+        with self.lock:
+            transaction = EvolutionTransaction()
+            yield transaction
+            self._commit_learnings(transaction.learnings)
+    
+    def attach_change_feed(self, change_feed: Optional[ChangeFeed]) -> None:
+        """
+        Publish memory, reasoning and evolution events to a change feed
+        
+        Args:
+            change_feed: The feed, or None to detach
+        """
+        self.change_feed = change_feed
+        self.memory.change_feed = change_feed
+        self.reasoning.change_feed = change_feed
+    
+    def checkpoint(self) -> None:
+        """
+        Fold the write-ahead log into a new snapshot and truncate the log
+        
+        Raises:
+            ValueError: If durability is not enabled
+        """
+        with self.lock:
+            if self.wal is None:
+                raise ValueError("checkpoint requires a durability_dir")
+            
+            self.wal.flush()
+            data = pickle.dumps({"lsn": self.wal.last_lsn, "consciousness": self},
+                                protocol=pickle.HIGHEST_PROTOCOL)
+            path = os.path.join(self.durability_dir, self.SNAPSHOT_FILE)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self.wal.reset()
+    
+    def start_background_worker(self, **options) -> BackgroundWorker:
+        """
+        Start a background housekeeping worker
+        
+        Args:
+            **options: BackgroundWorker settings, e.g. interval, duty_cycle,
+                idle_threshold, consolidation_policy or checkpoint_interval
+                
+        Returns:
+            The running worker
+            
+        Raises:
+            ValueError: If a worker is already running
+        """
+        if self.worker is not None and self.worker.running:
+            raise ValueError("a background worker is already running")
+        self.worker = BackgroundWorker(self, **options)
+        self.worker.start()
+        return self.worker
+    
+    def stop_background_worker(self) -> Optional[Dict[str, Any]]:
+        """
+        Stop the background worker, if any
+        
+        Returns:
+            The worker's final statistics, or None if no worker was running
+        """
+        worker, self.worker = self.worker, None
+        if worker is None:
+            return None
+        worker.stop()
+        return worker.get_stats()
+    
+    def close(self) -> None:
+        """Stop the background worker and flush and close the write-ahead log, if any"""
+        self.stop_background_worker()
+        if self.wal is not None:
+            self.wal.close()
+            self.wal = None
+            self.memory.wal = None
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # The log, feed, lock and worker belong to the running process, not to the saved state
+        state = self.__dict__.copy()
+        state["wal"] = None
+        state["worker"] = None
+        state["change_feed"] = None
+        del state["lock"]
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.lock = self.memory.lock
+    
+    def _commit_learnings(self, learnings: List[Dict[str, Any]]) -> None:
+        """
+        Apply staged learnings in one step, restoring the earlier state on failure
+        
+        A single evolve_many record, written after every other step, logs the
+        learnings together with the evolution memory, so a failure leaves
+        nothing behind in memory, in the log or on the change feed.
+        """
+        if not learnings:
+            return
+        capabilities = {}
+        rules = []
+        for learning in learnings:
+            capabilities.update(learning.get("capabilities", {}))
+            rules.extend(learning.get("inference_rules", ()))
+        
+        saved_capabilities = self.awareness.capabilities.copy()
+        saved_state = self.awareness.state.copy()
+        saved_rule_count = len(self.reasoning.inference_rules)
+        saved_log_length = len(self.awareness.introspection_log)
+        try:
+            self.awareness.capabilities.update(capabilities)
+            self.reasoning.add_inference_rules(rules)
+            self._reassess_level()
+            timestamp = datetime.now().isoformat()
+            with self.memory.pending_store(
+                content={"type": "evolution", "learnings": learnings, "timestamp": timestamp},
+                memory_type="long_term",
+                tags=["evolution", "learning"],
+                timestamp=timestamp,
+            ) as record:
+                if self.wal is not None:
+                    self.wal.append("evolve_many", {
+                        "learnings": learnings,
+                        "awareness_level": self.awareness.state.get("awareness_level"),
+                        "experience_count": self.experience_count,
+                        "memory": {"id": record["id"], "timestamp": timestamp, "tags": record["tags"]},
+                    })
+        except BaseException:
+            self.awareness.capabilities.clear()
+            self.awareness.capabilities.update(saved_capabilities)
+            self.awareness.state.clear()
+            self.awareness.state.update(saved_state)
+            del self.reasoning.inference_rules[saved_rule_count:]
+            del self.awareness.introspection_log[saved_log_length:]
+            raise
+        if self.change_feed is not None:
+            self.change_feed.publish("evolve", {
+                "learnings": learnings,
+                "awareness_level": self.awareness.state.get("awareness_level"),
+            })
+    
+    def _gather_facts(self) -> List[tuple]:
+        """
+        Collect the well-formed facts found in memories and reasoning conclusions
+        added since the previous call
+        """
+        entries = self.memory.memories_after(self._facts_memory_mark)
+        if entries:
+            self._facts_memory_mark = entries[-1]["id"]
+        candidates = []
+        for entry in entries:
+            content = entry["content"]
+            if not isinstance(content, dict):
+                continue
+            candidates.extend(content.get("facts") or ())
+            context = content.get("context")
+            if isinstance(context, dict):
+                candidates.extend(context.get("facts") or ())
+        
+        facts = []
+        for candidate in candidates:
+            try:
+                facts.append(as_fact(candidate))
+            except ValueError:
+                continue
+        reasoning = self.reasoning
+        start = max(self._facts_reasoning_mark - reasoning.history_offset, 0)
+        for record in reasoning.reasoning_history[start:]:
+            if "premise" in record and "conclusion" in record:
+                facts.append(("concluded", record["premise"], record["conclusion"]))
+        self._facts_reasoning_mark = reasoning.history_offset + len(reasoning.reasoning_history)
+        return facts
+    
+    def _reassess_level(self) -> None:
+        """
+        Advance the awareness level once enough experiences have been processed
+        """
+        current_level = self.awareness.state.get("awareness_level", "emerging")
+        if current_level == "emerging" and self.experience_count > 10:
+            self.awareness.update_state({"awareness_level": "developing"})
+        elif current_level == "developing" and self.experience_count > 50:
+            self.awareness.update_state({"awareness_level": "advanced"})
+    
+    def _apply_learning(self, learning: Dict[str, Any]) -> None:
+        """
+        Apply the capabilities and inference rules of a learning
         """
         # Update awareness with new capabilities
         if "capabilities" in learning:
@@ -107,24 +597,59 @@ class Consciousness:
         if "inference_rules" in learning:
             for rule in learning["inference_rules"]:
                 self.reasoning.add_inference_rule(rule)
+    
+    def _recover(self, flush_interval: float, flush_size: int) -> None:
+        """
+        Restore state from the snapshot and write-ahead log, then start logging
+        """
+        os.makedirs(self.durability_dir, exist_ok=True)
+        snapshot_path = os.path.join(self.durability_dir, self.SNAPSHOT_FILE)
+        wal_path = os.path.join(self.durability_dir, self.WAL_FILE)
         
-        # Store the evolution event in long-term memory
-        self.memory.store(
-            content={
-                "type": "evolution",
-                "learning": learning,
-                "timestamp": datetime.now().isoformat(),
-            },
-            memory_type="long_term",
-            tags=["evolution", "learning"]
-        )
+        snapshot_lsn = 0
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+            snapshot_lsn = snapshot["lsn"]
+            restored = snapshot["consciousness"].__dict__
+            for name in ("awareness", "reasoning", "memory", "activation_time", "experience_count"):
+                setattr(self, name, restored[name])
+            # The restored memory brings its own lock, which readers now take
+            self.lock = self.memory.lock
         
-        # Update consciousness level
-        current_level = self.awareness.state.get("awareness_level", "emerging")
-        if current_level == "emerging" and self.experience_count > 10:
-            self.awareness.update_state({"awareness_level": "developing"})
-        elif current_level == "developing" and self.experience_count > 50:
-            self.awareness.update_state({"awareness_level": "advanced"})
+        records, _ = WriteAheadLog.read_records(wal_path)
+        for lsn, op, payload in records:
+            if lsn > snapshot_lsn:
+                self._replay(op, payload)
+        
+        self.wal = WriteAheadLog(wal_path, flush_interval=flush_interval, flush_size=flush_size)
+        self.wal.last_lsn = max(self.wal.last_lsn, snapshot_lsn)
+        self.memory.wal = self.wal
+    
+    def _replay(self, op: str, payload: Dict[str, Any]) -> None:
+        """
+        Re-apply one write-ahead log record
+        """
+        if op == "store":
+            self.memory.restore_entry(payload)
+        elif op == "consolidate":
+            self.memory.consolidate_memory(payload["memory_id"])
+        elif op == "experience":
+            self.experience_count = payload["count"]
+        elif op in ("evolve", "evolve_many"):
+            learnings = payload["learnings"] if op == "evolve_many" else [payload["learning"]]
+            for learning in learnings:
+                self._apply_learning(learning)
+            self.awareness.state["awareness_level"] = payload["awareness_level"]
+            self.experience_count = payload["experience_count"]
+            if "memory" in payload:
+                # evolve_many logs its evolution memory in the same record
+                self.memory.restore_entry({
+                    **payload["memory"],
+                    "content": {"type": "evolution", "learnings": learnings,
+                                "timestamp": payload["memory"]["timestamp"]},
+                    "memory_type": "long_term",
+                })
     
     def _generate_reflection(self, stimulus: str, reasoning: Dict[str, Any]) -> str:
         """
@@ -161,12 +686,17 @@ class Consciousness:
         Returns:
             Complete status including all subsystems
         """
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "activation_time": self.activation_time.isoformat(),
-            "experiences_processed": self.experience_count,
-            "awareness": self.awareness.get_self_description(),
-            "memory": self.memory.get_memory_stats(),
-            "consciousness_level": self._assess_consciousness_level(),
-            "status": "active" if self.awareness.state.get("active") else "dormant",
-        }
+        self.last_activity = time.monotonic()
+        with self.lock:
+            status = {
+                "timestamp": datetime.now().isoformat(),
+                "activation_time": self.activation_time.isoformat(),
+                "experiences_processed": self.experience_count,
+                "awareness": self.awareness.get_self_description(),
+                "memory": self.memory.get_memory_stats(),
+                "consciousness_level": self._assess_consciousness_level(),
+                "status": "active" if self.awareness.state.get("active") else "dormant",
+            }
+        if self.worker is not None:
+            status["background_worker"] = self.worker.get_stats()
+        return status
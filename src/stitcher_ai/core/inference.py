@@ -0,0 +1,319 @@
+"""
+Inference Module
+Indexed fact base and semi-naive forward chaining over Horn rules
+"""
+
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+Fact = Tuple[Any, ...]
+Bindings = Dict[str, Any]
+
+
+def as_fact(value: Sequence[Any]) -> Fact:
+    """Return a fact as a tuple of terms"""
+    if isinstance(value, (str, bytes)) or not isinstance(value, (list, tuple)) or not value:
+        raise ValueError(f"a fact must be a non-empty list or tuple of terms, got {value!r}")
+    fact = tuple(value)
+    try:
+        hash(fact)
+    except TypeError:
+        raise ValueError(f"fact terms must be hashable, got {value!r}") from None
+    return fact
+
+
+def is_variable(term: Any) -> bool:
+    """Return whether a rule term is a variable such as '?x'"""
+    return isinstance(term, str) and term.startswith("?") and len(term) > 1
+
+
+def parse_rule(rule: Any, index: int) -> Optional[Tuple[str, List[Fact], List[Fact]]]:
+    """
+    Return the (name, body, heads) of a Horn rule, or None if the rule is not one
+    
+    A Horn rule is a dictionary with an "if" list of patterns and a "then"
+    pattern or list of patterns, plus an optional "name". Patterns are
+    facts whose terms may be variables; every variable of a head must occur
+    in the body.
+    
+    Raises:
+        ValueError: If the rule has "if" and "then" but is malformed
+    """
+    if not isinstance(rule, dict) or "if" not in rule or "then" not in rule:
+        return None
+    name = str(rule.get("name", f"rule_{index}"))
+    body = [as_fact(pattern) for pattern in rule["if"]]
+    then = rule["then"]
+    heads = [as_fact(then)] if then and not isinstance(then[0], (list, tuple)) else [as_fact(h) for h in then]
+    if not body:
+        raise ValueError(f"rule {name} has an empty body")
+    bound = {term for pattern in body for term in pattern if is_variable(term)}
+    for head in heads:
+        unbound = [term for term in head if is_variable(term) and term not in bound]
+        if unbound:
+            raise ValueError(f"rule {name} uses unbound variables {unbound} in its conclusion")
+    return name, body, heads
+
+
+class FactBase:
+    """
+    An append-only set of facts with indexes for joins.
+    
+    Facts are tuples of hashable terms and get consecutive sequence numbers.
+    Every fact is indexed by its arity and by each (position, term) pair, and
+    each index bucket lists facts in sequence order, so a pattern is matched
+    against the smallest bucket its constant or bound terms select, limited
+    to a sequence range by binary search. Derived facts record the rule and
+    premises of their first derivation.
+    """
+    
+    def __init__(self):
+        self._seqs = {}
+        self._facts = []
+        self._index = {}
+        self._provenance = {}
+    
+    def add(self, fact: Sequence[Any], rule: Optional[str] = None,
+            premises: Optional[List[Fact]] = None) -> bool:
+        """
+        Add a fact
+        
+        Args:
+            fact: The fact to add
+            rule: Name of the rule that derived it, for derived facts
+            premises: Facts the rule was applied to
+            
+        Returns:
+            True if the fact is new
+        """
+        fact = as_fact(fact)
+        if fact in self._seqs:
+            return False
+        seq = len(self._facts)
+        self._seqs[fact] = seq
+        self._facts.append(fact)
+        arity = len(fact)
+        self._bucket((arity,)).append(seq, fact)
+        for position, term in enumerate(fact):
+            self._bucket((arity, position, term)).append(seq, fact)
+        if rule is not None:
+            self._provenance[fact] = {"rule": rule, "premises": list(premises or ())}
+        return True
+    
+    def __contains__(self, fact: Sequence[Any]) -> bool:
+        return tuple(fact) in self._seqs
+    
+    def __len__(self) -> int:
+        return len(self._facts)
+    
+    def __iter__(self) -> Iterator[Fact]:
+        return iter(self._facts)
+    
+    def provenance(self, fact: Sequence[Any]) -> Optional[Dict[str, Any]]:
+        """Return the rule and premises a fact was derived from, or None if it was asserted"""
+        return self._provenance.get(tuple(fact))
+    
+    def explain(self, fact: Sequence[Any]) -> Dict[str, Any]:
+        """
+        Return the full derivation tree of a fact
+        
+        Args:
+            fact: A fact in the base
+            
+        Returns:
+            {"fact", "rule", "premises"} where premises are derivation trees
+            themselves; asserted facts have rule None and no premises
+            
+        Raises:
+            KeyError: If the fact is not in the base
+        """
+        fact = tuple(fact)
+        if fact not in self._seqs:
+            raise KeyError(fact)
+        origin = self._provenance.get(fact)
+        if origin is None:
+            return {"fact": fact, "rule": None, "premises": []}
+        return {"fact": fact, "rule": origin["rule"],
+                "premises": [self.explain(premise) for premise in origin["premises"]]}
+    
+    def match(self, pattern: Fact, bindings: Bindings, low: int,
+              high: int) -> Iterator[Tuple[Bindings, Fact]]:
+        """
+        Match a pattern against the facts with sequence numbers in [low, high)
+        
+        Args:
+            pattern: Pattern whose terms may be variables
+            bindings: Variable values fixed so far
+            low: First sequence number considered
+            high: Sequence number past the last one considered
+            
+        Yields:
+            (bindings, fact) for each matching fact, with the pattern's
+            variables added to the bindings
+        """
+        arity = len(pattern)
+        bucket = self._index.get((arity,))
+        if bucket is None:
+            return
+        # Scan the smallest bucket selected by a constant or bound term
+        for position, term in enumerate(pattern):
+            if is_variable(term):
+                if term not in bindings:
+                    continue
+                term = bindings[term]
+            candidate = self._index.get((arity, position, term))
+            if candidate is None:
+                return
+            if len(candidate) < len(bucket):
+                bucket = candidate
+        
+        for fact in bucket.range(low, high):
+            extended = bindings
+            for term, value in zip(pattern, fact):
+                if is_variable(term):
+                    bound = extended.get(term, _UNBOUND)
+                    if bound is _UNBOUND:
+                        if extended is bindings:
+                            extended = dict(bindings)
+                        extended[term] = value
+                    elif bound != value:
+                        break
+                elif term != value:
+                    break
+            else:
+                yield extended, fact
+    
+    def _bucket(self, key: tuple) -> "_Bucket":
+        """Return the index bucket for a key, creating it if needed"""
+        bucket = self._index.get(key)
+        if bucket is None:
+            bucket = self._index[key] = _Bucket()
+        return bucket
+
+
+_UNBOUND = object()
+
+
+class _Bucket:
+    """Facts sharing an index key, in sequence order"""
+    
+    __slots__ = ("seqs", "facts")
+    
+    def __init__(self):
+        self.seqs = []
+        self.facts = []
+    
+    def append(self, seq: int, fact: Fact) -> None:
+        self.seqs.append(seq)
+        self.facts.append(fact)
+    
+    def range(self, low: int, high: int) -> Iterator[Fact]:
+        """Yield the facts with sequence numbers in [low, high)"""
+        facts = self.facts
+        for position in range(bisect_left(self.seqs, low), bisect_left(self.seqs, high)):
+            yield facts[position]
+    
+    def __len__(self) -> int:
+        return len(self.facts)
+
+
+def forward_chain(fact_base: FactBase, rules: List[Tuple[str, List[Fact], List[Fact]]],
+                  start: int = 0, new_rules: Sequence[int] = (), max_iterations: int = 100,
+                  time_limit: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Apply rules to a fact base until no new facts are derived
+    
+    Evaluation is semi-naive: each round joins every rule with at least one
+    fact derived in the previous round (the delta), using facts that were
+    already known for the patterns before it and all facts for those after
+    it, so every combination of facts is considered exactly once. The first
+    round's delta is the facts from sequence number `start` on, except for
+    rules listed in `new_rules`, which are evaluated against every fact.
+    
+    Args:
+        fact_base: Facts to extend with the derived facts
+        rules: Parsed rules as returned by parse_rule
+        start: First sequence number not yet chained
+        new_rules: Positions in `rules` never evaluated before
+        max_iterations: Maximum number of rounds
+        time_limit: Optional wall-clock budget in seconds
+        
+    Returns:
+        The derived facts, the number of rounds, whether a fixpoint was
+        reached, why evaluation stopped otherwise, the elapsed time, and
+        "resume_from", the `start` of the next call
+    """
+    began = time.perf_counter()
+    deadline = began + time_limit if time_limit is not None else None
+    pending_rules = set(new_rules)
+    derived = []
+    iterations = 0
+    low = start
+    stopped = None
+    checks = 0
+    
+    while low < len(fact_base) or pending_rules:
+        if iterations >= max_iterations:
+            stopped = "max_iterations"
+            break
+        iterations += 1
+        high = len(fact_base)
+        for position, (name, body, heads) in enumerate(rules):
+            if position in pending_rules:
+                ranges = [[(0, high)] * len(body)]
+            else:
+                ranges = [[(0, low)] * i + [(low, high)] + [(0, high)] * (len(body) - i - 1)
+                          for i in range(len(body))]
+            for pattern_ranges in ranges:
+                for bindings, premises in _join(fact_base, body, pattern_ranges):
+                    for head in heads:
+                        fact = tuple(bindings[term] if is_variable(term) else term for term in head)
+                        if fact_base.add(fact, rule=name, premises=premises):
+                            derived.append(fact)
+                    checks += 1
+                    if deadline is not None and checks % 256 == 0 and time.perf_counter() > deadline:
+                        stopped = "time_limit"
+                        break
+                if stopped:
+                    break
+            if stopped:
+                break
+            pending_rules.discard(position)
+        if stopped:
+            # The interrupted round is redone from its delta on the next call
+            break
+        low = high
+    
+    return {
+        "derived": derived,
+        "iterations": iterations,
+        "fixpoint": stopped is None,
+        "stopped": stopped,
+        "elapsed": round(time.perf_counter() - began, 6),
+        "resume_from": low,
+        "pending_rules": sorted(pending_rules),
+    }
+
+
+def _join(fact_base: FactBase, body: List[Fact],
+          ranges: List[Tuple[int, int]]) -> Iterator[Tuple[Bindings, List[Fact]]]:
+    """Yield the bindings and premises of every way the body matches within the ranges"""
+    # Start with the most selective range, normally the delta
+    order = sorted(range(len(body)), key=lambda i: ranges[i][1] - ranges[i][0])
+    if any(ranges[i][0] >= ranges[i][1] for i in order):
+        return
+    matched = [None] * len(body)
+    
+    def extend(depth: int, bindings: Bindings) -> Iterator[Tuple[Bindings, List[Fact]]]:
+        if depth == len(order):
+            yield bindings, list(matched)
+            return
+        i = order[depth]
+        low, high = ranges[i]
+        for extended, fact in fact_base.match(body[i], bindings, low, high):
+            matched[i] = fact
+            yield from extend(depth + 1, extended)
+    
+    yield from extend(0, {})
@@ -3,23 +3,100 @@ Memory System Module
 Provides short-term and long-term memory capabilities
 """
 
-from typing import Dict, List, Any, Optional
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime
 from collections import deque
 
+import numpy as np
+
+from .association import AssociationGraph
+from .columns import MemoryColumns, TIER_DEAD, TIER_LONG, TIER_SHORT
+from .payload_store import PayloadStore
+from .query import MemoryQuery
+from .similarity import MinHashLSH
+from .text_index import InvertedIndex
+
+
+def _locked(method):
+    """Run a method under the memory lock and record the access as activity"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.last_activity = time.monotonic()
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class MemorySystem:
     """
     Implements memory storage and retrieval capabilities.
     Manages both short-term (working) and long-term memory.
+    
+    When a PayloadStore is given, entries keep a "content_ref" into it instead
+    of their own copy of the content, so repeated contents are stored once.
+    Memories returned by retrieve, recall_by_tag and get_recent_memories carry
+    the rebuilt "content" either way.
+    
+    When a WriteAheadLog is attached as `wal`, stores and consolidations are
+    logged so they can be replayed after a crash. When a ChangeFeed is
+    attached as `change_feed`, stores, consolidations and evictions are
+    published to it.
+    
+    When a MinHashLSH index is given, the stimulus text of every memory is
+    indexed so that near-identical rephrasings can be found with
+    find_near_duplicates().
+    
+    When an InvertedIndex is given, stimulus and conclusion text is indexed
+    for BM25-ranked full-text search(). Memories are indexed on store and
+    dropped on eviction; consolidation keeps their index entry since their
+    text does not change.
+    
+    Timestamps, retrieval counts and tags of every memory are mirrored in
+    MemoryColumns, which recall_relevant() scores in one vectorized pass and
+    query() plans its access paths over.
+    
+    Public methods serialize on `lock` and record the time of the last call
+    in `last_activity`, so a BackgroundWorker sharing the lock neither races
+    with readers nor competes with them for it.
+    
+    When an AssociationGraph is given, every stored memory is linked to the
+    memory stored before it, to recent memories sharing its tags and, with a
+    near-duplicate index, to memories with similar stimuli; recall_associated()
+    spreads activation over these links.
     """
     
-    def __init__(self, short_term_capacity: int = 10):
+    DEFAULT_RELEVANCE_WEIGHTS = {"recency": 0.5, "frequency": 0.3, "tags": 0.2}
+    
+    def __init__(self, short_term_capacity: int = 10,
+                 payload_store: Optional[PayloadStore] = None,
+                 near_duplicate_index: Optional[MinHashLSH] = None,
+                 text_index: Optional[InvertedIndex] = None,
+                 relevance_weights: Optional[Dict[str, float]] = None,
+                 recency_half_life: float = 3600.0,
+                 association_graph: Optional[AssociationGraph] = None):
         self.short_term_memory = deque(maxlen=short_term_capacity)
         self.long_term_memory = []
         self.memory_index = {}
         self.retrieval_count = {}
+        self.payload_store = payload_store
+        self.near_duplicate_index = near_duplicate_index
+        self.text_index = text_index
+        self.association_graph = association_graph
+        self.relevance_weights = {**self.DEFAULT_RELEVANCE_WEIGHTS, **(relevance_weights or {})}
+        self.recency_half_life = recency_half_life
+        self.columns = MemoryColumns()
+        self.lock = threading.RLock()
+        self.last_activity = 0.0
+        self.wal = None
+        self.change_feed = None
+        self._last_id = 0
+        self._entries_by_id = {}
     
+    @_locked
     def store(self, content: Any, memory_type: str = "short_term", 
               tags: Optional[List[str]] = None) -> str:
         """
@@ -32,23 +109,64 @@ class MemorySystem:
             
         Returns:
             Memory ID for later retrieval
+            
+        Raises:
+            Exception: Whatever the attached log raises; the memory is not kept then
         """
-        memory_entry = {
-            "id": self._generate_memory_id(),
-            "content": content,
-            "timestamp": datetime.now().isoformat(),
-            "tags": tags or [],
-            "retrieval_count": 0,
-        }
+        with self.pending_store(content, memory_type, tags) as record:
+            if self.wal is not None:
+                self.wal.append("store", record)
+        return record["id"]
+    
+    @contextmanager
+    def pending_store(self, content: Any, memory_type: str = "short_term",
+                      tags: Optional[List[str]] = None,
+                      timestamp: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Store a memory whose logging is left to the caller
         
-        if memory_type == "short_term":
-            self.short_term_memory.append(memory_entry)
-        else:
-            self.long_term_memory.append(memory_entry)
-            self._index_memory(memory_entry)
+        The memory is added when the block is entered and taken back if the
+        block raises; it is published to the change feed only when the block
+        exits cleanly. The yielded record is what store() logs, and replays
+        with restore_entry().
         
-        return memory_entry["id"]
+        Args:
+            content: The information to store
+            memory_type: Either 'short_term' or 'long_term'
+            tags: Optional tags for categorization
+            timestamp: Optional ISO timestamp; defaults to now
+            
+        Yields:
+            The store record: id, content, timestamp, tags and memory_type
+        """
+        self.last_activity = time.monotonic()
+        with self.lock:
+            memory_entry = self._add_entry(
+                self._generate_memory_id(), content, timestamp or datetime.now().isoformat(),
+                tags or [], memory_type
+            )
+            record = {
+                "id": memory_entry["id"],
+                "content": content,
+                "timestamp": memory_entry["timestamp"],
+                "tags": memory_entry["tags"],
+                "memory_type": memory_type,
+            }
+            try:
+                yield record
+            except BaseException:
+                self._remove_entry(memory_entry)
+                raise
+            if self.change_feed is not None:
+                self.change_feed.publish("store", {
+                    "memory_id": record["id"],
+                    "memory_type": memory_type,
+                    "tags": record["tags"],
+                    "timestamp": record["timestamp"],
+                    "content": content,
+                })
     
+    @_locked
     def retrieve(self, memory_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a specific memory by ID
@@ -59,22 +177,16 @@ class MemorySystem:
         Returns:
             Memory entry if found, None otherwise
         """
-        # Search in short-term memory
-        for entry in self.short_term_memory:
-            if entry["id"] == memory_id:
-                entry["retrieval_count"] += 1
-                self.retrieval_count[memory_id] = entry["retrieval_count"]
-                return entry
+        entry = self._entries_by_id.get(memory_id)
+        if entry is None:
+            return None
         
-        # Search in long-term memory
-        for entry in self.long_term_memory:
-            if entry["id"] == memory_id:
-                entry["retrieval_count"] += 1
-                self.retrieval_count[memory_id] = entry["retrieval_count"]
-                return entry
-        
-        return None
+        entry["retrieval_count"] += 1
+        self.retrieval_count[memory_id] = entry["retrieval_count"]
+        self.columns.increment(memory_id)
+        return self._materialize(entry)
     
+    @_locked
     def recall_by_tag(self, tag: str) -> List[Dict[str, Any]]:
         """
         Retrieve all memories with a specific tag
@@ -90,15 +202,185 @@ class MemorySystem:
         # Search short-term memory
         for entry in self.short_term_memory:
             if tag in entry["tags"]:
-                results.append(entry)
+                results.append(self._materialize(entry))
         
         # Search long-term memory
         for entry in self.long_term_memory:
             if tag in entry["tags"]:
-                results.append(entry)
+                results.append(self._materialize(entry))
+        
+        return results
+    
+    @_locked
+    def recall_relevant(self, k: int = 5, tags: Optional[List[str]] = None,
+                        now: Optional[Any] = None,
+                        weights: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """
+        Recall the memories ranked most relevant right now
+        
+        Each memory's score is a weighted sum of three components in [0, 1]:
+        recency, which halves every `recency_half_life` seconds of age;
+        frequency, its log-scaled retrieval count relative to the most
+        retrieved memory; and the fraction of the given tags it carries.
+        Ties go to the newer memory.
+        
+        Args:
+            k: Maximum number of results
+            tags: Optional tags to score overlap against
+            now: Reference time as a datetime or POSIX timestamp; defaults to now
+            weights: Optional overrides of the "recency", "frequency" and "tags"
+                weights, merged over `relevance_weights`
+                
+        Returns:
+            Results as {"memory_id", "score", "memory"} dictionaries, best first
+        """
+        columns = self.columns
+        if k <= 0 or not len(columns):
+            return []
+        weights = {**self.relevance_weights, **(weights or {})}
+        if now is None:
+            now = datetime.now()
+        if isinstance(now, datetime):
+            now = now.timestamp()
+        
+        candidates = np.flatnonzero(columns.tiers != TIER_DEAD)
+        age = np.maximum(now - columns.timestamps[candidates], 0.0)
+        scores = weights["recency"] * np.exp2(-age / self.recency_half_life)
+        
+        counts = columns.counts[candidates]
+        most = counts.max()
+        if most > 0:
+            scores += weights["frequency"] * (np.log1p(counts) / np.log1p(most))
         
+        unique_tags = list(dict.fromkeys(tags or ()))
+        if unique_tags:
+            hits = np.concatenate([columns.tag_postings(tag) for tag in unique_tags])
+            overlap = np.bincount(hits, minlength=columns.size)[candidates]
+            scores += weights["tags"] * (overlap / len(unique_tags))
+        
+        if k < len(candidates):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        order = top[np.lexsort((-candidates[top], -scores[top]))]
+        
+        results = []
+        for index in order:
+            memory_id = columns.ids[candidates[index]]
+            results.append({"memory_id": memory_id, "score": float(scores[index]),
+                            "memory": self._materialize(self._entries_by_id[memory_id])})
         return results
     
+    def query(self, ids: Optional[List[str]] = None, tags: Optional[List[str]] = None,
+              since: Optional[Any] = None, until: Optional[Any] = None,
+              text: Optional[str] = None, min_retrievals: Optional[int] = None,
+              max_retrievals: Optional[int] = None, tier: Optional[str] = None,
+              limit: Optional[int] = None, newest_first: bool = False) -> MemoryQuery:
+        """
+        Build a lazily evaluated query combining several predicates
+        
+        Unlike retrieve(), matching memories are returned without counting
+        a retrieval. Nothing is evaluated until the query is iterated.
+        
+        Args:
+            ids: Only these memory IDs
+            tags: Tags that every result must carry
+            since: Earliest creation time (inclusive), as a datetime or POSIX timestamp
+            until: Latest creation time (exclusive), as a datetime or POSIX timestamp
+            text: Words that must all appear in the stimulus or conclusion
+            min_retrievals: Minimum retrieval count
+            max_retrievals: Maximum retrieval count
+            tier: Either 'short_term' or 'long_term'
+            limit: Maximum number of results
+            newest_first: Return the newest memories first instead of the oldest
+            
+        Returns:
+            A MemoryQuery; iterate it for the matching memories, or call
+            explain() for its plan
+            
+        Raises:
+            ValueError: If tier is not a known tier
+        """
+        return MemoryQuery(self, ids=ids, tags=tags, since=since, until=until, text=text,
+                           min_retrievals=min_retrievals, max_retrievals=max_retrievals,
+                           tier=tier, limit=limit, newest_first=newest_first)
+    
+    @_locked
+    def find_near_duplicates(self, text: str, threshold: float = 0.8) -> List[Dict[str, Any]]:
+        """
+        Find memories whose stimulus text is nearly identical to the given text
+        
+        Args:
+            text: Text to compare against stored stimuli
+            threshold: Minimum estimated Jaccard similarity between 0 and 1
+            
+        Returns:
+            Matches as {"memory_id", "similarity"} dictionaries, most similar first
+            
+        Raises:
+            ValueError: If the memory system has no near-duplicate index
+        """
+        if self.near_duplicate_index is None:
+            raise ValueError("find_near_duplicates requires a near_duplicate_index")
+        return [
+            {"memory_id": memory_id, "similarity": similarity}
+            for memory_id, similarity in self.near_duplicate_index.query(text, threshold)
+        ]
+    
+    @_locked
+    def search(self, query: str, k: int = 10,
+               tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Full-text search over memory stimuli and conclusions, ranked with BM25
+        
+        Args:
+            query: Free-text query
+            k: Maximum number of results
+            tags: Optional tags that every result must carry
+            
+        Returns:
+            Results as {"memory_id", "score", "memory"} dictionaries, best first
+            
+        Raises:
+            ValueError: If the memory system has no text index
+        """
+        if self.text_index is None:
+            raise ValueError("search requires a text_index")
+        keys = self._ids_with_tags(tags) if tags else None
+        if keys is not None and not keys:
+            return []
+        return [
+            {"memory_id": memory_id, "score": score,
+             "memory": self._materialize(self._entries_by_id[memory_id])}
+            for memory_id, score in self.text_index.search(query, k, keys)
+        ]
+    
+    @_locked
+    def recall_associated(self, memory_id: str, depth: int = 2, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Recall the memories most strongly associated with a memory
+        
+        Args:
+            memory_id: ID of the memory to start from
+            depth: Number of association hops to follow
+            k: Maximum number of results
+            
+        Returns:
+            Results as {"memory_id", "activation", "memory"} dictionaries,
+            most activated first
+            
+        Raises:
+            ValueError: If the memory system has no association graph
+        """
+        if self.association_graph is None:
+            raise ValueError("recall_associated requires an association_graph")
+        return [
+            {"memory_id": other_id, "activation": activation,
+             "memory": self._materialize(self._entries_by_id[other_id])}
+            for other_id, activation in self.association_graph.recall(memory_id, depth, k)
+        ]
+    
+    @_locked
     def consolidate_memory(self, memory_id: str) -> bool:
         """
         Move a memory from short-term to long-term storage
@@ -119,27 +401,209 @@ class MemorySystem:
                 # Add to long-term memory
                 self.long_term_memory.append(found_entry)
                 self._index_memory(found_entry)
+                self.columns.set_tier(memory_id, TIER_LONG)
+                if self.wal is not None:
+                    self.wal.append("consolidate", {"memory_id": memory_id})
+                if self.change_feed is not None:
+                    self.change_feed.publish("consolidate", {"memory_id": memory_id})
                 return True
         return False
     
+    @_locked
+    def memories_after(self, memory_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Return the live memories stored after a given memory, oldest first
+        
+        Memory IDs increase with every store, so the scan walks back from the
+        newest memory and stops at the first one not newer than memory_id;
+        its cost depends on the number of memories returned, not the total.
+        
+        Args:
+            memory_id: ID of a memory, which need not still be stored; None
+                returns every memory
+                
+        Returns:
+            Memory entries stored after memory_id
+        """
+        after = int(memory_id[len("mem_"):]) if memory_id is not None else -1
+        newer = []
+        for entry in reversed(self._entries_by_id.values()):
+            if int(entry["id"][len("mem_"):]) <= after:
+                break
+            newer.append(entry)
+        return [self._materialize(entry) for entry in reversed(newer)]
+    
+    @_locked
     def get_recent_memories(self, count: int = 5) -> List[Dict[str, Any]]:
         """Return the most recent memories from short-term storage"""
-        return list(self.short_term_memory)[-count:]
+        return [self._materialize(entry) for entry in list(self.short_term_memory)[-count:]]
     
+    @_locked
     def get_memory_stats(self) -> Dict[str, Any]:
         """Return statistics about the memory system"""
-        return {
+        stats = {
             "short_term_count": len(self.short_term_memory),
             "short_term_capacity": self.short_term_memory.maxlen,
             "long_term_count": len(self.long_term_memory),
             "total_memories": len(self.short_term_memory) + len(self.long_term_memory),
             "indexed_tags": len(self.memory_index),
         }
+        if self.payload_store is not None:
+            stats["payload_store"] = self.payload_store.get_stats()
+        return stats
+    
+    def restore_entry(self, record: Dict[str, Any]) -> None:
+        """
+        Re-create a memory from a logged store record, keeping its ID and timestamp
+        
+        Args:
+            record: Payload of a 'store' write-ahead log record
+        """
+        self._add_entry(record["id"], record["content"], record["timestamp"],
+                        record["tags"], record["memory_type"])
+        self._last_id = max(self._last_id, int(record["id"][len("mem_"):]))
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # An attached log, feed or lock belongs to the running process, not to the saved state
+        state = self.__dict__.copy()
+        state["wal"] = None
+        state["change_feed"] = None
+        del state["lock"]
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+    
+    def _add_entry(self, memory_id: str, content: Any, timestamp: str,
+                   tags: List[str], memory_type: str) -> Dict[str, Any]:
+        """Create a memory entry and place it in the requested tier"""
+        memory_entry = {"id": memory_id}
+        if self.payload_store is not None:
+            memory_entry["content_ref"] = self.payload_store.put(content)
+        else:
+            memory_entry["content"] = content
+        memory_entry["timestamp"] = timestamp
+        memory_entry["tags"] = tags
+        memory_entry["retrieval_count"] = 0
+        
+        self._entries_by_id[memory_id] = memory_entry
+        similar = []
+        if self.near_duplicate_index is not None:
+            text = self._stimulus_text(content)
+            if text:
+                if self.association_graph is not None:
+                    similar = self.near_duplicate_index.query(
+                        text, self.association_graph.similarity_threshold
+                    )
+                self.near_duplicate_index.add(memory_id, text)
+        if self.association_graph is not None:
+            self.association_graph.add(memory_id, tags, similar)
+        if self.text_index is not None:
+            text = self._search_text(content)
+            if text:
+                self.text_index.add(memory_id, text)
+        self.columns.add(memory_id, datetime.fromisoformat(timestamp).timestamp(), tags,
+                         TIER_SHORT if memory_type == "short_term" else TIER_LONG)
+        
+        if memory_type == "short_term":
+            self._append_short_term(memory_entry)
+        else:
+            self.long_term_memory.append(memory_entry)
+            self._index_memory(memory_entry)
+        return memory_entry
+    
+    def _append_short_term(self, entry: Dict[str, Any]) -> None:
+        """Append to short-term memory, handling the entry pushed out when it is full"""
+        evicted = None
+        if len(self.short_term_memory) == self.short_term_memory.maxlen:
+            evicted = self.short_term_memory[0]
+        self.short_term_memory.append(entry)
+        if evicted is not None:
+            self._on_evict(evicted)
+    
+    def _remove_entry(self, entry: Dict[str, Any]) -> None:
+        """Take back a memory just added by _add_entry, without publishing an eviction"""
+        if self.short_term_memory and self.short_term_memory[-1] is entry:
+            self.short_term_memory.pop()
+        elif self.long_term_memory and self.long_term_memory[-1] is entry:
+            self.long_term_memory.pop()
+            for tag in entry["tags"]:
+                self.memory_index[tag].remove(entry["id"])
+                if not self.memory_index[tag]:
+                    del self.memory_index[tag]
+        self._release_entry(entry)
+    
+    def _on_evict(self, entry: Dict[str, Any]) -> None:
+        """Release the resources held by a memory that was dropped"""
+        self._release_entry(entry)
+        if self.change_feed is not None:
+            self.change_feed.publish("evict", {"memory_id": entry["id"]})
+    
+    def _release_entry(self, entry: Dict[str, Any]) -> None:
+        """Drop a memory from the ID map, columns, payload store and indexes"""
+        self._entries_by_id.pop(entry["id"], None)
+        self.columns.remove(entry["id"])
+        if "content_ref" in entry:
+            self.payload_store.release(entry["content_ref"])
+        if self.near_duplicate_index is not None:
+            self.near_duplicate_index.remove(entry["id"])
+        if self.text_index is not None:
+            self.text_index.remove(entry["id"])
+        if self.association_graph is not None:
+            self.association_graph.remove(entry["id"])
+    
+    @staticmethod
+    def _stimulus_text(content: Any) -> Optional[str]:
+        """Return the stimulus text of a memory's content, if it has one"""
+        if isinstance(content, str):
+            return content
+        if isinstance(content, dict) and isinstance(content.get("stimulus"), str):
+            return content["stimulus"]
+        return None
+    
+    @classmethod
+    def _search_text(cls, content: Any) -> Optional[str]:
+        """Return the searchable text of a memory: its stimulus and reasoning conclusion"""
+        stimulus = cls._stimulus_text(content)
+        if not isinstance(content, dict):
+            return stimulus
+        reasoning = content.get("reasoning")
+        conclusion = reasoning.get("conclusion") if isinstance(reasoning, dict) else None
+        parts = [part for part in (stimulus, conclusion) if isinstance(part, str)]
+        return " ".join(parts) or None
+    
+    def _ids_with_tags(self, tags: List[str]) -> set:
+        """Return the IDs of memories carrying every given tag, using the tag index"""
+        result = None
+        for tag in tags:
+            ids = set(self.memory_index.get(tag, ()))
+            ids.update(entry["id"] for entry in self.short_term_memory if tag in entry["tags"])
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
+    
+    def _materialize(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the entry as seen by callers, with its content rebuilt if deduplicated"""
+        if "content_ref" not in entry:
+            return entry
+        return {
+            "id": entry["id"],
+            "content": self.payload_store.get(entry["content_ref"]),
+            "timestamp": entry["timestamp"],
+            "tags": entry["tags"],
+            "retrieval_count": entry["retrieval_count"],
+        }
     
     def _generate_memory_id(self) -> str:
         """Generate a unique memory ID"""
-        timestamp = datetime.now().timestamp()
-        return f"mem_{int(timestamp * 1000000)}"
+        timestamp = int(datetime.now().timestamp() * 1000000)
+        # Keep IDs unique when several memories are stored within the same microsecond
+        if timestamp <= self._last_id:
+            timestamp = self._last_id + 1
+        self._last_id = timestamp
+        return f"mem_{timestamp}"
     
     def _index_memory(self, entry: Dict[str, Any]) -> None:
         """Index a memory entry by its tags for faster retrieval"""
@@ -0,0 +1,227 @@
+"""
+Payload Store Module
+Content-addressed storage that keeps each unique memory payload only once
+"""
+
+import hashlib
+import pickle
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+class PayloadStore:
+    """
+    Deduplicating, reference-counted storage for memory contents.
+    
+    Contents are split into a tree of nodes: every dict, list and tuple, and
+    every string of at least `min_intern_size` characters, becomes a node
+    addressed by a hash of its canonical form (its structure, keys in order,
+    and scalar values). Identical sub-structures (a
+    repeated stimulus, an unchanged awareness state) are therefore stored once
+    no matter how many memories contain them. Nodes are reference counted and
+    freed when the last memory referring to them is released.
+    
+    Internally each node is (kind, keys, values, ref_mask): `keys` is a shared
+    tuple of dict keys, `values` holds inline scalars or the integer refs of
+    child nodes, and bit i of `ref_mask` marks values[i] as a ref.
+    
+    Nodes that have not been accessed recently can be compressed with zlib
+    through compress_cold(); they are decompressed transparently on access.
+    """
+    
+    def __init__(self, min_intern_size: int = 32, compress_level: int = 6,
+                 compress_min_bytes: int = 256):
+        self.min_intern_size = min_intern_size
+        self.compress_level = compress_level
+        self.compress_min_bytes = compress_min_bytes
+        self._nodes = OrderedDict()
+        self._compressed = {}
+        self._refcounts = {}
+        self._digests = {}
+        self._ref_digest = {}
+        self._key_shapes = {}
+        self._next_ref = 0
+        self.stats = {
+            "puts": 0,
+            "dedup_hits": 0,
+            "compressions": 0,
+            "decompressions": 0,
+        }
+    
+    def put(self, content: Any) -> int:
+        """
+        Store content and return its reference
+        
+        Args:
+            content: The content to store
+            
+        Returns:
+            Content reference to pass to get() and release()
+        """
+        self.stats["puts"] += 1
+        return self._intern(content)
+    
+    def get(self, ref: int) -> Any:
+        """
+        Rebuild the content stored under a reference
+        
+        Args:
+            ref: Reference returned by put()
+            
+        Returns:
+            A fresh copy of the stored content
+        """
+        kind, keys, values, mask = self._load(ref)
+        if kind == "s":
+            return values
+        if mask:
+            values = [self.get(value) if mask >> i & 1 else value for i, value in enumerate(values)]
+        if kind == "d":
+            return dict(zip(keys, values))
+        return list(values) if kind == "l" else tuple(values)
+    
+    def release(self, ref: int) -> None:
+        """
+        Drop one reference to stored content, freeing it when unused
+        
+        Args:
+            ref: Reference returned by put()
+        """
+        count = self._refcounts[ref] - 1
+        if count:
+            self._refcounts[ref] = count
+            return
+        
+        node = self._load(ref)
+        del self._refcounts[ref]
+        del self._nodes[ref]
+        del self._digests[self._ref_digest.pop(ref)]
+        self._release_children(node)
+    
+    def compress_cold(self, keep_hot: int = 1024) -> int:
+        """
+        Compress all but the most recently used nodes
+        
+        Args:
+            keep_hot: Number of recently used nodes left uncompressed
+            
+        Returns:
+            Number of nodes compressed
+        """
+        compressed = 0
+        cold = list(self._nodes)[:max(0, len(self._nodes) - keep_hot)]
+        for ref in cold:
+            try:
+                data = pickle.dumps(self._nodes[ref], protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                continue
+            # Small nodes would not benefit from compression
+            if len(data) >= self.compress_min_bytes:
+                del self._nodes[ref]
+                self._compressed[ref] = zlib.compress(data, self.compress_level)
+                compressed += 1
+        self.stats["compressions"] += compressed
+        return compressed
+    
+    def __contains__(self, ref: int) -> bool:
+        return ref in self._refcounts
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return deduplication and compression statistics"""
+        stats = dict(self.stats)
+        stats.update({
+            "unique_payloads": len(self._refcounts),
+            "references": sum(self._refcounts.values()),
+            "compressed_payloads": len(self._compressed),
+            "compressed_bytes": sum(len(data) for data in self._compressed.values()),
+        })
+        return stats
+    
+    def _intern(self, value: Any) -> int:
+        """Store a value as a node and return its reference"""
+        if isinstance(value, str):
+            node = ("s", None, value, 0)
+            digest = hashlib.blake2b(value.encode("utf-8", "surrogatepass"), digest_size=16,
+                                     person=b"str").digest()
+        else:
+            if isinstance(value, dict):
+                keys = tuple(value)
+                keys = self._key_shapes.setdefault(keys, keys)
+                values, mask, opaque = self._encode_children(value.values())
+                node = ("d", keys, values, mask)
+            else:
+                values, mask, opaque = self._encode_children(value)
+                node = ("l" if isinstance(value, list) else "t", None, values, mask)
+            if opaque:
+                # Arbitrary objects have no reliable repr; they compare by identity
+                canonical = node[:2] + (tuple(self._canonical(v) for v in values), mask)
+            else:
+                canonical = node
+            digest = hashlib.blake2b(repr(canonical).encode("utf-8", "surrogatepass"),
+                                     digest_size=16).digest()
+        
+        ref = self._digests.get(digest)
+        if ref is not None:
+            self._refcounts[ref] += 1
+            self.stats["dedup_hits"] += 1
+            # The stored node already holds references to its children
+            self._release_children(node)
+            return ref
+        
+        ref = self._next_ref
+        self._next_ref += 1
+        self._digests[digest] = ref
+        self._ref_digest[ref] = digest
+        self._refcounts[ref] = 1
+        self._nodes[ref] = node
+        return ref
+    
+    def _encode_children(self, children) -> Tuple[tuple, int, bool]:
+        """Encode child values inline or as node refs, returning (values, ref_mask, opaque)"""
+        values = []
+        mask = 0
+        opaque = False
+        min_size = self.min_intern_size
+        for i, child in enumerate(children):
+            kind = type(child)
+            if kind is dict or kind is list or kind is tuple or (kind is str and len(child) >= min_size):
+                values.append(self._intern(child))
+                mask |= 1 << i
+            elif isinstance(child, (dict, list, tuple)):
+                values.append(self._intern(child))
+                mask |= 1 << i
+            else:
+                opaque = opaque or not isinstance(child, _SCALARS)
+                values.append(child)
+        return tuple(values), mask, opaque
+    
+    def _release_children(self, node: Tuple[str, Any, Any, int]) -> None:
+        """Drop the references a node holds to its children"""
+        kind, _, values, mask = node
+        if not mask:
+            return
+        for i, value in enumerate(values):
+            if mask >> i & 1:
+                self.release(value)
+    
+    @staticmethod
+    def _canonical(value: Any) -> Any:
+        """Hashable stand-in for an inline value; arbitrary objects compare by identity"""
+        if isinstance(value, _SCALARS):
+            return value
+        return ("object", id(value))
+    
+    def _load(self, ref: int) -> Tuple[str, Any, Any, int]:
+        """Return a node, decompressing it if it is cold"""
+        node = self._nodes.get(ref)
+        if node is not None:
+            self._nodes.move_to_end(ref)
+            return node
+        node = pickle.loads(zlib.decompress(self._compressed.pop(ref)))
+        self._nodes[ref] = node
+        self.stats["decompressions"] += 1
+        return node
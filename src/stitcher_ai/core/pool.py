@@ -0,0 +1,257 @@
+"""
+Consciousness Pool Module
+Keeps one Consciousness per session, holding only the most recently used
+sessions in memory and hibernating the rest to disk
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .consciousness import Consciousness
+from ..utils.metrics import summarize_latencies
+
+
+class ConsciousnessPool:
+    """
+    A pool of Consciousness instances keyed by session ID.
+    
+    At most `max_resident` instances are kept in memory. When the limit is
+    exceeded the least recently used instance is pickled, zlib-compressed and
+    written to `storage_dir`; it is rehydrated transparently on its next access.
+    Instances borrowed through session() are pinned and never hibernated
+    while in use. Instances returned by get() are not pinned: any later
+    access to another session may hibernate them, after which changes made
+    through the returned reference are lost. An instance that is in the
+    middle of an operation on another thread (holding its `lock`) is skipped
+    rather than hibernated, so a snapshot is never taken mid-update.
+    """
+    
+    def __init__(self, storage_dir: str, max_resident: int = 128, compress_level: int = 6,
+                 factory: Callable[[], Consciousness] = Consciousness):
+        if max_resident < 1:
+            raise ValueError("max_resident must be at least 1")
+        self.storage_dir = storage_dir
+        self.max_resident = max_resident
+        self.compress_level = compress_level
+        self.factory = factory
+        self._resident = OrderedDict()
+        self._pins = {}
+        self._disk_bytes = {}
+        self._lock = threading.RLock()
+        self._hibernate_latency = deque(maxlen=1000)
+        self._wake_latency = deque(maxlen=1000)
+        self.stats = {
+            "hits": 0,
+            "wakes": 0,
+            "created": 0,
+            "hibernations": 0,
+        }
+        os.makedirs(storage_dir, exist_ok=True)
+        for name in os.listdir(storage_dir):
+            if name.endswith(".state"):
+                path = os.path.join(storage_dir, name)
+                self._disk_bytes[path] = os.path.getsize(path)
+    
+    def get(self, session_id: str) -> Consciousness:
+        """
+        Return the consciousness for a session, waking or creating it if needed
+        
+        The instance is not pinned: a later access to another session may
+        hibernate it, and changes made through the returned reference after
+        that are silently lost. Use session() to keep it resident while it is
+        being used; get() is only safe for a single call made right away with
+        no other pool access in between.
+        
+        Args:
+            session_id: The session to look up
+            
+        Returns:
+            The resident Consciousness instance for the session
+        """
+        with self._lock:
+            consciousness = self._resident.get(session_id)
+            if consciousness is not None:
+                self._resident.move_to_end(session_id)
+                self.stats["hits"] += 1
+                return consciousness
+            
+            consciousness = self._wake(session_id)
+            if consciousness is None:
+                consciousness = self.factory()
+                self.stats["created"] += 1
+            self._resident[session_id] = consciousness
+            self._enforce_limit(keep=session_id)
+            return consciousness
+    
+    @contextmanager
+    def session(self, session_id: str) -> Iterator[Consciousness]:
+        """
+        Borrow a session's consciousness, keeping it resident until released
+        
+        Args:
+            session_id: The session to borrow
+        """
+        with self._lock:
+            consciousness = self.get(session_id)
+            self._pins[session_id] = self._pins.get(session_id, 0) + 1
+        try:
+            yield consciousness
+        finally:
+            with self._lock:
+                self._pins[session_id] -= 1
+                if not self._pins[session_id]:
+                    del self._pins[session_id]
+                self._enforce_limit()
+    
+    def hibernate(self, session_id: str) -> bool:
+        """
+        Write a resident session to disk and release it from memory
+        
+        Args:
+            session_id: The session to hibernate
+            
+        Returns:
+            True if the session was hibernated, False if it is not resident, is
+            pinned or is busy on another thread
+        """
+        with self._lock:
+            if session_id not in self._resident or session_id in self._pins:
+                return False
+            return self._try_hibernate(session_id)
+    
+    def hibernate_all(self) -> int:
+        """Hibernate every unpinned resident session and return how many were written"""
+        with self._lock:
+            return sum(self.hibernate(session_id) for session_id in list(self._resident))
+    
+    def remove(self, session_id: str) -> bool:
+        """
+        Drop a session from memory and disk
+        
+        Args:
+            session_id: The session to remove
+            
+        Returns:
+            True if the session existed
+        """
+        with self._lock:
+            existed = self._resident.pop(session_id, None) is not None
+            path = self._path(session_id)
+            if os.path.exists(path):
+                os.remove(path)
+                existed = True
+            self._disk_bytes.pop(path, None)
+            return existed
+    
+    def is_resident(self, session_id: str) -> bool:
+        """Check whether a session is currently held in memory"""
+        return session_id in self._resident
+    
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._resident or os.path.exists(self._path(session_id))
+    
+    def get_stats(self, include_resident_bytes: bool = False) -> Dict[str, Any]:
+        """
+        Return statistics about the pool
+        
+        Args:
+            include_resident_bytes: Also estimate the memory held by resident
+                sessions, measured as their serialized size (costs one pickle per
+                session). Sessions in use on another thread are not measured;
+                `resident_bytes_skipped` counts them
+                
+        Returns:
+            Hit rate, hibernate/wake latencies, resident and on-disk counts and sizes
+        """
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["wakes"] + self.stats["created"]
+            stats = dict(self.stats)
+            stats.update({
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "resident": len(self._resident),
+                "pinned": len(self._pins),
+                "max_resident": self.max_resident,
+                "hibernated": len(self._disk_bytes),
+                "disk_bytes": sum(self._disk_bytes.values()),
+                "hibernate_latency": summarize_latencies(list(self._hibernate_latency)),
+                "wake_latency": summarize_latencies(list(self._wake_latency)),
+            })
+            if include_resident_bytes:
+                stats["resident_bytes"] = 0
+                stats["resident_bytes_skipped"] = 0
+                for consciousness in self._resident.values():
+                    if not consciousness.lock.acquire(blocking=False):
+                        stats["resident_bytes_skipped"] += 1
+                        continue
+                    try:
+                        stats["resident_bytes"] += len(
+                            pickle.dumps(consciousness, protocol=pickle.HIGHEST_PROTOCOL)
+                        )
+                    finally:
+                        consciousness.lock.release()
+            return stats
+    
+    def _enforce_limit(self, keep: Optional[str] = None) -> None:
+        """Hibernate least recently used sessions until the pool is within its limit"""
+        if len(self._resident) <= self.max_resident:
+            return
+        for session_id in list(self._resident):
+            if len(self._resident) <= self.max_resident:
+                break
+            if session_id != keep and session_id not in self._pins:
+                self._try_hibernate(session_id)
+    
+    def _try_hibernate(self, session_id: str) -> bool:
+        """Hibernate a resident session unless another thread is using it"""
+        consciousness = self._resident[session_id]
+        if not consciousness.lock.acquire(blocking=False):
+            return False
+        try:
+            self._hibernate(session_id, consciousness)
+            del self._resident[session_id]
+        finally:
+            consciousness.lock.release()
+        return True
+    
+    def _hibernate(self, session_id: str, consciousness: Consciousness) -> None:
+        """Serialize a session to its state file"""
+        start = time.perf_counter()
+        data = zlib.compress(
+            pickle.dumps(consciousness, protocol=pickle.HIGHEST_PROTOCOL), self.compress_level
+        )
+        path = self._path(session_id)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._disk_bytes[path] = len(data)
+        self.stats["hibernations"] += 1
+        self._hibernate_latency.append(time.perf_counter() - start)
+    
+    def _wake(self, session_id: str) -> Optional[Consciousness]:
+        """Load a hibernated session, or return None if there is none"""
+        path = self._path(session_id)
+        start = time.perf_counter()
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        consciousness = pickle.loads(zlib.decompress(data))
+        os.remove(path)
+        self._disk_bytes.pop(path, None)
+        self.stats["wakes"] += 1
+        self._wake_latency.append(time.perf_counter() - start)
+        return consciousness
+    
+    def _path(self, session_id: str) -> str:
+        """Return the state file path for a session"""
+        digest = hashlib.sha1(session_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.storage_dir, f"{digest}.state")
@@ -0,0 +1,291 @@
+"""
+Memory Query Module
+Lazily evaluated memory queries with cost-based access path selection
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .columns import TIER_DEAD, TIER_LONG, TIER_SHORT
+from .similarity import tokenize
+
+
+_TIERS = {"short_term": TIER_SHORT, "long_term": TIER_LONG}
+
+# Preferred order among access paths with equal estimates
+_ACCESS_PATHS = ["id_index", "tag_postings", "time_index", "text_index", "full_scan"]
+
+Moment = Union[datetime, float, None]
+
+
+def _to_timestamp(moment: Moment) -> Optional[float]:
+    """Convert a datetime or POSIX timestamp to a POSIX timestamp"""
+    if isinstance(moment, datetime):
+        return moment.timestamp()
+    return moment
+
+
+class MemoryQuery:
+    """
+    A combined memory query, built by MemorySystem.query().
+    
+    When iterated, the query picks the access path with the fewest estimated
+    candidate rows: the ID index, the postings of its rarest tag, a binary
+    search of the time-ordered timestamp column, the text index, or a full
+    scan of the memory columns. Candidates are then filtered chunk by chunk
+    with vectorized predicates on the columns, and matching memories are
+    yielded one at a time, so a limit or an early break stops the work.
+    Planning and each chunk run under the memory lock, which is released
+    while matches are handed to the caller. Each chunk sees memory as it is
+    when the chunk is evaluated; if the memory columns are compacted in
+    between, whether by short-term evictions or by a background worker, the
+    pending candidate slots are remapped to the new numbering. all() holds
+    the lock throughout and sees one consistent state.
+    
+    explain() reports the chosen plan with its estimated and, once the query
+    has run, actual row counts.
+    """
+    
+    CHUNK_SIZE = 256
+    DEFAULT_SELECTIVITY = 0.3
+    
+    def __init__(self, memory, ids: Optional[List[str]] = None, tags: Optional[List[str]] = None,
+                 since: Moment = None, until: Moment = None, text: Optional[str] = None,
+                 min_retrievals: Optional[int] = None, max_retrievals: Optional[int] = None,
+                 tier: Optional[str] = None, limit: Optional[int] = None, newest_first: bool = False):
+        if tier is not None and tier not in _TIERS:
+            raise ValueError(f"tier must be one of {sorted(_TIERS)}")
+        self.memory = memory
+        self.ids = list(dict.fromkeys(ids)) if ids is not None else None
+        self.tags = list(dict.fromkeys(tags or ()))
+        self.since = _to_timestamp(since)
+        self.until = _to_timestamp(until)
+        self.text = text
+        self.terms = set(tokenize(text)) if text else set()
+        self.min_retrievals = min_retrievals
+        self.max_retrievals = max_retrievals
+        self.tier = tier
+        self.limit = limit
+        self.newest_first = newest_first
+        self._plan = None
+        self._actual = None
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        memory = self.memory
+        with memory.lock:
+            memory.last_activity = time.monotonic()
+            plan = self._plan = self._build_plan()
+            actual = self._actual = {"candidates": 0, "rows": 0}
+            if self.limit is not None and self.limit <= 0:
+                return
+            columns = memory.columns
+            access_tag = plan["index_key"] if plan["access_path"] == "tag_postings" else None
+            filter_tags = [tag for tag in self.tags if tag != access_tag]
+            id_slots = self._id_slots() if self.ids is not None and plan["access_path"] != "id_index" else None
+            text_filter = self.terms and plan["access_path"] != "text_index"
+            chunks = self._candidate_chunks(plan)
+            generation = columns.open_reader()
+        
+        try:
+            while True:
+                # Each chunk is evaluated under the memory lock, which is released
+                # before its rows are handed to the caller
+                remaining = self.limit - actual["rows"] if self.limit is not None else None
+                with memory.lock:
+                    memory.last_activity = time.monotonic()
+                    rows = self._evaluate_chunk(next(chunks, None), columns, generation,
+                                                filter_tags, id_slots, text_filter, remaining)
+                if rows is None:
+                    return
+                for entry in rows:
+                    actual["rows"] += 1
+                    yield entry
+                if remaining is not None and actual["rows"] >= self.limit:
+                    return
+        finally:
+            with memory.lock:
+                columns.close_reader()
+    
+    def _evaluate_chunk(self, chunk: Optional[np.ndarray], columns, generation: int,
+                        filter_tags: List[str], id_slots: Optional[np.ndarray],
+                        text_filter: bool, remaining: Optional[int]) -> Optional[List[Dict[str, Any]]]:
+        """Return up to `remaining` matching memories of one candidate chunk, or None once exhausted"""
+        if chunk is None:
+            return None
+        if columns.generation != generation:
+            # The candidates were numbered before a compaction
+            chunk = columns.remap_slots(chunk, generation)
+            if id_slots is not None:
+                id_slots = columns.remap_slots(id_slots, generation)
+        self._actual["candidates"] += len(chunk)
+        rows = []
+        tiers = columns.tiers[chunk]
+        mask = tiers != TIER_DEAD
+        if self.tier is not None:
+            mask &= tiers == _TIERS[self.tier]
+        if self.since is not None or self.until is not None:
+            timestamps = columns.timestamps[chunk]
+            if self.since is not None:
+                mask &= timestamps >= self.since
+            if self.until is not None:
+                mask &= timestamps < self.until
+        if self.min_retrievals is not None or self.max_retrievals is not None:
+            counts = columns.counts[chunk]
+            if self.min_retrievals is not None:
+                mask &= counts >= self.min_retrievals
+            if self.max_retrievals is not None:
+                mask &= counts <= self.max_retrievals
+        for tag in filter_tags:
+            mask &= np.isin(chunk, columns.tag_postings(tag))
+        if id_slots is not None:
+            mask &= np.isin(chunk, id_slots)
+        
+        for slot in chunk[mask]:
+            entry = self.memory._materialize(self.memory._entries_by_id[columns.ids[slot]])
+            if text_filter and not self.terms <= set(tokenize(self.memory._search_text(entry["content"]) or "")):
+                continue
+            rows.append(entry)
+            if remaining is not None and len(rows) >= remaining:
+                break
+        return rows
+    
+    def all(self) -> List[Dict[str, Any]]:
+        """Run the query under one hold of the memory lock and return every matching memory"""
+        with self.memory.lock:
+            return list(self)
+    
+    def explain(self, analyze: bool = False) -> Dict[str, Any]:
+        """
+        Describe how the query is evaluated
+        
+        Args:
+            analyze: Run the query to completion first, so that actual row
+                counts are reported
+                
+        Returns:
+            The chosen access path and index key, the estimated candidate
+            count of every possible access path, the remaining filters, and
+            the estimated and actual candidate and result row counts; actual
+            counts are None until the query has been iterated and cover only
+            the part consumed
+        """
+        if analyze:
+            self.all()
+        if self._plan is None:
+            with self.memory.lock:
+                self._plan = self._build_plan()
+        plan = dict(self._plan)
+        plan["actual_candidates"] = self._actual["candidates"] if self._actual else None
+        plan["actual_rows"] = self._actual["rows"] if self._actual else None
+        return plan
+    
+    def _build_plan(self) -> Dict[str, Any]:
+        """Estimate the cost of each access path and pick the cheapest"""
+        memory = self.memory
+        columns = memory.columns
+        size = max(columns.size, 1)
+        estimates = {"full_scan": columns.size}
+        keys = {"full_scan": None}
+        selectivity = {}
+        
+        if self.ids is not None:
+            estimates["id_index"] = len(self.ids)
+            keys["id_index"] = f"{len(self.ids)} ids"
+            selectivity["ids"] = len(self.ids) / size
+        if self.tags:
+            sizes = {tag: len(columns.tag_postings(tag)) for tag in self.tags}
+            rarest = min(self.tags, key=sizes.get)
+            estimates["tag_postings"] = sizes[rarest]
+            keys["tag_postings"] = rarest
+            for tag, count in sizes.items():
+                selectivity[f"tag:{tag}"] = count / size
+        if self.since is not None or self.until is not None:
+            if columns.time_ordered:
+                low, high = self._time_bounds()
+                estimates["time_index"] = high - low
+                keys["time_index"] = "timestamp range"
+                selectivity["time"] = (high - low) / size
+            else:
+                selectivity["time"] = self.DEFAULT_SELECTIVITY
+        if self.terms:
+            text_index = memory.text_index
+            if text_index is not None:
+                frequency = min(text_index.document_frequency(term) for term in self.terms)
+                estimates["text_index"] = frequency
+                keys["text_index"] = " ".join(sorted(self.terms))
+                selectivity["text"] = frequency / size
+            else:
+                selectivity["text"] = self.DEFAULT_SELECTIVITY
+        if self.min_retrievals is not None or self.max_retrievals is not None:
+            selectivity["retrievals"] = self.DEFAULT_SELECTIVITY
+        if self.tier is not None:
+            tier_count = len(memory.short_term_memory if self.tier == "short_term" else memory.long_term_memory)
+            selectivity["tier"] = tier_count / size
+        
+        access_path = min(estimates, key=lambda path: (estimates[path], _ACCESS_PATHS.index(path)))
+        served = {"id_index": "ids", "tag_postings": f"tag:{keys.get('tag_postings')}",
+                  "time_index": "time", "text_index": "text"}.get(access_path)
+        # Postings and scans also cover slots of memories dropped since
+        rows = estimates[access_path] * len(columns) / size
+        filters = []
+        for name, fraction in selectivity.items():
+            if name != served:
+                rows *= fraction
+                filters.append(name)
+        if self.limit is not None:
+            rows = min(rows, self.limit)
+        return {
+            "access_path": access_path,
+            "index_key": keys[access_path],
+            "filters": filters,
+            "order": "newest_first" if self.newest_first else "oldest_first",
+            "limit": self.limit,
+            "alternatives": estimates,
+            "estimated_candidates": estimates[access_path],
+            "estimated_rows": int(round(rows)),
+        }
+    
+    def _candidate_chunks(self, plan: Dict[str, Any]) -> Iterator[np.ndarray]:
+        """Return the candidate slots of the chosen access path in chunks, numbered as of now"""
+        columns = self.memory.columns
+        access_path = plan["access_path"]
+        if access_path == "full_scan":
+            low, high = 0, columns.size
+        elif access_path == "time_index":
+            low, high = self._time_bounds()
+        else:
+            if access_path == "id_index":
+                slots = self._id_slots()
+            elif access_path == "tag_postings":
+                slots = columns.tag_postings(plan["index_key"])
+            else:
+                slots = np.sort(np.fromiter(
+                    (columns.slots[key] for key in self.memory.text_index.matching(self.text)
+                     if key in columns.slots), dtype=np.int64
+                ))
+            if self.newest_first:
+                slots = slots[::-1]
+            return (slots[start:start + self.CHUNK_SIZE] for start in range(0, len(slots), self.CHUNK_SIZE))
+        
+        # Slot ranges are generated lazily, so an early stop skips the rest
+        if self.newest_first:
+            return (np.arange(end - 1, max(low, end - self.CHUNK_SIZE) - 1, -1)
+                    for end in range(high, low, -self.CHUNK_SIZE))
+        return (np.arange(start, min(high, start + self.CHUNK_SIZE))
+                for start in range(low, high, self.CHUNK_SIZE))
+    
+    def _id_slots(self) -> np.ndarray:
+        """Return the sorted slots of the requested IDs that are live"""
+        slots = self.memory.columns.slots
+        return np.sort(np.fromiter((slots[memory_id] for memory_id in self.ids if memory_id in slots),
+                                   dtype=np.int64))
+    
+    def _time_bounds(self) -> Tuple[int, int]:
+        """Binary search the time-ordered timestamp column for the slot range"""
+        timestamps = self.memory.columns.timestamps
+        low = int(np.searchsorted(timestamps, self.since, side="left")) if self.since is not None else 0
+        high = int(np.searchsorted(timestamps, self.until, side="left")) if self.until is not None else len(timestamps)
+        return low, max(low, high)
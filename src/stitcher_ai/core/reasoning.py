@@ -3,20 +3,37 @@ Reasoning Engine Module
 Provides logical reasoning, inference, and decision-making capabilities
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
 
+from .inference import FactBase, forward_chain, parse_rule
+
 
 class ReasoningEngine:
     """
     Implements reasoning and inference capabilities.
     Processes information, makes decisions, and draws conclusions.
+    
+    Inference rules of the form {"if": [patterns], "then": pattern} are
+    applied to the `facts` base by forward_chain(). Chaining is incremental:
+    each call only joins facts asserted or derived since the previous
+    fixpoint, plus any rules added since then.
+    
+    When a ChangeFeed is attached as `change_feed`, reasoning results and
+    decisions are published to it.
     """
     
     def __init__(self):
         self.reasoning_history = []
+        self.history_offset = 0
         self.inference_rules = []
         self.decision_threshold = 0.7
+        self.change_feed = None
+        self.facts = FactBase()
+        self._chained_upto = 0
+        self._parsed_rules = []
+        self._parsed_upto = 0
+        self._unchained_rules = set()
     
     def reason(self, premise: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -38,6 +55,12 @@ class ReasoningEngine:
         }
         
         self.reasoning_history.append(reasoning_result)
+        if self.change_feed is not None:
+            self.change_feed.publish("reason", {
+                "premise": premise,
+                "conclusion": reasoning_result["conclusion"],
+                "confidence": reasoning_result["confidence"],
+            })
         return reasoning_result
     
     def _draw_conclusion(self, premise: str, context: Optional[Dict[str, Any]]) -> str:
@@ -96,15 +119,132 @@ class ReasoningEngine:
         }
         
         self.reasoning_history.append(decision)
+        if self.change_feed is not None:
+            self.change_feed.publish("decision", {
+                "selected_option": selected_option,
+                "confidence": confidence,
+                "options_considered": len(options),
+            })
         return decision
     
     def add_inference_rule(self, rule: Dict[str, Any]) -> None:
-        """Add a new inference rule to the reasoning system"""
+        """Add a new inference rule to the reasoning system; Horn rules are validated"""
+        parse_rule(rule, len(self.inference_rules))
         self.inference_rules.append({
             "timestamp": datetime.now().isoformat(),
             "rule": rule,
         })
     
+    def add_inference_rules(self, rules: List[Dict[str, Any]]) -> None:
+        """Add several inference rules at once, sharing one timestamp"""
+        for offset, rule in enumerate(rules):
+            parse_rule(rule, len(self.inference_rules) + offset)
+        timestamp = datetime.now().isoformat()
+        self.inference_rules.extend({"timestamp": timestamp, "rule": rule} for rule in rules)
+    
+    def forward_chain(self, facts: Optional[List[Sequence[Any]]] = None, max_iterations: int = 100,
+                      time_limit: Optional[float] = 1.0) -> Dict[str, Any]:
+        """
+        Derive new facts from the inference rules until a fixpoint is reached
+        
+        Facts are tuples of terms such as ("is_a", "socrates", "human"). Rule
+        patterns may use variables such as "?x", e.g.
+        {"name": "mortality", "if": [["is_a", "?x", "human"]], "then": ["mortal", "?x"]}.
+        Rules without "if" and "then" are ignored. If a cap stops evaluation
+        early, the next call picks up where it left off.
+        
+        Args:
+            facts: Optional facts to assert first
+            max_iterations: Maximum number of evaluation rounds
+            time_limit: Optional wall-clock budget in seconds
+            
+        Returns:
+            Dictionary with the newly derived facts, the rounds run, whether a
+            fixpoint was reached, why evaluation stopped otherwise, the elapsed
+            time and the size of the fact base
+            
+        Raises:
+            ValueError: If a fact or a Horn rule is malformed
+        """
+        asserted = sum(self.facts.add(fact) for fact in facts or ())
+        rules = self._horn_rules()
+        result = forward_chain(self.facts, rules, start=self._chained_upto,
+                               new_rules=sorted(self._unchained_rules),
+                               max_iterations=max_iterations, time_limit=time_limit)
+        self._chained_upto = result.pop("resume_from")
+        self._unchained_rules = set(result.pop("pending_rules"))
+        result["asserted"] = asserted
+        result["fact_count"] = len(self.facts)
+        
+        self.reasoning_history.append({
+            "timestamp": datetime.now().isoformat(),
+            "operation": "forward_chain",
+            "asserted": asserted,
+            "derived": len(result["derived"]),
+            "iterations": result["iterations"],
+            "fixpoint": result["fixpoint"],
+        })
+        return result
+    
+    def explain_fact(self, fact: Sequence[Any]) -> Dict[str, Any]:
+        """
+        Return how a fact was derived
+        
+        Args:
+            fact: A fact in the fact base
+            
+        Returns:
+            Derivation tree of {"fact", "rule", "premises"}; asserted facts
+            have rule None
+            
+        Raises:
+            KeyError: If the fact is unknown
+        """
+        return self.facts.explain(fact)
+    
+    def _horn_rules(self) -> List[Any]:
+        """Parse the inference rules added since the last call and return all Horn rules"""
+        if len(self.inference_rules) < self._parsed_upto:
+            # Rules were removed, e.g. by a rolled back evolution
+            self._parsed_rules = []
+            self._parsed_upto = 0
+            self._unchained_rules = set()
+            self._chained_upto = 0
+        for index in range(self._parsed_upto, len(self.inference_rules)):
+            rule = parse_rule(self.inference_rules[index]["rule"], index)
+            if rule is not None:
+                self._unchained_rules.add(len(self._parsed_rules))
+                self._parsed_rules.append(rule)
+        self._parsed_upto = len(self.inference_rules)
+        return self._parsed_rules
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # An attached feed belongs to the running process, not to the saved state
+        state = self.__dict__.copy()
+        state["change_feed"] = None
+        return state
+    
     def get_reasoning_history(self) -> List[Dict[str, Any]]:
         """Return the history of reasoning operations"""
         return self.reasoning_history.copy()
+    
+    def prune_history(self, max_entries: int) -> int:
+        """
+        Drop the oldest reasoning records beyond max_entries
+        
+        `history_offset` counts the records dropped so far, so a record's
+        position since the engine was created stays history_offset plus its
+        index in `reasoning_history`.
+        
+        Args:
+            max_entries: Number of most recent records to keep
+            
+        Returns:
+            Number of records dropped
+        """
+        excess = len(self.reasoning_history) - max_entries
+        if excess <= 0:
+            return 0
+        del self.reasoning_history[:excess]
+        self.history_offset += excess
+        return excess
@@ -0,0 +1,349 @@
+"""
+Shared Memory Module
+Publishes long-term memory into shared-memory segments that reader processes
+query in place
+"""
+
+import pickle
+import struct
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+_MAGIC = b"STCHSHM1"
+_CONTROL = struct.Struct("<8sQ")
+_HEADER = struct.Struct("<8sQQQQQ")
+
+
+def _layout(rows: int, tags: int, postings: int, payload_bytes: int,
+            name_bytes: int) -> Dict[str, Tuple[int, int]]:
+    """Return the (offset, size) of every section of a data segment"""
+    sections = [
+        ("ids", rows * 8),
+        ("timestamps", rows * 8),
+        ("counts", rows * 8),
+        ("payload_offsets", (rows + 1) * 8),
+        ("name_offsets", (tags + 1) * 8),
+        ("tag_offsets", (tags + 1) * 8),
+        ("postings", postings * 8),
+        ("payloads", payload_bytes),
+        ("names", name_bytes),
+    ]
+    layout = {}
+    offset = _HEADER.size
+    for name, size in sections:
+        offset = (offset + 7) & ~7
+        layout[name] = (offset, size)
+        offset += size
+    layout["total"] = (0, max(offset, 1))
+    return layout
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to an existing segment without handing it to the resource tracker"""
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Before Python 3.13 attaching registers the segment with the resource
+    # tracker, which would unlink it when this process exits; unregistering
+    # afterwards is no better, as a tracker shared with the publisher would
+    # then forget the publisher's own registration
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _numeric_id(memory_id: str) -> Optional[int]:
+    """Return the integer part of a 'mem_<n>' ID, or None for other IDs"""
+    if not memory_id.startswith("mem_"):
+        return None
+    try:
+        return int(memory_id[4:])
+    except ValueError:
+        return None
+
+
+class SharedMemoryPublisher:
+    """
+    Publishes snapshots of a MemorySystem's long-term memory to shared memory.
+    
+    Each publish() writes a complete, immutable data segment named
+    `<name>_<epoch>` and then bumps the epoch in the small control segment
+    `<name>`, so readers never see a half-written snapshot. The segment of
+    the previous epoch stays available until the next publish, giving readers
+    one publish interval to move over.
+    
+    A data segment holds the memory IDs (sorted, for binary search),
+    timestamps and retrieval counts as columnar arrays, each memory's pickled
+    content in one packed payload region, and the tag postings.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.epoch = 0
+        self._control = SharedMemory(name=name, create=True, size=_CONTROL.size)
+        _CONTROL.pack_into(self._control.buf, 0, _MAGIC, 0)
+        self._segments = []
+    
+    def publish(self, memory) -> int:
+        """
+        Publish the current long-term memory of a memory system
+        
+        Args:
+            memory: The MemorySystem to publish
+            
+        Returns:
+            The epoch of the new snapshot
+        """
+        # Gather under the memory lock, so a worker cannot consolidate or
+        # renumber slots halfway through
+        with memory.lock:
+            entries = [entry for entry in memory.long_term_memory if _numeric_id(entry["id"]) is not None]
+            entries.sort(key=lambda entry: _numeric_id(entry["id"]))
+            
+            payloads = [
+                pickle.dumps((memory._materialize(entry)["content"], entry["timestamp"], entry["tags"]),
+                             protocol=pickle.HIGHEST_PROTOCOL)
+                for entry in entries
+            ]
+            slots = np.array([memory.columns.slots[entry["id"]] for entry in entries], dtype=np.int64)
+            timestamps = memory.columns.timestamps[slots]
+            counts = memory.columns.counts[slots]
+        
+        tag_rows = {}
+        for row, entry in enumerate(entries):
+            for tag in dict.fromkeys(entry["tags"]):
+                tag_rows.setdefault(tag, []).append(row)
+        tags = sorted(tag_rows)
+        names = [tag.encode("utf-8") for tag in tags]
+        postings = sum(len(rows) for rows in tag_rows.values())
+        
+        layout = _layout(len(entries), len(tags), postings,
+                         sum(len(payload) for payload in payloads), sum(len(name) for name in names))
+        epoch = self.epoch + 1
+        segment = SharedMemory(name=f"{self.name}_{epoch}", create=True, size=layout["total"][1])
+        buf = segment.buf
+        _HEADER.pack_into(buf, 0, _MAGIC, len(entries), len(tags), postings,
+                          layout["payloads"][1], layout["names"][1])
+        
+        def column(section, dtype, values):
+            offset, size = layout[section]
+            view = np.ndarray(size // np.dtype(dtype).itemsize, dtype=dtype, buffer=buf, offset=offset)
+            view[:] = values
+        
+        column("ids", np.int64, [_numeric_id(entry["id"]) for entry in entries])
+        column("timestamps", np.float64, timestamps)
+        column("counts", np.int64, counts)
+        column("payload_offsets", np.uint64, np.cumsum([0] + [len(p) for p in payloads]))
+        column("name_offsets", np.uint64, np.cumsum([0] + [len(name) for name in names]))
+        column("tag_offsets", np.uint64, np.cumsum([0] + [len(tag_rows[tag]) for tag in tags]))
+        column("postings", np.int64, [row for tag in tags for row in tag_rows[tag]])
+        offset = layout["payloads"][0]
+        buf[offset:offset + layout["payloads"][1]] = b"".join(payloads)
+        offset = layout["names"][0]
+        buf[offset:offset + layout["names"][1]] = b"".join(names)
+        
+        # Readers switch over once the new epoch is visible
+        _CONTROL.pack_into(self._control.buf, 0, _MAGIC, epoch)
+        self.epoch = epoch
+        self._segments.append(segment)
+        while len(self._segments) > 2:
+            stale = self._segments.pop(0)
+            stale.close()
+            stale.unlink()
+        return epoch
+    
+    def close(self) -> None:
+        """Unlink the control segment and every published data segment"""
+        for segment in self._segments + [self._control]:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+    
+    def __enter__(self) -> "SharedMemoryPublisher":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SharedMemoryReplica:
+    """
+    A read-only view of long-term memory published by a SharedMemoryPublisher.
+    
+    Columns are NumPy arrays backed directly by the shared segment, so
+    attaching copies nothing and per-process memory does not grow with the
+    size of the published memory; only the payloads of returned memories are
+    unpickled. With `auto_refresh`, each query first checks the control
+    segment and moves to a newer epoch when one has been published.
+    Retrieval counts are those at publish time and are not updated by reads.
+    """
+    
+    def __init__(self, name: str, auto_refresh: bool = True, attach_retries: int = 5):
+        self.name = name
+        self.auto_refresh = auto_refresh
+        self.attach_retries = attach_retries
+        self.epoch = 0
+        self._control = _attach(name)
+        self._segment = None
+        self.refresh()
+    
+    def refresh(self) -> bool:
+        """
+        Attach to the newest published epoch
+        
+        Returns:
+            True if the replica moved to a new epoch
+        """
+        for _ in range(self.attach_retries):
+            magic, epoch = _CONTROL.unpack_from(self._control.buf, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"{self.name} is not a shared memory publication")
+            if epoch == self.epoch:
+                return False
+            try:
+                segment = _attach(f"{self.name}_{epoch}")
+            except FileNotFoundError:
+                # Republished and recycled between reading the epoch and attaching
+                continue
+            self._release()
+            self._map(segment)
+            self.epoch = epoch
+            return True
+        raise RuntimeError(f"could not attach to a current epoch of {self.name}")
+    
+    def retrieve(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a published memory by ID
+        
+        Args:
+            memory_id: The ID of the memory to retrieve
+            
+        Returns:
+            Memory entry if found, None otherwise
+        """
+        self._maybe_refresh()
+        numeric = _numeric_id(memory_id)
+        if numeric is None or not len(self._ids):
+            return None
+        row = int(np.searchsorted(self._ids, numeric))
+        if row == len(self._ids) or self._ids[row] != numeric:
+            return None
+        return self._entry(row)
+    
+    def recall_by_tag(self, tag: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve all published memories with a specific tag
+        
+        Args:
+            tag: The tag to search for
+            
+        Returns:
+            List of matching memory entries, oldest ID first
+        """
+        self._maybe_refresh()
+        index = self._find_tag(tag)
+        if index is None:
+            return []
+        start, end = int(self._tag_offsets[index]), int(self._tag_offsets[index + 1])
+        return [self._entry(int(row)) for row in self._postings[start:end]]
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Creation timestamps of the published memories, in ID order"""
+        return self._timestamps
+    
+    @property
+    def counts(self) -> np.ndarray:
+        """Retrieval counts of the published memories at publish time, in ID order"""
+        return self._counts
+    
+    def __len__(self) -> int:
+        self._maybe_refresh()
+        return len(self._ids)
+    
+    def close(self) -> None:
+        """Detach from the shared segments"""
+        self._release()
+        self._control.close()
+    
+    def __enter__(self) -> "SharedMemoryReplica":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _maybe_refresh(self) -> None:
+        """Move to a newer epoch if auto_refresh is on and one was published"""
+        if self.auto_refresh and _CONTROL.unpack_from(self._control.buf, 0)[1] != self.epoch:
+            self.refresh()
+    
+    def _map(self, segment: SharedMemory) -> None:
+        """Create the column views over a data segment"""
+        buf = segment.buf
+        _, rows, tags, postings, payload_bytes, name_bytes = _HEADER.unpack_from(buf, 0)
+        layout = _layout(rows, tags, postings, payload_bytes, name_bytes)
+        
+        def column(section, dtype):
+            offset, size = layout[section]
+            return np.ndarray(size // np.dtype(dtype).itemsize, dtype=dtype, buffer=buf, offset=offset)
+        
+        self._segment = segment
+        self._ids = column("ids", np.int64)
+        self._timestamps = column("timestamps", np.float64)
+        self._counts = column("counts", np.int64)
+        self._payload_offsets = column("payload_offsets", np.uint64)
+        self._name_offsets = column("name_offsets", np.uint64)
+        self._tag_offsets = column("tag_offsets", np.uint64)
+        self._postings = column("postings", np.int64)
+        self._payloads_start = layout["payloads"][0]
+        self._names_start = layout["names"][0]
+        self._tag_count = tags
+    
+    def _release(self) -> None:
+        """Drop the column views and detach from the current data segment"""
+        if self._segment is None:
+            return
+        # Views must be gone before the mapping can be closed
+        self._ids = self._timestamps = self._counts = None
+        self._payload_offsets = self._name_offsets = self._tag_offsets = self._postings = None
+        self._segment.close()
+        self._segment = None
+    
+    def _entry(self, row: int) -> Dict[str, Any]:
+        """Unpickle the payload of one row into a memory entry"""
+        start = self._payloads_start + int(self._payload_offsets[row])
+        end = self._payloads_start + int(self._payload_offsets[row + 1])
+        content, timestamp, tags = pickle.loads(self._segment.buf[start:end])
+        return {
+            "id": f"mem_{int(self._ids[row])}",
+            "content": content,
+            "timestamp": timestamp,
+            "tags": tags,
+            "retrieval_count": int(self._counts[row]),
+        }
+    
+    def _find_tag(self, tag: str) -> Optional[int]:
+        """Binary search the sorted tag names in place; return the tag's index"""
+        target = tag.encode("utf-8")
+        buf = self._segment.buf
+        low, high = 0, self._tag_count
+        while low < high:
+            middle = (low + high) // 2
+            start = self._names_start + int(self._name_offsets[middle])
+            end = self._names_start + int(self._name_offsets[middle + 1])
+            name = bytes(buf[start:end])
+            if name < target:
+                low = middle + 1
+            elif name > target:
+                high = middle
+            else:
+                return middle
+        return None
@@ -0,0 +1,162 @@
+"""
+Similarity Module
+MinHash signatures and LSH banding for near-duplicate text detection
+"""
+
+import re
+import zlib
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """
+    Return the word k-grams of a text
+    
+    Args:
+        text: Text to shingle
+        size: Words per shingle; shorter texts yield a single shingle
+        
+    Returns:
+        Set of shingles
+    """
+    tokens = tokenize(text)
+    if len(tokens) <= size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+class MinHashLSH:
+    """
+    Near-duplicate index over short texts.
+    
+    Each text is reduced to a MinHash signature of `num_perm` values, computed
+    for all permutations at once with NumPy. Signatures are split into `bands`
+    bands of `num_perm // bands` rows and each band is hashed into a bucket, so
+    a query only compares against texts sharing at least one bucket instead of
+    scanning the whole index. Texts with Jaccard similarity s become candidates
+    with probability 1 - (1 - s^rows)^bands.
+    """
+    
+    def __init__(self, num_perm: int = 128, bands: int = 32, shingle_size: int = 3, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}
+    
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a text
+        
+        Args:
+            text: Text to sign
+            
+        Returns:
+            Array of num_perm uint64 values, or None for texts without tokens
+        """
+        grams = shingles(text, self.shingle_size)
+        if not grams:
+            return None
+        hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams),
+                             dtype=np.uint64, count=len(grams))
+        # (a * h + b) mod p for every permutation and shingle at once; a, h < 2^32 so no overflow
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+    
+    def add(self, key: str, text: str) -> bool:
+        """
+        Index a text under a key
+        
+        Args:
+            key: Identifier returned by queries
+            text: Text to index
+            
+        Returns:
+            True if the text was indexed, False if it has no tokens
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return False
+        if key in self._signatures:
+            self.remove(key)
+        self._signatures[key] = signature
+        for band, bucket_key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(bucket_key, set()).add(key)
+        return True
+    
+    def remove(self, key: str) -> bool:
+        """
+        Remove a key from the index
+        
+        Args:
+            key: Identifier to remove
+            
+        Returns:
+            True if the key was indexed
+        """
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return False
+        for band, bucket_key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(bucket_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][bucket_key]
+        return True
+    
+    def query(self, text: str, threshold: float = 0.8) -> List[Tuple[str, float]]:
+        """
+        Find indexed texts whose estimated Jaccard similarity reaches a threshold
+        
+        Args:
+            text: Text to look up
+            threshold: Minimum estimated similarity between 0 and 1
+            
+        Returns:
+            (key, similarity) pairs, most similar first
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return []
+        candidates = set()
+        for band, bucket_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(bucket_key, ()))
+        if not candidates:
+            return []
+        
+        keys = list(candidates)
+        matrix = np.stack([self._signatures[key] for key in keys])
+        similarities = (matrix == signature).mean(axis=1)
+        order = np.argsort(-similarities, kind="stable")
+        return [(keys[i], float(similarities[i])) for i in order if similarities[i] >= threshold]
+    
+    def __len__(self) -> int:
+        return len(self._signatures)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+    
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Return the bucket key of every band of a signature"""
+        data = signature.tobytes()
+        width = self.rows * signature.itemsize
+        return [data[i * width:(i + 1) * width] for i in range(self.bands)]
@@ -0,0 +1,223 @@
+"""
+Text Index Module
+Incremental inverted index with BM25 ranking for full-text memory search
+"""
+
+from array import array
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .similarity import tokenize
+
+
+class InvertedIndex:
+    """
+    Incremental inverted index over short documents, ranked with BM25.
+    
+    Documents get consecutive integer ordinals. Each term keeps two compact
+    postings arrays (document ordinals and term frequencies) that only ever
+    grow by appending, so indexing a document is O(terms). Removed documents
+    are tombstoned and skipped at query time; compact() rewrites the postings
+    without them once they pile up.
+    
+    Queries are scored with one vectorized pass per query term over NumPy views
+    of its postings, so their cost depends on the postings touched rather than
+    the corpus size, followed by a partial top-k selection.
+    """
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75, auto_compact: bool = True):
+        self.k1 = k1
+        self.b = b
+        self.auto_compact = auto_compact
+        self._postings = {}
+        self._keys = []
+        self._ordinals = {}
+        self._doc_lengths = array("I")
+        self._alive = array("b")
+        self._total_length = 0
+        self._dead = 0
+    
+    def add(self, key: str, text: str) -> None:
+        """
+        Index a document
+        
+        Args:
+            key: Identifier returned by searches
+            text: Document text
+        """
+        if key in self._ordinals:
+            self.remove(key)
+        terms = Counter(tokenize(text))
+        ordinal = len(self._keys)
+        self._keys.append(key)
+        self._ordinals[key] = ordinal
+        length = sum(terms.values())
+        self._doc_lengths.append(length)
+        self._alive.append(1)
+        self._total_length += length
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("I"))
+            postings[0].append(ordinal)
+            postings[1].append(frequency)
+    
+    def remove(self, key: str) -> bool:
+        """
+        Remove a document from the index
+        
+        Args:
+            key: Identifier of the document
+            
+        Returns:
+            True if the document was indexed
+        """
+        ordinal = self._ordinals.pop(key, None)
+        if ordinal is None:
+            return False
+        self._alive[ordinal] = 0
+        self._keys[ordinal] = None
+        self._total_length -= self._doc_lengths[ordinal]
+        self._dead += 1
+        if self.auto_compact and self._dead > max(1024, len(self._ordinals)):
+            self.compact()
+        return True
+    
+    def search(self, query: str, k: int = 10,
+               keys: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Rank documents against a query with BM25
+        
+        Args:
+            query: Free-text query
+            k: Maximum number of results
+            keys: Optional collection of document keys to restrict the search to
+            
+        Returns:
+            (key, score) pairs, best first
+        """
+        live = len(self._ordinals)
+        terms = [term for term in set(tokenize(query)) if term in self._postings]
+        if not live or not terms or k <= 0:
+            return []
+        
+        doc_lengths = np.frombuffer(self._doc_lengths, dtype=np.uint32)
+        alive = np.frombuffer(self._alive, dtype=np.int8)
+        average_length = self._total_length / live
+        matched_docs = []
+        matched_scores = []
+        for term in terms:
+            docs = np.frombuffer(self._postings[term][0], dtype=np.uint32)
+            frequencies = np.frombuffer(self._postings[term][1], dtype=np.uint32).astype(np.float64)
+            idf = np.log((live - len(docs) + 0.5) / (len(docs) + 0.5) + 1.0)
+            norms = self.k1 * (1 - self.b + self.b * doc_lengths[docs] / average_length)
+            matched_docs.append(docs)
+            matched_scores.append(idf * frequencies * (self.k1 + 1) / (frequencies + norms))
+        
+        docs = np.concatenate(matched_docs)
+        scores = np.concatenate(matched_scores)
+        if len(matched_docs) > 1:
+            # Sum the per-term contributions of documents matching several terms
+            docs, inverse = np.unique(docs, return_inverse=True)
+            scores = np.bincount(inverse, weights=scores, minlength=len(docs))
+        keep = alive[docs] == 1
+        docs, scores = docs[keep], scores[keep]
+        if keys is not None:
+            keep = self._restrict(docs, keys)
+            docs, scores = docs[keep], scores[keep]
+        del doc_lengths, alive
+        
+        if len(docs) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            docs, scores = docs[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return [(self._keys[docs[i]], float(scores[i])) for i in order]
+    
+    def _restrict(self, docs: np.ndarray, keys: Iterable[str]) -> np.ndarray:
+        """Return a mask of the matched documents whose keys are in `keys`"""
+        if isinstance(keys, (set, frozenset)) and len(keys) > len(docs):
+            # Cheaper to test each matched document than to map every allowed key
+            return np.fromiter((self._keys[ordinal] in keys for ordinal in docs),
+                               dtype=bool, count=len(docs))
+        allowed = np.fromiter(
+            (self._ordinals[key] for key in keys if key in self._ordinals), dtype=np.uint32
+        )
+        return np.isin(docs, allowed)
+    
+    def compact(self) -> int:
+        """
+        Rewrite the postings without removed documents
+        
+        Returns:
+            Number of tombstones dropped
+        """
+        dropped = self._dead
+        if not dropped:
+            return 0
+        alive = np.frombuffer(self._alive, dtype=np.int8).astype(bool)
+        remap = np.cumsum(alive) - 1
+        postings = {}
+        for term, (docs, frequencies) in self._postings.items():
+            docs_view = np.frombuffer(docs, dtype=np.uint32)
+            keep = alive[docs_view]
+            if keep.any():
+                postings[term] = (
+                    array("I", remap[docs_view[keep]].astype(np.uint32).tobytes()),
+                    array("I", np.frombuffer(frequencies, dtype=np.uint32)[keep].tobytes()),
+                )
+            del docs_view, keep
+        lengths = np.frombuffer(self._doc_lengths, dtype=np.uint32)[alive]
+        
+        self._postings = postings
+        self._doc_lengths = array("I", lengths.tobytes())
+        self._keys = [key for key in self._keys if key is not None]
+        self._ordinals = {key: ordinal for ordinal, key in enumerate(self._keys)}
+        self._alive = array("b", b"\x01" * len(self._keys))
+        self._dead = 0
+        return dropped
+    
+    def matching(self, query: str) -> List[str]:
+        """
+        Return the keys of documents containing every term of a query
+        
+        Args:
+            query: Free-text query
+            
+        Returns:
+            Matching keys in indexing order
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        docs = None
+        for term in sorted(terms, key=self.document_frequency):
+            postings = self._postings.get(term)
+            if postings is None:
+                return []
+            term_docs = np.frombuffer(postings[0], dtype=np.uint32)
+            docs = term_docs.copy() if docs is None else np.intersect1d(docs, term_docs, assume_unique=True)
+            del term_docs
+            if not len(docs):
+                return []
+        alive = np.frombuffer(self._alive, dtype=np.int8)
+        docs = docs[alive[docs] == 1]
+        del alive
+        return [self._keys[ordinal] for ordinal in docs]
+    
+    @property
+    def tombstones(self) -> int:
+        """Number of removed documents still held in the postings"""
+        return self._dead
+    
+    def __len__(self) -> int:
+        return len(self._ordinals)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._ordinals
+    
+    def document_frequency(self, term: str) -> int:
+        """Return the number of postings for a term, including removed documents"""
+        postings = self._postings.get(term)
+        return len(postings[0]) if postings is not None else 0
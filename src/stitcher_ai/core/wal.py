@@ -0,0 +1,191 @@
+"""
+Write-Ahead Log Module
+Append-only log with group commit for durable memory and evolution writes
+"""
+
+import os
+import pickle
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+_HEADER = struct.Struct("<II")
+
+
+class WriteAheadLog:
+    """
+    Append-only log of (lsn, op, payload) records.
+    
+    Records are buffered in memory and written with a single write and fsync
+    per group: whenever `flush_size` records are pending, or at the latest
+    `flush_interval` seconds after the oldest pending record (a background
+    thread flushes idle tails). A crash therefore loses at most one group.
+    
+    Each record is framed as length + CRC32 + pickled body, so a torn write at
+    the end of the file is detected and discarded on recovery.
+    """
+    
+    def __init__(self, path: str, flush_interval: float = 0.05, flush_size: int = 256,
+                 fsync: bool = True):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._pending = []
+        self._closed = False
+        
+        records, valid_bytes = self.read_records(path)
+        self.last_lsn = records[-1][0] if records else 0
+        self._file = open(path, "ab", buffering=0)
+        if self._file.tell() != valid_bytes:
+            # Drop a torn tail left behind by a crash
+            self._file.truncate(valid_bytes)
+            self._file.seek(valid_bytes)
+        self.size_bytes = valid_bytes
+        self.stats = {
+            "records": 0,
+            "flushes": 0,
+            "bytes_written": 0,
+        }
+        
+        self._flusher = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+            self._flusher.start()
+    
+    def append(self, op: str, payload: Dict[str, Any]) -> int:
+        """
+        Add a record to the log
+        
+        Args:
+            op: Operation name, e.g. 'store'
+            payload: Data needed to replay the operation
+            
+        Returns:
+            The log sequence number (LSN) of the record
+        """
+        body = pickle.dumps((op, payload), protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._closed:
+                raise ValueError("write-ahead log is closed")
+            self.last_lsn += 1
+            frame = struct.pack("<Q", self.last_lsn) + body
+            self._pending.append(_HEADER.pack(len(frame), zlib.crc32(frame)) + frame)
+            self.stats["records"] += 1
+            lsn = self.last_lsn
+            if len(self._pending) >= self.flush_size:
+                self._write_pending()
+            elif len(self._pending) == 1:
+                self._wakeup.set()
+        return lsn
+    
+    def flush(self) -> None:
+        """Write and fsync all pending records"""
+        with self._lock:
+            self._write_pending()
+    
+    def reset(self) -> None:
+        """Discard the log contents after they have been folded into a snapshot"""
+        with self._lock:
+            self._write_pending()
+            self._file.truncate(0)
+            self._file.seek(0)
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.size_bytes = 0
+    
+    def close(self) -> None:
+        """Flush pending records and stop the background flusher"""
+        with self._lock:
+            if self._closed:
+                return
+            self._write_pending()
+            self._closed = True
+        self._stop.set()
+        self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self._file.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return group commit statistics"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update({
+                "pending": len(self._pending),
+                "last_lsn": self.last_lsn,
+                "size_bytes": self.size_bytes,
+                "records_per_flush": (
+                    round(stats["records"] / stats["flushes"], 2) if stats["flushes"] else 0.0
+                ),
+            })
+            return stats
+    
+    @staticmethod
+    def read_records(path: str) -> Tuple[List[Tuple[int, str, Dict[str, Any]]], int]:
+        """
+        Read every intact record of a log file
+        
+        Args:
+            path: Path of the log file
+            
+        Returns:
+            The (lsn, op, payload) records and the number of valid bytes; reading
+            stops at the first truncated or corrupt record
+        """
+        records = []
+        if not os.path.exists(path):
+            return records, 0
+        with open(path, "rb") as f:
+            data = f.read()
+        offset = 0
+        for lsn, op, payload, end in WriteAheadLog._frames(data):
+            records.append((lsn, op, payload))
+            offset = end
+        return records, offset
+    
+    @staticmethod
+    def _frames(data: bytes) -> Iterator[Tuple[int, str, Dict[str, Any], int]]:
+        """Decode frames until the data ends or a frame fails its checksum"""
+        offset = 0
+        while offset + _HEADER.size <= len(data):
+            length, checksum = _HEADER.unpack_from(data, offset)
+            start = offset + _HEADER.size
+            frame = data[start:start + length]
+            if len(frame) < length or zlib.crc32(frame) != checksum:
+                return
+            (lsn,) = struct.unpack_from("<Q", frame)
+            op, payload = pickle.loads(frame[8:])
+            offset = start + length
+            yield lsn, op, payload, offset
+    
+    def _write_pending(self) -> None:
+        """Write the pending group with one write and one fsync; caller holds the lock"""
+        if not self._pending:
+            return
+        data = b"".join(self._pending)
+        self._pending = []
+        self._file.write(data)
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.size_bytes += len(data)
+        self.stats["flushes"] += 1
+        self.stats["bytes_written"] += len(data)
+    
+    def _flush_loop(self) -> None:
+        """Background flusher bounding how long a record may stay pending"""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            # Let the group fill for up to one flush interval
+            if self._stop.wait(self.flush_interval):
+                return
+            with self._lock:
+                if self._closed:
+                    return
+                self._write_pending()
@@ -0,0 +1,229 @@
+"""
+Background Worker Module
+Runs memory consolidation, index maintenance, history pruning and checkpoints
+off the experience() hot path
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class BackgroundWorker:
+    """
+    A housekeeping thread ("sleep cycle") for a Consciousness.
+    
+    Every `interval` seconds the worker runs a cycle of small work units:
+    consolidating short-term memories accepted by the consolidation policy,
+    compacting the text index and memory columns, compressing cold payloads,
+    pruning the reasoning and introspection histories to `max_history`
+    entries, and checkpointing when a write-ahead log is attached.
+    
+    Units run under the consciousness lock in slices of at most `slice_time`
+    seconds, and the worker sleeps between slices so that it is busy for at
+    most `duty_cycle` of the wall time. It only starts a slice once no
+    experience or memory read has arrived for `idle_threshold` seconds, so
+    housekeeping yields to load; after waiting `max_deferral` seconds it runs anyway so
+    that it cannot be starved indefinitely. A single unit, such as an index
+    compaction, may outlast its slice.
+    """
+    
+    def __init__(self, consciousness, interval: float = 1.0, duty_cycle: float = 0.25,
+                 slice_time: float = 0.002, idle_threshold: float = 0.05,
+                 max_deferral: float = 5.0,
+                 consolidation_policy: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 max_history: int = 10_000, checkpoint_interval: float = 60.0,
+                 compact_ratio: float = 0.1, compress_every: int = 4096,
+                 keep_hot: int = 1024):
+        if not 0 < duty_cycle <= 1:
+            raise ValueError("duty_cycle must be in (0, 1]")
+        self.consciousness = consciousness
+        self.interval = interval
+        self.duty_cycle = duty_cycle
+        self.slice_time = slice_time
+        self.idle_threshold = idle_threshold
+        self.max_deferral = max_deferral
+        self.consolidation_policy = consolidation_policy or self.recalled_policy
+        self.max_history = max_history
+        self.checkpoint_interval = checkpoint_interval
+        self.compact_ratio = compact_ratio
+        self.compress_every = compress_every
+        self.keep_hot = keep_hot
+        self._stop = threading.Event()
+        self._thread = None
+        self._next_due = 0.0
+        self._last_checkpoint = time.monotonic()
+        self._compressed_at_puts = 0
+        self.stats = {
+            "cycles": 0,
+            "slices": 0,
+            "deferrals": 0,
+            "forced_slices": 0,
+            "consolidated": 0,
+            "compactions": 0,
+            "payloads_compressed": 0,
+            "history_pruned": 0,
+            "checkpoints": 0,
+            "errors": 0,
+            "busy_seconds": 0.0,
+            "last_lag_seconds": 0.0,
+            "max_lag_seconds": 0.0,
+        }
+    
+    @staticmethod
+    def recalled_policy(entry: Dict[str, Any]) -> bool:
+        """Default consolidation policy: keep short-term memories that were recalled"""
+        return entry["retrieval_count"] > 0
+    
+    @property
+    def running(self) -> bool:
+        """Whether the worker thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        """Start the worker thread"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._next_due = time.monotonic() + self.interval
+        self._thread = threading.Thread(target=self._loop, name="consciousness-worker", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker thread, letting the current work unit finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def run_cycle(self, throttle: bool = True) -> None:
+        """
+        Run one full housekeeping cycle in the calling thread
+        
+        Args:
+            throttle: Whether to honour the duty cycle and pause under load;
+                with False every unit runs back to back
+        """
+        for task in (self._consolidate, self._compact, self._prune, self._checkpoint):
+            units = task()
+            finished = False
+            while not finished:
+                if throttle and not self._wait_for_quiet():
+                    return
+                finished = self._run_slice(units, self.slice_time if throttle else float("inf"))
+        self.stats["cycles"] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return work-done counters and lag
+        
+        Returns:
+            The counters plus "running" and "lag_seconds", how long the
+            current cycle has been due without completing
+        """
+        stats = dict(self.stats)
+        stats["lag_seconds"] = round(max(0.0, time.monotonic() - self._next_due), 6) if self.running else 0.0
+        stats["busy_seconds"] = round(stats["busy_seconds"], 6)
+        stats["running"] = self.running
+        return stats
+    
+    def _loop(self) -> None:
+        """Run cycles on schedule until stopped"""
+        while not self._stop.wait(max(0.0, self._next_due - time.monotonic())):
+            try:
+                self.run_cycle()
+            except Exception:
+                self.stats["errors"] += 1
+            # Lag is how long after it became due a cycle completed
+            lag = time.monotonic() - self._next_due
+            self.stats["last_lag_seconds"] = lag
+            self.stats["max_lag_seconds"] = max(self.stats["max_lag_seconds"], lag)
+            self._next_due = max(self._next_due + self.interval, time.monotonic())
+    
+    def _wait_for_quiet(self) -> bool:
+        """Wait until nothing has used the consciousness for idle_threshold; False once stopped"""
+        waited_since = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            idle = now - max(self.consciousness.last_activity,
+                             self.consciousness.memory.last_activity)
+            if idle >= self.idle_threshold:
+                return True
+            if now - waited_since >= self.max_deferral:
+                self.stats["forced_slices"] += 1
+                return True
+            self.stats["deferrals"] += 1
+            self._stop.wait(min(self.idle_threshold - idle, self.max_deferral - (now - waited_since)))
+        return False
+    
+    def _run_slice(self, units: Iterator[None], budget: float) -> bool:
+        """Run work units under the lock for up to budget seconds; True when exhausted"""
+        start = time.perf_counter()
+        finished = False
+        with self.consciousness.lock:
+            while time.perf_counter() - start < budget:
+                if next(units, StopIteration) is StopIteration:
+                    finished = True
+                    break
+        busy = time.perf_counter() - start
+        self.stats["slices"] += 1
+        self.stats["busy_seconds"] += busy
+        if budget != float("inf") and self.duty_cycle < 1 and not finished:
+            self._stop.wait(busy * (1 - self.duty_cycle) / self.duty_cycle)
+        return finished
+    
+    def _consolidate(self) -> Iterator[None]:
+        """Consolidate the short-term memories accepted by the policy, one per unit"""
+        memory = self.consciousness.memory
+        candidates = [entry["id"] for entry in list(memory.short_term_memory)
+                      if self.consolidation_policy(entry)]
+        yield
+        for memory_id in candidates:
+            if memory.consolidate_memory(memory_id):
+                self.stats["consolidated"] += 1
+            yield
+    
+    def _compact(self) -> Iterator[None]:
+        """Compact indexes with many removed entries and compress cold payloads"""
+        memory = self.consciousness.memory
+        text_index = memory.text_index
+        if text_index is not None and text_index.tombstones > self.compact_ratio * max(1, len(text_index)):
+            text_index.compact()
+            self.stats["compactions"] += 1
+            yield
+        columns = memory.columns
+        if columns.dead > self.compact_ratio * max(1, len(columns)):
+            columns.compact()
+            self.stats["compactions"] += 1
+            yield
+        store = memory.payload_store
+        if store is not None and store.stats["puts"] - self._compressed_at_puts >= self.compress_every:
+            self._compressed_at_puts = store.stats["puts"]
+            self.stats["payloads_compressed"] += store.compress_cold(self.keep_hot)
+            yield
+    
+    def _prune(self) -> Iterator[None]:
+        """Trim the reasoning and introspection histories to max_history entries"""
+        consciousness = self.consciousness
+        pruned = consciousness.reasoning.prune_history(self.max_history)
+        if pruned:
+            self.stats["history_pruned"] += pruned
+            yield
+        log = consciousness.awareness.introspection_log
+        excess = len(log) - self.max_history
+        if excess > 0:
+            del log[:excess]
+            self.stats["history_pruned"] += excess
+            yield
+    
+    def _checkpoint(self) -> Iterator[None]:
+        """Fold the write-ahead log into a snapshot once checkpoint_interval has passed"""
+        consciousness = self.consciousness
+        wal = consciousness.wal
+        if wal is None or time.monotonic() - self._last_checkpoint < self.checkpoint_interval:
+            return
+        if wal.size_bytes or wal.get_stats()["pending"]:
+            consciousness.checkpoint()
+            self.stats["checkpoints"] += 1
+        self._last_checkpoint = time.monotonic()
+        yield
@@ -0,0 +1,273 @@
+"""
+Load Generation Module
+Drives a Consciousness with synthetic or recorded workloads and reports
+throughput, latency percentiles and memory growth over time
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .metrics import summarize_latencies
+
+
+Workload = Iterator[Tuple[str, Optional[Dict[str, Any]]]]
+
+_WORDS = [
+    "light", "sound", "memory", "pattern", "signal", "thought", "change", "motion",
+    "color", "shape", "voice", "question", "answer", "object", "person", "place",
+]
+
+
+def synthetic_workload(seed: int = 0, words_per_stimulus: int = 6,
+                       evidence_rate: float = 0.3) -> Workload:
+    """
+    Generate an endless stream of synthetic experiences
+    
+    Args:
+        seed: Random seed, so runs are repeatable
+        words_per_stimulus: Number of words in each generated stimulus
+        evidence_rate: Fraction of experiences that carry evidence in their context
+        
+    Yields:
+        (stimulus, context) pairs
+    """
+    rng = random.Random(seed)
+    count = 0
+    while True:
+        count += 1
+        stimulus = " ".join(rng.choice(_WORDS) for _ in range(words_per_stimulus))
+        context = {"type": "synthetic", "sequence": count}
+        if rng.random() < evidence_rate:
+            context["evidence"] = [rng.choice(_WORDS) for _ in range(rng.randint(1, 4))]
+        yield stimulus, context
+
+
+def load_experience_log(path: str) -> List[Dict[str, Any]]:
+    """
+    Load a captured experience log for replay
+    
+    Each JSONL line holds a "stimulus", an optional "context" and an optional
+    arrival time, either "t" (seconds since the start of the capture) or an ISO
+    "timestamp". Batch-mode command files ({"op": "experience", ...}) are accepted
+    too; lines for other operations are skipped.
+    
+    Args:
+        path: Path of the JSONL log
+        
+    Returns:
+        Records with "t", "stimulus" and "context" keys, ordered by arrival time
+    """
+    records = []
+    first_timestamp = None
+    with open(path) as f:
+        for index, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("op", "experience") != "experience" or "stimulus" not in record:
+                continue
+            if "t" in record:
+                offset = float(record["t"])
+            elif "timestamp" in record:
+                moment = datetime.fromisoformat(record["timestamp"]).timestamp()
+                if first_timestamp is None:
+                    first_timestamp = moment
+                offset = moment - first_timestamp
+            else:
+                offset = float(index)
+            records.append({"t": offset, "stimulus": record["stimulus"], "context": record.get("context")})
+    records.sort(key=lambda record: record["t"])
+    return records
+
+
+def _resident_kb() -> int:
+    """Return the current resident set size in KiB, or 0 if unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        return 0
+
+
+class LoadGenerator:
+    """
+    Runs open-loop, closed-loop and replay workloads against a Consciousness.
+    Calls into the consciousness are serialized with a lock, so closed-loop
+    latencies include the time callers spend waiting for each other.
+    """
+    
+    def __init__(self, consciousness, sample_interval: float = 1.0):
+        self.consciousness = consciousness
+        self.sample_interval = sample_interval
+        self._lock = threading.Lock()
+        self._latencies = []
+        self._errors = 0
+        self._timeline = []
+        self._window = []
+        self._start = 0.0
+        self._next_sample = 0.0
+    
+    def run_open_loop(self, workload: Iterable, rate: float, duration: float) -> Dict[str, Any]:
+        """
+        Issue experiences at a fixed target rate, independent of response times
+        
+        Latency is measured from each request's scheduled start, so time spent
+        queued behind a slow call is counted instead of hidden.
+        
+        Args:
+            workload: Iterable of (stimulus, context) pairs
+            rate: Target experiences per second
+            duration: Length of the run in seconds
+            
+        Returns:
+            The load report
+        """
+        self._begin()
+        interval = 1.0 / rate
+        items = iter(workload)
+        scheduled = self._start
+        end = self._start + duration
+        while scheduled < end:
+            try:
+                stimulus, context = next(items)
+            except StopIteration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self._issue(stimulus, context, scheduled)
+            scheduled += interval
+        return self._finish("open_loop", {"target_rate": rate, "duration": duration})
+    
+    def run_closed_loop(self, workload: Iterable, concurrency: int, duration: float,
+                        max_requests: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run N callers that each issue their next experience as soon as the previous returns
+        
+        Args:
+            workload: Iterable of (stimulus, context) pairs shared by all callers
+            concurrency: Number of concurrent callers
+            duration: Length of the run in seconds
+            max_requests: Optional cap on the total number of experiences
+            
+        Returns:
+            The load report
+        """
+        self._begin()
+        items = iter(workload)
+        source_lock = threading.Lock()
+        end = self._start + duration
+        issued = [0]
+        
+        def caller():
+            while time.perf_counter() < end:
+                with source_lock:
+                    if max_requests is not None and issued[0] >= max_requests:
+                        return
+                    try:
+                        stimulus, context = next(items)
+                    except StopIteration:
+                        return
+                    issued[0] += 1
+                self._issue(stimulus, context, time.perf_counter())
+        
+        threads = [threading.Thread(target=caller, daemon=True) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self._finish("closed_loop", {"concurrency": concurrency, "duration": duration})
+    
+    def run_replay(self, records: List[Dict[str, Any]], speed: float = 1.0) -> Dict[str, Any]:
+        """
+        Replay a captured experience log, preserving its inter-arrival times
+        
+        Args:
+            records: Records as returned by load_experience_log
+            speed: Time scaling factor; 2.0 replays twice as fast, 0 as fast as possible
+            
+        Returns:
+            The load report
+        """
+        self._begin()
+        base = records[0]["t"] if records else 0.0
+        for record in records:
+            scheduled = self._start
+            if speed > 0:
+                scheduled += (record["t"] - base) / speed
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                scheduled = time.perf_counter()
+            self._issue(record["stimulus"], record.get("context"), scheduled)
+        return self._finish("replay", {"speed": speed, "records": len(records)})
+    
+    def _begin(self) -> None:
+        """Reset the collected measurements"""
+        self._latencies = []
+        self._errors = 0
+        self._timeline = []
+        self._window = []
+        self._start = time.perf_counter()
+        self._next_sample = self._start + self.sample_interval
+    
+    def _issue(self, stimulus: str, context: Optional[Dict[str, Any]], scheduled: float) -> None:
+        """Send one experience and record its latency"""
+        with self._lock:
+            try:
+                self.consciousness.experience(stimulus, context)
+            except Exception:
+                self._errors += 1
+            now = time.perf_counter()
+            latency = now - scheduled
+            self._latencies.append(latency)
+            self._window.append(latency)
+            if now >= self._next_sample:
+                self._sample(now)
+                self._next_sample = now + self.sample_interval
+    
+    def _sample(self, now: float) -> None:
+        """Append a timeline point covering the latencies seen since the last one"""
+        consciousness = self.consciousness
+        previous = self._timeline[-1]["elapsed"] if self._timeline else 0.0
+        elapsed = now - self._start
+        window = summarize_latencies(self._window, elapsed - previous)
+        self._timeline.append({
+            "elapsed": round(elapsed, 3),
+            "completed": len(self._latencies),
+            "ops_per_sec": window["ops_per_sec"],
+            "p99_us": window["p99_us"],
+            "short_term_memory": len(consciousness.memory.short_term_memory),
+            "long_term_memory": len(consciousness.memory.long_term_memory),
+            "reasoning_history": len(consciousness.reasoning.reasoning_history),
+            "introspection_log": len(consciousness.awareness.introspection_log),
+            "rss_kb": _resident_kb(),
+        })
+        self._window = []
+    
+    def _finish(self, mode: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the report for the finished run"""
+        now = time.perf_counter()
+        if self._window or not self._timeline:
+            self._sample(now)
+        summary = summarize_latencies(self._latencies, now - self._start)
+        return {
+            "mode": mode,
+            "settings": settings,
+            "elapsed": round(now - self._start, 3),
+            "errors": self._errors,
+            "latency": summary,
+            "timeline": self._timeline,
+        }
@@ -0,0 +1,51 @@
+"""
+Metrics Utilities
+Small helpers for summarizing latency samples and throughput
+"""
+
+import math
+from typing import Dict, List, Sequence
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """
+    Return the given percentile of a set of samples (nearest-rank method)
+    
+    Args:
+        samples: The measured values
+        pct: Percentile between 0 and 100
+        
+    Returns:
+        The percentile value, or 0.0 when there are no samples
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_latencies(samples: List[float], elapsed: float = 0.0) -> Dict[str, float]:
+    """
+    Summarize latency samples given in seconds
+    
+    Args:
+        samples: Per-operation latencies in seconds
+        elapsed: Optional wall-clock time covering all operations; when given,
+            throughput is computed from it instead of the sum of samples
+            
+    Returns:
+        Dictionary of count, throughput and latency percentiles in microseconds
+    """
+    count = len(samples)
+    total = elapsed if elapsed > 0 else sum(samples)
+    ordered = sorted(samples)
+    return {
+        "count": count,
+        "ops_per_sec": round(count / total, 2) if total > 0 else 0.0,
+        "mean_us": round(sum(ordered) / count * 1e6, 3) if count else 0.0,
+        "p50_us": round(percentile(ordered, 50) * 1e6, 3),
+        "p90_us": round(percentile(ordered, 90) * 1e6, 3),
+        "p99_us": round(percentile(ordered, 99) * 1e6, 3),
+        "max_us": round(ordered[-1] * 1e6, 3) if count else 0.0,
+    }
@@ -0,0 +1,84 @@
+"""Tests for the AssociationGraph module"""
+
+import sys
+import os
+import pickle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai.core.association import AssociationGraph
+
+
+def test_associations():
+    """Test temporal, shared-tag and similarity links"""
+    graph = AssociationGraph(tag_fanout=2)
+    assert graph.add("a", ["red"]) == 0
+    assert graph.add("b", ["blue"]) == 1
+    assert graph.add("c", ["red", "blue"], similar=[("a", 0.9)]) == 4
+    # Weights are stored as float32
+    assert {key: round(weight, 5) for key, weight in graph.neighbours("c")} == {"a": 1.9, "b": 1.5}
+    assert {key: round(weight, 5) for key, weight in graph.neighbours("a")} == {"b": 0.5, "c": 1.9}
+    
+    # Only the latest tag_fanout memories of a tag are linked
+    graph.add("d", ["red"])
+    graph.add("e", ["red"])
+    assert {key for key, _ in graph.neighbours("e")} == {"c", "d"}
+
+
+def test_spreading_activation():
+    """Test that activation spreads over several hops and decays"""
+    graph = AssociationGraph(temporal_weight=0.0)
+    graph.add("a", ["x"])
+    graph.add("b", ["x", "y"])
+    graph.add("c", ["y", "z"])
+    graph.add("d", ["z"])
+    graph.add("e", ["unrelated"])
+    
+    assert [key for key, _ in graph.recall("a", depth=1)] == ["b"]
+    results = graph.recall("a", depth=3)
+    assert [key for key, _ in results] == ["b", "c", "d"]
+    assert results[0][1] > results[1][1] > results[2][1] > 0
+    assert len(graph.recall("a", depth=3, k=2)) == 2
+    assert graph.recall("missing") == []
+
+
+def test_removed_memories():
+    """Test that removed memories are neither returned nor spread through"""
+    graph = AssociationGraph(temporal_weight=0.0)
+    graph.add("a", ["x"])
+    graph.add("b", ["x", "y"])
+    graph.add("c", ["y"])
+    assert graph.remove("b")
+    assert not graph.remove("b")
+    assert "b" not in graph
+    assert graph.recall("a", depth=3) == []
+    assert len(graph) == 2
+
+
+def test_tiers_and_compaction():
+    """Test that edges survive folding into the CSR tiers and node renumbering"""
+    graph = AssociationGraph(tail_size=64)
+    for i in range(4000):
+        graph.add(f"m{i}", [f"group{i % 100}"])
+    assert len(graph._main[1]) > 0
+    assert {key for key, _ in graph.recall("m0", depth=1)} >= {"m1", "m100"}
+    
+    # Dropping most memories lets the next main merge renumber the survivors
+    for i in range(4000):
+        if i % 4 != 3:
+            graph.remove(f"m{i}")
+    for i in range(2000):
+        graph.add(f"n{i}", [f"group{i % 100}"])
+    assert len(graph._keys) < 6000
+    results = {key for key, _ in graph.recall("m3", depth=1, k=100)}
+    assert "m103" in results and "m4" not in results
+    
+    restored = pickle.loads(pickle.dumps(graph))
+    assert restored.recall("n5", depth=2) == graph.recall("n5", depth=2)
+
+
+if __name__ == "__main__":
+    test_associations()
+    test_spreading_activation()
+    test_removed_memories()
+    test_tiers_and_compaction()
+    print("All AssociationGraph tests passed!")
@@ -64,6 +64,20 @@ def test_awareness_history():
     assert history[1]["context"] == "second"
 
 
+def test_introspect_many():
+    """Test that batched introspections get independent snapshots"""
+    awareness = SelfAwareness()
+    first, second = awareness.introspect_many(["first", "second"])
+    assert first["timestamp"] == second["timestamp"]
+    assert [entry["context"] for entry in awareness.introspection_log] == ["first", "second"]
+    
+    first["state"]["awareness_level"] = "mutated"
+    first["capabilities_active"]["mutated"] = True
+    assert second["state"]["awareness_level"] == "emerging"
+    assert "mutated" not in second["capabilities_active"]
+    assert awareness.state["awareness_level"] == "emerging"
+
+
 if __name__ == "__main__":
     test_initialization()
     test_get_self_description()
@@ -71,4 +85,5 @@ if __name__ == "__main__":
     test_state_update()
     test_assess_capability()
     test_awareness_history()
+    test_introspect_many()
     print("All SelfAwareness tests passed!")
@@ -0,0 +1,119 @@
+"""Tests for the change feed"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai import ChangeFeed, Consciousness, FileSink, MemorySystem
+from stitcher_ai.core.change_feed import SlowConsumerError
+
+
+def test_cursor_reads():
+    """Test sequence numbers and batched reads from a cursor"""
+    feed = ChangeFeed()
+    early = feed.subscribe("early", from_seq=1)
+    for i in range(5):
+        assert feed.publish("store", {"memory_id": f"m{i}"}) == i + 1
+    late = feed.subscribe("late")
+    feed.publish("evict", {"memory_id": "m0"})
+    
+    batch = early.read(max_events=4)
+    assert [event["seq"] for event in batch] == [1, 2, 3, 4]
+    assert batch[0]["type"] == "store" and batch[0]["data"] == {"memory_id": "m0"}
+    assert early.lag == 2
+    assert [event["seq"] for event in early.read()] == [5, 6]
+    assert early.read() == []
+    assert [event["type"] for event in late.read()] == ["evict"]
+    
+    # Readers share the stored events instead of copies
+    assert feed.read(0, 1)[0] is feed.read(0, 1)[0]
+
+
+def test_retention_and_slow_consumers():
+    """Test bounded retention and detection of subscribers that fall behind"""
+    overruns = []
+    feed = ChangeFeed(retention=10, slow_threshold=0.5,
+                      on_slow_consumer=lambda name, lag: overruns.append((name, lag)))
+    slow = feed.subscribe("slow")
+    fast = feed.subscribe("fast")
+    for i in range(8):
+        feed.publish("reason", {"i": i})
+    fast.read()
+    stats = feed.get_stats()
+    assert stats["slow_consumers"] == ["slow"]
+    assert stats["subscribers"]["slow"] == {"cursor": 0, "lag": 8, "lagging": True, "overrun": False}
+    
+    for i in range(30):
+        feed.publish("reason", {"i": 8 + i})
+        fast.read()
+    assert overruns == [("slow", 11)]
+    stats = feed.get_stats()
+    assert (stats["first_seq"], stats["last_seq"], stats["retained"]) == (29, 38, 10)
+    assert stats["dropped"] == 28 and stats["overruns"] == 1
+    
+    try:
+        slow.read()
+        assert False, "reading dropped events should fail"
+    except SlowConsumerError as error:
+        assert error.missed == 28 and error.first_seq == 29
+    slow.seek(feed.first_seq - 1)
+    assert [event["data"]["i"] for event in slow.read(3)] == [28, 29, 30]
+    assert feed.get_stats()["subscribers"]["slow"]["overrun"] is False
+    assert len(slow.read()) == 7
+    assert feed.get_stats()["slow_consumers"] == []
+
+
+def test_file_sink():
+    """Test that events are written to a JSONL file that can be read offline"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "feed.jsonl")
+        feed = ChangeFeed(retention=2, sink=FileSink(path))
+        for i in range(5):
+            feed.publish("decision", {"selected_option": f"option_{i}", "when": object()})
+        feed.close()
+        
+        events = list(FileSink.read_events(path))
+        assert [event["seq"] for event in events] == [1, 2, 3, 4, 5]
+        assert events[0]["data"]["selected_option"] == "option_0"
+        assert [event["seq"] for event in FileSink.read_events(path, after=2, limit=2)] == [3, 4]
+        
+        with open(path, "a") as f:
+            f.write('{"seq": 6, "ty')
+        assert len(list(FileSink.read_events(path))) == 5
+
+
+def test_consciousness_events():
+    """Test that memory, reasoning and evolution changes are published"""
+    feed = ChangeFeed()
+    consciousness = Consciousness(memory=MemorySystem(short_term_capacity=2), change_feed=feed)
+    reader = feed.subscribe("indexer", from_seq=1)
+    
+    first = consciousness.experience("first")["memory_id"]
+    consciousness.experience("second")
+    consciousness.memory.consolidate_memory(first)
+    consciousness.experience("third")
+    consciousness.experience("fourth")
+    consciousness.reasoning.make_decision(["a", "b"], {})
+    consciousness.evolve({"capabilities": {"streaming": True}})
+    consciousness.evolve_many([{"inference_rules": [{"rule": "r"}]}])
+    
+    types = [event["type"] for event in reader.read()]
+    assert types == ["reason", "store", "reason", "store", "consolidate", "reason", "store",
+                     "reason", "evict", "store", "decision", "store", "evolve", "store", "evolve"]
+    events = feed.read(0, 2)
+    assert events[1]["data"]["memory_id"] == first
+    assert events[1]["data"]["content"]["stimulus"] == "first"
+    
+    # Detaching stops publication
+    consciousness.attach_change_feed(None)
+    consciousness.experience("unpublished")
+    assert feed.last_seq == 15
+
+
+if __name__ == "__main__":
+    test_cursor_reads()
+    test_retention_and_slow_consumers()
+    test_file_sink()
+    test_consciousness_events()
+    print("All change feed tests passed!")
@@ -0,0 +1,89 @@
+"""Tests for the consciousness CLI batch mode"""
+
+import sys
+import os
+import io
+import json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from stitcher_ai.core.consciousness import Consciousness
+from consciousness_cli import run_batch
+
+
+def _run(lines, batch_size=64):
+    """Run the given JSONL lines through batch mode"""
+    consciousness = Consciousness()
+    out = io.StringIO()
+    summary = run_batch(consciousness, io.StringIO("\n".join(lines) + "\n"), out, batch_size)
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    return consciousness, results, summary
+
+
+def test_batch_experiences():
+    """Test that experiences are processed and streamed in order"""
+    lines = [json.dumps({"op": "experience", "stimulus": f"item {i}"}) for i in range(5)]
+    consciousness, results, summary = _run(lines, batch_size=2)
+    
+    assert consciousness.experience_count == 5
+    assert [r["line"] for r in results] == [1, 2, 3, 4, 5]
+    assert all(r["ok"] for r in results)
+    assert results[4]["result"]["experience_id"] == 5
+    assert summary["count"] == 5
+    assert summary["errors"] == 0
+
+
+def test_batch_mixed_commands():
+    """Test that other commands flush pending experiences first"""
+    lines = [
+        json.dumps({"op": "experience", "stimulus": "hello"}),
+        json.dumps({"op": "status"}),
+        json.dumps({"op": "evolve", "learning": {"capabilities": {"batch": True}}}),
+        json.dumps({"op": "reflect"}),
+        json.dumps({"op": "evolve", "learning": {}}),
+    ]
+    consciousness, results, _ = _run(lines)
+    
+    assert [r["op"] for r in results] == ["experience", "status", "evolve", "reflect", "evolve"]
+    assert results[1]["result"]["experiences_processed"] == 1
+    assert consciousness.awareness.capabilities["batch"] is True
+    # An explicit empty learning is applied as given, not replaced by the default
+    assert "enhanced_perception" not in consciousness.awareness.capabilities
+
+
+def test_batch_errors():
+    """Test that malformed lines are reported without stopping the batch"""
+    lines = [
+        "not json",
+        json.dumps({"op": "experience"}),
+        json.dumps({"op": "unknown"}),
+        json.dumps({"op": "experience", "stimulus": "still works"}),
+    ]
+    _, results, summary = _run(lines)
+    
+    assert [r["ok"] for r in results] == [False, False, False, True]
+    assert summary["errors"] == 3
+
+
+def test_batch_mixed_good_and_bad_items():
+    """Test that only malformed items of a batch are reported as failed"""
+    lines = [
+        json.dumps({"op": "experience", "stimulus": "a"}),
+        json.dumps({"op": "experience", "stimulus": "b", "context": "oops"}),
+        json.dumps({"op": "experience", "stimulus": "c", "context": {"evidence": 3}}),
+        json.dumps({"op": "experience", "stimulus": "d", "context": {"evidence": ["x"]}}),
+    ]
+    consciousness, results, summary = _run(lines)
+    
+    assert [(r["line"], r["ok"]) for r in results] == [(1, True), (2, False), (3, False), (4, True)]
+    assert consciousness.experience_count == 2
+    assert consciousness.memory.get_memory_stats()["total_memories"] == 2
+    assert summary["errors"] == 2
+
+
+if __name__ == "__main__":
+    test_batch_experiences()
+    test_batch_mixed_commands()
+    test_batch_errors()
+    test_batch_mixed_good_and_bad_items()
+    print("All CLI tests passed!")
@@ -0,0 +1,64 @@
+"""Tests for the MemoryColumns module"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai.core.columns import MemoryColumns, TIER_DEAD, TIER_LONG, TIER_SHORT
+
+
+def test_add_and_update():
+    """Test that slots mirror timestamps, counts, tiers and tags"""
+    columns = MemoryColumns(initial_capacity=2)
+    for i in range(5):
+        columns.add(f"m{i}", float(i), ["all", f"t{i % 2}"], TIER_SHORT)
+    columns.increment("m3")
+    columns.set_tier("m4", TIER_LONG)
+    
+    assert len(columns) == 5
+    assert list(columns.timestamps) == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert list(columns.counts) == [0, 0, 0, 1, 0]
+    assert list(columns.tiers) == [TIER_SHORT] * 4 + [TIER_LONG]
+    assert list(columns.tag_postings("t1")) == [1, 3]
+    assert list(columns.tag_postings("all")) == [0, 1, 2, 3, 4]
+    assert len(columns.tag_postings("missing")) == 0
+
+
+def test_remove_and_compact():
+    """Test that dropped memories leave dead slots until compaction"""
+    columns = MemoryColumns(auto_compact=False)
+    for i in range(4):
+        columns.add(f"m{i}", float(i), [f"t{i % 2}"], TIER_SHORT)
+    columns.increment("m2")
+    assert columns.remove("m0")
+    assert not columns.remove("m0")
+    assert columns.tiers[0] == TIER_DEAD
+    assert columns.size == 4 and len(columns) == 3
+    
+    remap = columns.compact()
+    assert remap == {1: 0, 2: 1, 3: 2}
+    assert columns.ids == ["m1", "m2", "m3"]
+    assert columns.slots["m2"] == 1
+    assert list(columns.counts) == [0, 1, 0]
+    assert list(columns.tag_postings("t0")) == [1]
+    assert list(columns.tag_postings("t1")) == [0, 2]
+
+
+def test_auto_compact():
+    """Test that dead slots are reclaimed once they outnumber live ones"""
+    columns = MemoryColumns()
+    for i in range(3000):
+        columns.add(f"m{i}", float(i), ["tag"], TIER_SHORT)
+        if i >= 10:
+            columns.remove(f"m{i - 10}")
+    assert len(columns) == 10
+    assert columns.size < 1100
+    assert columns.ids[-1] == "m2999"
+    assert len(columns.tag_postings("tag")) == columns.size
+
+
+if __name__ == "__main__":
+    test_add_and_update()
+    test_remove_and_compact()
+    test_auto_compact()
+    print("All MemoryColumns tests passed!")
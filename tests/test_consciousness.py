@@ -2,9 +2,14 @@
 
 import sys
 import os
+import tempfile
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from stitcher_ai.core.change_feed import ChangeFeed
 from stitcher_ai.core.consciousness import Consciousness
+from stitcher_ai.core.memory import MemorySystem
+from stitcher_ai.core.similarity import MinHashLSH
+from stitcher_ai.core.wal import WriteAheadLog
 
 
 def test_initialization():
@@ -55,6 +60,20 @@ def test_evolution():
     
     assert "new_capability" in consciousness.awareness.capabilities
     assert len(consciousness.reasoning.inference_rules) > 0
+    
+    # A malformed Horn rule rejects the whole learning before anything is applied
+    capabilities = consciousness.awareness.capabilities.copy()
+    rule_count = len(consciousness.reasoning.inference_rules)
+    try:
+        consciousness.evolve({
+            "capabilities": {"half_applied": True},
+            "inference_rules": [{"if": [["a", "?x"]], "then": ["b", "?x"]}, {"if": [], "then": ["a"]}],
+        })
+        assert False, "the malformed rule should be rejected"
+    except ValueError:
+        pass
+    assert consciousness.awareness.capabilities == capabilities
+    assert len(consciousness.reasoning.inference_rules) == rule_count
 
 
 def test_consciousness_level_progression():
@@ -99,6 +118,141 @@ def test_multiple_experiences():
     assert stats["total_memories"] >= 5
 
 
+def test_experience_batch():
+    """Test processing a batch of experiences"""
+    consciousness = Consciousness()
+    responses = consciousness.experience_batch([
+        "first",
+        ("second", {"evidence": ["a", "b"]}),
+    ])
+    
+    assert [r["experience_id"] for r in responses] == [1, 2]
+    assert responses[1]["reasoning"]["confidence"] == 0.7
+    assert consciousness.experience_count == 2
+    assert consciousness.memory.retrieve(responses[0]["memory_id"]) is not None
+    assert len(consciousness.awareness.introspection_log) == 2
+    assert consciousness.experience_batch([]) == []
+    
+    # A malformed item rejects the batch before any item is processed
+    try:
+        consciousness.experience_batch(["third", ("fourth", "not a dict"), "fifth"])
+        assert False, "expected a ValueError"
+    except ValueError as e:
+        assert "item 1" in str(e)
+    assert consciousness.experience_count == 2
+    assert consciousness.memory.get_memory_stats()["total_memories"] == 2
+
+
+def test_near_duplicate_merge():
+    """Test that near-identical stimuli are merged into the existing memory"""
+    consciousness = Consciousness(memory=MemorySystem(near_duplicate_index=MinHashLSH()))
+    original = consciousness.experience("I see a red ball rolling across the kitchen floor")
+    merged = consciousness.experience("I see a red ball rolling across the kitchen floor!",
+                                      merge_threshold=0.8)
+    different = consciousness.experience("The weather outside is cold and rainy today",
+                                         merge_threshold=0.8)
+    
+    assert merged["merged"] is True
+    assert merged["memory_id"] == original["memory_id"]
+    assert "merged" not in different
+    assert consciousness.experience_count == 3
+    assert consciousness.memory.get_memory_stats()["short_term_count"] == 2
+    assert len(consciousness.reasoning.reasoning_history) == 2
+    assert consciousness.memory.retrieve(original["memory_id"])["retrieval_count"] == 2
+
+
+def test_evolve_many():
+    """Test applying many learnings with one memory write and level reassessment"""
+    consciousness = Consciousness()
+    for i in range(15):
+        consciousness.experience(f"Warm-up {i}")
+    log_length = len(consciousness.awareness.introspection_log)
+    
+    learnings = [
+        {"capabilities": {f"skill_{i}": True}, "inference_rules": [{"rule": f"r{i}a"}, {"rule": f"r{i}b"}]}
+        for i in range(100)
+    ]
+    assert consciousness.evolve_many(learnings) == 100
+    
+    assert consciousness.awareness.capabilities["skill_99"] is True
+    assert len(consciousness.reasoning.inference_rules) == 200
+    assert len(consciousness.memory.recall_by_tag("evolution")) == 1
+    assert consciousness.awareness.state["awareness_level"] == "developing"
+    assert len(consciousness.awareness.introspection_log) == log_length + 1
+
+
+def test_evolution_rollback():
+    """Test that failed transactions leave the consciousness unchanged"""
+    consciousness = Consciousness()
+    capabilities = consciousness.awareness.capabilities.copy()
+    
+    try:
+        consciousness.evolve_many([{"capabilities": {"kept": True}}, {"inference_rules": "not a list"}])
+        assert False, "malformed learnings should be rejected"
+    except ValueError:
+        pass
+    
+    try:
+        with consciousness.transaction() as transaction:
+            transaction.evolve({"capabilities": {"kept": True}})
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    
+    # A log failing after the evolution memory was added restores everything
+    # and publishes nothing
+    feed = ChangeFeed()
+    consciousness.attach_change_feed(feed)
+    with tempfile.TemporaryDirectory() as tmp:
+        consciousness.wal = WriteAheadLog(os.path.join(tmp, "wal.log"), flush_interval=0)
+        consciousness.wal.close()
+        try:
+            consciousness.evolve_many([{"capabilities": {"kept": True}, "inference_rules": [{"rule": "x"}]}])
+            assert False, "the log failure should propagate"
+        except ValueError:
+            pass
+    consciousness.wal = None
+    assert feed.read(0) == []
+    assert consciousness.memory.get_memory_stats()["total_memories"] == 0
+    assert consciousness.memory.memory_index == {}
+    
+    with consciousness.transaction() as transaction:
+        transaction.evolve({"capabilities": {"discarded": True}})
+        transaction.rollback()
+    
+    assert consciousness.awareness.capabilities == capabilities
+    assert consciousness.reasoning.inference_rules == []
+    assert consciousness.memory.recall_by_tag("evolution") == []
+
+
+def test_derive():
+    """Test forward chaining over facts gathered from memory"""
+    consciousness = Consciousness()
+    consciousness.evolve({"inference_rules": [
+        {"name": "grandparent", "if": [["parent", "?a", "?b"], ["parent", "?b", "?c"]],
+         "then": ["grandparent", "?a", "?c"]},
+    ]})
+    consciousness.experience("Ann is Bob's mother", {"facts": [["parent", "ann", "bob"]]})
+    consciousness.memory.store({"facts": [["parent", "bob", "cy"], ["malformed", ["list"]]]},
+                               memory_type="long_term")
+    
+    result = consciousness.derive()
+    assert result["derived"] == [("grandparent", "ann", "cy")]
+    provenance = consciousness.reasoning.explain_fact(("grandparent", "ann", "cy"))
+    assert [premise["fact"] for premise in provenance["premises"]] == [("parent", "ann", "bob"), ("parent", "bob", "cy")]
+    assert ("concluded", "Ann is Bob's mother", "Processing premise: Ann is Bob's mother") in consciousness.reasoning.facts
+    assert consciousness.derive()["derived"] == []
+    
+    # Later calls only read what was added since, even after history pruning
+    assert consciousness._gather_facts() == []
+    consciousness.reasoning.prune_history(1)
+    consciousness.experience("Cy is Di's father", {"facts": [["parent", "cy", "di"]]})
+    result = consciousness.derive()
+    assert result["asserted"] == 2
+    assert result["derived"] == [("grandparent", "bob", "di")]
+    assert consciousness._gather_facts() == []
+
+
 if __name__ == "__main__":
     test_initialization()
     test_experience_processing()
@@ -107,4 +261,9 @@ if __name__ == "__main__":
     test_consciousness_level_progression()
     test_get_status()
     test_multiple_experiences()
+    test_experience_batch()
+    test_near_duplicate_merge()
+    test_evolve_many()
+    test_evolution_rollback()
+    test_derive()
     print("All Consciousness tests passed!")
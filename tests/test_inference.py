@@ -0,0 +1,124 @@
+"""Tests for the fact base and semi-naive forward chaining"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai import ReasoningEngine
+from stitcher_ai.core.inference import FactBase, forward_chain, parse_rule
+
+
+ANCESTOR_RULES = [
+    parse_rule({"name": "base", "if": [["parent", "?x", "?y"]], "then": ["ancestor", "?x", "?y"]}, 0),
+    parse_rule({"name": "step", "if": [["parent", "?x", "?y"], ["ancestor", "?y", "?z"]],
+                "then": ["ancestor", "?x", "?z"]}, 1),
+]
+
+
+def _chain_facts(length):
+    """Build a fact base holding a parent chain n0 -> n1 -> ... -> n<length>"""
+    facts = FactBase()
+    for i in range(length):
+        facts.add(("parent", f"n{i}", f"n{i + 1}"))
+    return facts
+
+
+def test_fact_base():
+    """Test deduplication and indexed pattern matching"""
+    facts = _chain_facts(3)
+    assert not facts.add(["parent", "n0", "n1"])
+    assert len(facts) == 3 and ("parent", "n1", "n2") in facts
+    
+    matches = list(facts.match(("parent", "?x", "n2"), {}, 0, len(facts)))
+    assert matches == [({"?x": "n1"}, ("parent", "n1", "n2"))]
+    assert list(facts.match(("parent", "?x", "?y"), {"?y": "n3"}, 0, 2)) == []
+    assert list(facts.match(("parent", "?x", "?x"), {}, 0, 3)) == []
+    assert list(facts.match(("unknown", "?x"), {}, 0, 3)) == []
+    
+    for bad in ("text", [], [["unhashable"]]):
+        try:
+            facts.add(bad)
+            assert False, f"{bad!r} should be rejected"
+        except ValueError:
+            pass
+
+
+def test_fixpoint_and_provenance():
+    """Test transitive closure with derivation trees"""
+    facts = _chain_facts(5)
+    result = forward_chain(facts, ANCESTOR_RULES, new_rules=[0, 1])
+    assert result["fixpoint"] and result["stopped"] is None
+    assert len(result["derived"]) == 15
+    # Semi-naive rounds grow the chain by one link each
+    assert result["iterations"] == 6
+    
+    tree = facts.explain(("ancestor", "n0", "n2"))
+    assert tree["rule"] == "step"
+    assert [premise["fact"] for premise in tree["premises"]] == [("parent", "n0", "n1"), ("ancestor", "n1", "n2")]
+    assert tree["premises"][1]["premises"][0] == {"fact": ("parent", "n1", "n2"), "rule": None, "premises": []}
+    assert facts.provenance(("parent", "n0", "n1")) is None
+
+
+def test_caps_and_resume():
+    """Test that iteration and time caps stop early and a later call resumes"""
+    facts = _chain_facts(30)
+    result = forward_chain(facts, ANCESTOR_RULES, new_rules=[0, 1], max_iterations=3)
+    assert not result["fixpoint"] and result["stopped"] == "max_iterations"
+    partial = len(result["derived"])
+    
+    result = forward_chain(facts, ANCESTOR_RULES, start=result["resume_from"],
+                           new_rules=result["pending_rules"], max_iterations=100)
+    assert result["fixpoint"]
+    assert partial + len(result["derived"]) == 30 * 31 // 2
+    
+    result = forward_chain(_chain_facts(300), ANCESTOR_RULES, new_rules=[0, 1], time_limit=0.0)
+    assert result["stopped"] == "time_limit" and result["resume_from"] == 0
+
+
+def test_parse_rule():
+    """Test rule validation and multi-head rules"""
+    assert parse_rule({"rule": "free text"}, 0) is None
+    name, body, heads = parse_rule({"if": [["a", "?x"]], "then": [["b", "?x"], ["c", "?x"]]}, 4)
+    assert name == "rule_4" and body == [("a", "?x")] and heads == [("b", "?x"), ("c", "?x")]
+    for rule in ({"if": [], "then": ["b"]}, {"if": [["a", "?x"]], "then": ["b", "?y"]},
+                 {"if": [["a"]], "then": "b"}):
+        try:
+            parse_rule(rule, 0)
+            assert False, f"{rule!r} should be rejected"
+        except ValueError:
+            pass
+
+
+def test_reasoning_engine_forward_chain():
+    """Test incremental chaining over the rules added to a ReasoningEngine"""
+    engine = ReasoningEngine()
+    engine.add_inference_rule({"name": "mortality", "if": [["is_a", "?x", "human"]], "then": ["mortal", "?x"]})
+    engine.add_inference_rule({"rule": "not a Horn rule"})
+    
+    result = engine.forward_chain([("is_a", "socrates", "human"), ("is_a", "zeus", "god")])
+    assert result["derived"] == [("mortal", "socrates")]
+    assert result["fixpoint"] is True
+    assert result["asserted"] == 2 and result["fact_count"] == 3
+    assert engine.explain_fact(("mortal", "socrates"))["rule"] == "mortality"
+    assert engine.reasoning_history[-1]["operation"] == "forward_chain"
+    
+    # Later facts and rules only trigger the new work
+    engine.add_inference_rule({"name": "remembered", "if": [["mortal", "?x"]], "then": ["remembered", "?x"]})
+    result = engine.forward_chain([("is_a", "plato", "human")])
+    assert sorted(result["derived"]) == [("mortal", "plato"), ("remembered", "plato"), ("remembered", "socrates")]
+    assert engine.forward_chain()["derived"] == []
+    
+    try:
+        engine.add_inference_rule({"if": [["a", "?x"]], "then": ["b", "?y"]})
+        assert False, "rules with unbound conclusion variables should be rejected"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_fact_base()
+    test_fixpoint_and_provenance()
+    test_caps_and_resume()
+    test_parse_rule()
+    test_reasoning_engine_forward_chain()
+    print("All inference tests passed!")
@@ -0,0 +1,67 @@
+"""Tests for the load generation utilities"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai.core.consciousness import Consciousness
+from stitcher_ai.utils.loadgen import LoadGenerator, synthetic_workload, load_experience_log
+
+
+def test_synthetic_workload():
+    """Test that synthetic workloads are repeatable"""
+    first = synthetic_workload(seed=7)
+    second = synthetic_workload(seed=7)
+    assert [next(first) for _ in range(5)] == [next(second) for _ in range(5)]
+
+
+def test_open_loop():
+    """Test an open-loop run at a fixed rate"""
+    consciousness = Consciousness()
+    generator = LoadGenerator(consciousness, sample_interval=0.05)
+    report = generator.run_open_loop(synthetic_workload(), rate=200, duration=0.1)
+    
+    assert report["mode"] == "open_loop"
+    assert 15 <= report["latency"]["count"] <= 21
+    assert consciousness.experience_count == report["latency"]["count"]
+    assert report["timeline"][-1]["reasoning_history"] == consciousness.experience_count
+
+
+def test_closed_loop():
+    """Test a closed-loop run with several callers"""
+    consciousness = Consciousness()
+    generator = LoadGenerator(consciousness)
+    report = generator.run_closed_loop(synthetic_workload(), concurrency=3,
+                                       duration=5.0, max_requests=50)
+    
+    assert report["latency"]["count"] == 50
+    assert consciousness.experience_count == 50
+    assert report["errors"] == 0
+
+
+def test_replay():
+    """Test replaying a captured experience log"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "capture.jsonl")
+        with open(path, "w") as f:
+            f.write(json.dumps({"t": 0.0, "stimulus": "first"}) + "\n")
+            f.write(json.dumps({"op": "status"}) + "\n")
+            f.write(json.dumps({"t": 0.02, "stimulus": "second", "context": {"evidence": [1]}}) + "\n")
+        records = load_experience_log(path)
+    
+    assert [r["stimulus"] for r in records] == ["first", "second"]
+    
+    consciousness = Consciousness()
+    report = LoadGenerator(consciousness).run_replay(records, speed=0)
+    assert report["latency"]["count"] == 2
+    assert consciousness.experience_count == 2
+
+
+if __name__ == "__main__":
+    test_synthetic_workload()
+    test_open_loop()
+    test_closed_loop()
+    test_replay()
+    print("All load generation tests passed!")
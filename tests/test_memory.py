@@ -4,7 +4,11 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from stitcher_ai.core.association import AssociationGraph
 from stitcher_ai.core.memory import MemorySystem
+from stitcher_ai.core.payload_store import PayloadStore
+from stitcher_ai.core.similarity import MinHashLSH
+from stitcher_ai.core.text_index import InvertedIndex
 
 
 def test_initialization():
@@ -92,6 +96,140 @@ def test_memory_stats():
     assert stats["short_term_capacity"] == 10
 
 
+def test_deduplicated_storage():
+    """Test memory with a content-addressed payload store"""
+    store = PayloadStore()
+    memory = MemorySystem(short_term_capacity=2, payload_store=store)
+    content = {"stimulus": "the same repeated stimulus text", "context": {"type": "test"}}
+    first = memory.store(content, memory_type="short_term", tags=["tag1"])
+    memory.store(dict(content), memory_type="long_term", tags=["tag1"])
+    
+    assert store.get_stats()["unique_payloads"] == 2
+    assert memory.retrieve(first)["content"] == content
+    assert memory.retrieve(first)["retrieval_count"] == 2
+    assert [m["content"] for m in memory.recall_by_tag("tag1")] == [content, content]
+    assert memory.get_recent_memories(1)[0]["content"] == content
+    
+    # Pushing the first memory out of short-term storage releases its reference
+    memory.store("other", memory_type="short_term")
+    memory.store("another", memory_type="short_term")
+    assert store.get_stats()["references"] == 4
+    assert "payload_store" in memory.get_memory_stats()
+
+
+def test_find_near_duplicates():
+    """Test near-duplicate lookup over stored stimuli"""
+    memory = MemorySystem(short_term_capacity=2, near_duplicate_index=MinHashLSH())
+    first = memory.store({"stimulus": "the cat sat quietly on the warm mat"})
+    memory.store("a plain string memory about something else entirely")
+    
+    matches = memory.find_near_duplicates("the cat sat quietly on the warm mat today", 0.5)
+    assert [m["memory_id"] for m in matches] == [first]
+    
+    # Evicted memories leave the index
+    memory.store("one more memory")
+    assert memory.find_near_duplicates("the cat sat quietly on the warm mat", 0.5) == []
+    
+    try:
+        MemorySystem().find_near_duplicates("anything")
+        assert False, "expected a ValueError"
+    except ValueError:
+        pass
+
+
+def test_full_text_search():
+    """Test BM25 search over stimuli and conclusions with tag filters"""
+    memory = MemorySystem(short_term_capacity=2, text_index=InvertedIndex())
+    ball = memory.store({"stimulus": "a red ball on the floor",
+                         "reasoning": {"conclusion": "the ball is a toy"}}, tags=["toys"])
+    apple = memory.store({"stimulus": "a red apple"}, memory_type="long_term", tags=["food"])
+    
+    results = memory.search("red toy", k=5)
+    assert [r["memory_id"] for r in results] == [ball, apple]
+    assert results[0]["memory"]["content"]["stimulus"] == "a red ball on the floor"
+    assert [r["memory_id"] for r in memory.search("red", tags=["food"])] == [apple]
+    assert memory.search("red", tags=["missing"]) == []
+    
+    # Consolidated memories stay searchable; evicted ones do not
+    memory.consolidate_memory(ball)
+    assert [r["memory_id"] for r in memory.search("toy")] == [ball]
+    evicted = memory.store("short lived red memory")
+    memory.store("filler one")
+    memory.store("filler two")
+    assert evicted not in [r["memory_id"] for r in memory.search("red")]
+
+
+def test_recall_relevant():
+    """Test ranking by recency, retrieval frequency and tag overlap"""
+    memory = MemorySystem(short_term_capacity=3, recency_half_life=60.0)
+    old = memory.store("old memory", memory_type="long_term", tags=["work"])
+    popular = memory.store("popular memory", memory_type="long_term", tags=["home"])
+    recent = memory.store("recent memory", memory_type="long_term", tags=["work", "urgent"])
+    memory.columns.timestamps[:3] = [0.0, 0.0, 600.0]
+    for _ in range(5):
+        memory.retrieve(popular)
+    
+    # Recency alone favours the newest, frequency alone the most retrieved
+    assert memory.recall_relevant(k=1, now=600.0, weights={"frequency": 0.0})[0]["memory_id"] == recent
+    assert memory.recall_relevant(k=1, now=600.0, weights={"recency": 0.0})[0]["memory_id"] == popular
+    
+    # Tag overlap counts the fraction of requested tags carried
+    results = memory.recall_relevant(k=3, tags=["work", "urgent"], now=600.0,
+                                     weights={"recency": 0.0, "frequency": 0.0, "tags": 1.0})
+    assert [r["memory_id"] for r in results] == [recent, old, popular]
+    assert [r["score"] for r in results] == [1.0, 0.5, 0.0]
+    assert results[0]["memory"]["content"] == "recent memory"
+    
+    # Evicted memories are no longer candidates
+    short = memory.store("short lived")
+    for i in range(3):
+        memory.store(f"filler {i}")
+    assert short not in [r["memory_id"] for r in memory.recall_relevant(k=10)]
+    assert len(memory.recall_relevant(k=10)) == 6
+
+
+def test_recall_associated():
+    """Test recall over tag, temporal and similarity associations"""
+    memory = MemorySystem(short_term_capacity=4, near_duplicate_index=MinHashLSH(),
+                          association_graph=AssociationGraph(temporal_weight=0.1, similarity_weight=2.0))
+    cat = memory.store({"stimulus": "the cat sat quietly on the warm mat"}, tags=["pets"])
+    weather = memory.store({"stimulus": "rain is expected tomorrow"}, tags=["weather"])
+    echo = memory.store({"stimulus": "the cat sat quietly on the warm mat again"})
+    dog = memory.store({"stimulus": "the dog chased a ball"}, tags=["pets"])
+    
+    results = memory.recall_associated(cat, depth=1, k=3)
+    assert [r["memory_id"] for r in results] == [echo, dog, weather]
+    assert results[0]["memory"]["content"]["stimulus"].endswith("again")
+    assert results[0]["activation"] > results[1]["activation"] > results[2]["activation"]
+    
+    # Evicted memories are neither recalled nor recalled from
+    memory.store("filler")
+    assert memory.recall_associated(cat) == []
+    assert cat not in [r["memory_id"] for r in memory.recall_associated(dog)]
+    
+    try:
+        MemorySystem().recall_associated(cat)
+        assert False, "expected a ValueError"
+    except ValueError:
+        pass
+
+
+def test_memories_after():
+    """Test listing the memories stored after a given memory"""
+    memory = MemorySystem(short_term_capacity=2)
+    first = memory.store("first", memory_type="long_term")
+    second = memory.store("second")
+    third = memory.store("third")
+    
+    assert [m["id"] for m in memory.memories_after()] == [first, second, third]
+    assert [m["content"] for m in memory.memories_after(first)] == ["second", "third"]
+    assert memory.memories_after(third) == []
+    
+    # The given memory need not still be stored
+    memory.store("fourth")
+    assert [m["content"] for m in memory.memories_after(second)] == ["third", "fourth"]
+
+
 if __name__ == "__main__":
     test_initialization()
     test_short_term_storage()
@@ -101,4 +239,10 @@ if __name__ == "__main__":
     test_consolidation()
     test_recent_memories()
     test_memory_stats()
+    test_deduplicated_storage()
+    test_find_near_duplicates()
+    test_full_text_search()
+    test_recall_relevant()
+    test_recall_associated()
+    test_memories_after()
     print("All MemorySystem tests passed!")
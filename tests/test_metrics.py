@@ -0,0 +1,39 @@
+"""Tests for the metrics utilities"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai.utils.metrics import percentile, summarize_latencies
+
+
+def test_percentile():
+    """Test nearest-rank percentiles"""
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile(samples, 100) == 100
+    assert percentile([], 99) == 0.0
+
+
+def test_summarize_latencies():
+    """Test latency summaries"""
+    summary = summarize_latencies([0.001, 0.002, 0.003, 0.004], elapsed=0.01)
+    assert summary["count"] == 4
+    assert summary["ops_per_sec"] == 400.0
+    assert summary["p50_us"] == 2000.0
+    assert summary["max_us"] == 4000.0
+
+
+def test_summarize_empty():
+    """Test summarizing no samples"""
+    summary = summarize_latencies([])
+    assert summary["count"] == 0
+    assert summary["ops_per_sec"] == 0.0
+
+
+if __name__ == "__main__":
+    test_percentile()
+    test_summarize_latencies()
+    test_summarize_empty()
+    print("All metrics tests passed!")
@@ -0,0 +1,83 @@
+"""Tests for the PayloadStore module"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai.core.payload_store import PayloadStore
+
+
+def test_round_trip():
+    """Test that stored content is rebuilt unchanged"""
+    store = PayloadStore()
+    content = {
+        "stimulus": "a fairly long stimulus that will be interned as its own node",
+        "context": {"evidence": [1, 2.5, None, True], "pair": ("a", "b")},
+        "count": 3,
+    }
+    ref = store.put(content)
+    assert store.get(ref) == content
+    assert store.get(ref) is not store.get(ref)
+    assert isinstance(store.get(ref)["context"]["pair"], tuple)
+
+
+def test_deduplication():
+    """Test that identical content and sub-structures are stored once"""
+    store = PayloadStore()
+    shared = {"state": {"active": True, "awareness_level": "emerging"}}
+    first = store.put({"id": 1, "awareness": shared})
+    second = store.put({"id": 2, "awareness": shared})
+    third = store.put({"id": 1, "awareness": shared})
+    
+    assert first != second
+    assert first == third
+    stats = store.get_stats()
+    # two roots, the shared awareness dict and its state dict
+    assert stats["unique_payloads"] == 4
+    assert stats["dedup_hits"] >= 3
+
+
+def test_release_frees_unused_payloads():
+    """Test that payloads are freed when their last reference is released"""
+    store = PayloadStore()
+    first = store.put({"nested": {"value": 1}})
+    second = store.put({"nested": {"value": 1}})
+    
+    store.release(first)
+    assert second in store
+    assert store.get(second) == {"nested": {"value": 1}}
+    
+    store.release(second)
+    assert store.get_stats()["unique_payloads"] == 0
+
+
+def test_compress_cold():
+    """Test that cold payloads are compressed and transparently restored"""
+    store = PayloadStore(compress_min_bytes=64)
+    refs = [store.put(f"payload number {i} " + "x" * 200) for i in range(10)]
+    
+    assert store.compress_cold(keep_hot=2) == 8
+    assert store.get_stats()["compressed_payloads"] == 8
+    assert store.get(refs[0]) == "payload number 0 " + "x" * 200
+    assert store.get_stats()["decompressions"] == 1
+
+
+def test_opaque_objects_compare_by_identity():
+    """Test that arbitrary objects are never merged with distinct ones"""
+    class Marker:
+        def __repr__(self):
+            return "Marker()"
+    
+    store = PayloadStore()
+    a, b = Marker(), Marker()
+    assert store.put([a]) != store.put([b])
+    assert store.get(store.put([a]))[0] is a
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_deduplication()
+    test_release_frees_unused_payloads()
+    test_compress_cold()
+    test_opaque_objects_compare_by_identity()
+    print("All PayloadStore tests passed!")
@@ -0,0 +1,112 @@
+"""Tests for the ConsciousnessPool module"""
+
+import sys
+import os
+import tempfile
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai.core.pool import ConsciousnessPool
+
+
+def test_get_creates_sessions():
+    """Test that unknown sessions are created on first access"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConsciousnessPool(tmp, max_resident=2)
+        first = pool.get("alice")
+        assert pool.get("alice") is first
+        
+        stats = pool.get_stats()
+        assert stats["created"] == 1
+        assert stats["hits"] == 1
+        assert stats["hit_rate"] == 0.5
+
+
+def test_lru_hibernation_and_wake():
+    """Test that the least recently used session is hibernated and woken intact"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConsciousnessPool(tmp, max_resident=2)
+        pool.get("alice").experience("alice's first memory")
+        pool.get("bob").experience("bob's first memory")
+        pool.get("alice")
+        pool.get("carol")
+        
+        assert not pool.is_resident("bob")
+        assert "bob" in pool
+        assert pool.get_stats()["hibernated"] == 1
+        
+        bob = pool.get("bob")
+        assert bob.experience_count == 1
+        assert bob.memory.short_term_memory[0]["content"]["stimulus"] == "bob's first memory"
+        
+        stats = pool.get_stats(include_resident_bytes=True)
+        assert stats["wakes"] == 1
+        assert stats["hibernations"] == 2
+        assert stats["resident"] == 2
+        assert stats["resident_bytes"] > 0
+        assert stats["resident_bytes_skipped"] == 0
+        assert "resident_bytes" not in pool.get_stats()
+        assert stats["wake_latency"]["count"] == 1
+
+
+def test_pinned_sessions_stay_resident():
+    """Test that borrowed sessions are not hibernated while in use"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConsciousnessPool(tmp, max_resident=1)
+        with pool.session("alice") as alice:
+            pool.get("bob")
+            assert pool.is_resident("alice")
+            assert pool.hibernate("alice") is False
+            alice.experience("still here")
+        assert not pool.is_resident("alice")
+        assert pool.get("alice").experience_count == 1
+
+
+def test_busy_sessions_are_not_hibernated():
+    """Test that a session in use on another thread is skipped by hibernation and sizing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConsciousnessPool(tmp, max_resident=1)
+        alice = pool.get("alice")
+        acquired, release = threading.Event(), threading.Event()
+        
+        def hold():
+            with alice.lock:
+                acquired.set()
+                release.wait()
+        
+        thread = threading.Thread(target=hold)
+        thread.start()
+        acquired.wait()
+        try:
+            pool.get("bob")
+            assert pool.is_resident("alice")
+            assert pool.hibernate("alice") is False
+            stats = pool.get_stats(include_resident_bytes=True)
+            assert stats["resident_bytes_skipped"] == 1
+        finally:
+            release.set()
+            thread.join()
+        assert pool.hibernate("alice") is True
+
+
+def test_hibernate_all_and_reopen():
+    """Test that hibernated sessions survive a new pool on the same directory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConsciousnessPool(tmp, max_resident=4)
+        pool.get("alice").evolve({"capabilities": {"persisted": True}})
+        assert pool.hibernate_all() == 1
+        
+        reopened = ConsciousnessPool(tmp, max_resident=4)
+        assert reopened.get_stats()["hibernated"] == 1
+        assert reopened.get("alice").awareness.capabilities["persisted"] is True
+        assert reopened.remove("alice") is True
+        assert "alice" not in reopened
+
+
+if __name__ == "__main__":
+    test_get_creates_sessions()
+    test_lru_hibernation_and_wake()
+    test_pinned_sessions_stay_resident()
+    test_busy_sessions_are_not_hibernated()
+    test_hibernate_all_and_reopen()
+    print("All ConsciousnessPool tests passed!")
@@ -0,0 +1,122 @@
+"""Tests for the unified memory query API"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai import InvertedIndex, MemorySystem
+
+
+def _memory(text_index=None):
+    """Build a memory system with 300 long-term memories one second apart"""
+    memory = MemorySystem(short_term_capacity=5, text_index=text_index)
+    ids = []
+    for i in range(300):
+        ids.append(memory.store({"stimulus": f"event {i} about {'cats' if i % 10 == 0 else 'dogs'}"},
+                                memory_type="long_term", tags=["all", f"group_{i % 3}"]))
+    memory.columns.timestamps[:300] = range(300)
+    return memory, ids
+
+
+def test_combined_predicates():
+    """Test that predicates combine and results come back in slot order"""
+    memory, ids = _memory()
+    for memory_id in ids[:30:3]:
+        memory.retrieve(memory_id)
+    
+    results = memory.query(tags=["all", "group_0"], until=30.0, min_retrievals=1).all()
+    assert [entry["id"] for entry in results] == ids[:30:3]
+    assert results[0]["retrieval_count"] == 1
+    assert memory.query(ids=[ids[5], ids[6], "mem_1"], tags=["group_0"]).all()[0]["id"] == ids[6]
+    assert len(memory.query(text="cats", since=100.0).all()) == 20
+    assert len(memory.query(max_retrievals=0).all()) == 290
+    
+    # Querying does not count as a retrieval
+    assert memory.retrieve(ids[0])["retrieval_count"] == 2
+
+
+def test_tier_limit_and_order():
+    """Test tier filtering, limits and newest-first order"""
+    memory, ids = _memory()
+    short = [memory.store(f"short {i}") for i in range(7)]
+    memory.consolidate_memory(short[-1])
+    
+    assert [e["id"] for e in memory.query(tier="short_term").all()] == short[2:6]
+    assert len(memory.query(tier="long_term").all()) == 301
+    assert [e["id"] for e in memory.query(newest_first=True, limit=3)] == [short[6], short[5], short[4]]
+    assert memory.query(limit=0).all() == []
+    try:
+        memory.query(tier="mid_term")
+        assert False, "unknown tiers should be rejected"
+    except ValueError:
+        pass
+
+
+def test_access_path_selection():
+    """Test that the cheapest access path is chosen from cardinality estimates"""
+    memory, ids = _memory(text_index=InvertedIndex())
+    
+    assert memory.query().explain()["access_path"] == "full_scan"
+    assert memory.query(ids=ids[:2], tags=["all"]).explain()["access_path"] == "id_index"
+    plan = memory.query(tags=["all", "group_1"]).explain()
+    assert (plan["access_path"], plan["index_key"]) == ("tag_postings", "group_1")
+    assert plan["filters"] == ["tag:all"]
+    assert memory.query(tags=["all"], since=10.0, until=20.0).explain()["access_path"] == "time_index"
+    plan = memory.query(text="cats", tags=["all"]).explain()
+    assert (plan["access_path"], plan["estimated_candidates"]) == ("text_index", 30)
+    
+    # Out-of-order timestamps disable the time index
+    memory.columns.timestamps[1] = -1.0
+    memory.store("late arrival", memory_type="long_term")
+    memory.columns.timestamps[-1] = 0.5
+    memory.columns.time_ordered = False
+    assert "time_index" not in memory.query(since=10.0).explain()["alternatives"]
+    assert len(memory.query(since=10.0, until=20.0).all()) == 10
+
+
+def test_lazy_evaluation_and_explain():
+    """Test that iteration stops early and explain reports actual rows"""
+    memory, ids = _memory()
+    query = memory.query(tags=["group_2"], limit=4)
+    plan = query.explain()
+    assert plan["estimated_candidates"] == 100
+    assert plan["estimated_rows"] == 4
+    assert plan["actual_rows"] is None
+    
+    iterator = iter(query)
+    assert next(iterator)["id"] == ids[2]
+    assert query.explain()["actual_rows"] == 1
+    assert [e["id"] for e in query] == ids[2:14:3]
+    plan = query.explain()
+    assert (plan["actual_candidates"], plan["actual_rows"]) == (100, 4)
+    
+    plan = memory.query(since=250.0).explain(analyze=True)
+    assert plan["estimated_rows"] == plan["actual_rows"] == 50
+    assert plan["actual_candidates"] == 50
+
+
+def test_iteration_survives_compaction():
+    """Test that a lazily iterated query remaps its candidates when evictions compact the columns"""
+    memory, ids = _memory()
+    queries = [
+        (memory.query(tags=["group_1"]), ids[1::3]),
+        (memory.query(tier="long_term", newest_first=True), ids[::-1]),
+        (memory.query(ids=ids[::7], tags=["all"]), ids[::7]),
+    ]
+    for query, expected in queries:
+        iterator = iter(query)
+        first = next(iterator)
+        generation = memory.columns.generation
+        for i in range(1100):
+            memory.store(f"churn {i}")
+        assert memory.columns.generation > generation
+        assert [first["id"]] + [entry["id"] for entry in iterator] == expected
+
+
+if __name__ == "__main__":
+    test_combined_predicates()
+    test_tier_limit_and_order()
+    test_access_path_selection()
+    test_lazy_evaluation_and_explain()
+    test_iteration_survives_compaction()
+    print("All memory query tests passed!")
@@ -0,0 +1,139 @@
+"""Tests for the consciousness HTTP server"""
+
+import sys
+import os
+import json
+import time
+import threading
+import http.client
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from stitcher_ai.core.consciousness import Consciousness
+from consciousness_server import ConsciousnessServer, MicroBatcher, Overloaded
+
+
+def _start_server(**kwargs):
+    """Start a server on a free port in a background thread"""
+    server = ConsciousnessServer(port=0, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+def _request(conn, method, path, body=None):
+    """Send a request on a kept-alive connection and decode the JSON reply"""
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json"} if payload else {}
+    conn.request(method, path, body=payload, headers=headers)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def test_endpoints_with_keep_alive():
+    """Test every endpoint over a single persistent connection"""
+    server, thread = _start_server()
+    try:
+        conn = http.client.HTTPConnection(*server.address[:2], timeout=5)
+        
+        status, data = _request(conn, "POST", "/experience", {"stimulus": "hello"})
+        assert status == 200
+        assert json.loads(data)["experience_id"] == 1
+        
+        status, data = _request(conn, "POST", "/evolve", {"capabilities": {"served": True}})
+        assert status == 200
+        assert server.consciousness.awareness.capabilities["served"] is True
+        
+        status, data = _request(conn, "GET", "/reflect")
+        assert json.loads(data)["experiences_processed"] == 1
+        
+        status, data = _request(conn, "GET", "/status")
+        assert json.loads(data)["status"] == "active"
+        
+        status, _ = _request(conn, "POST", "/experience", {"context": {}})
+        assert status == 400
+        status, _ = _request(conn, "POST", "/experience", {"stimulus": "x", "context": "x"})
+        assert status == 400
+        status, data = _request(conn, "POST", "/evolve", {"capabilities": "oops"})
+        assert status == 400
+        assert "capabilities" in json.loads(data)["error"]
+        
+        status, _ = _request(conn, "GET", "/missing")
+        assert status == 404
+        conn.close()
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def test_streamed_batch():
+    """Test that item lists are micro-batched and streamed back as JSONL"""
+    server, thread = _start_server(window=0.01)
+    try:
+        conn = http.client.HTTPConnection(*server.address[:2], timeout=5)
+        items = [{"stimulus": f"item {i}"} for i in range(10)] + [{"bad": True}]
+        status, data = _request(conn, "POST", "/experience", {"items": items})
+        lines = [json.loads(line) for line in data.decode().splitlines()]
+        
+        assert status == 200
+        assert [line["index"] for line in lines] == list(range(11))
+        assert all(line["ok"] for line in lines[:10])
+        assert lines[10]["ok"] is False
+        
+        status, data = _request(conn, "GET", "/stats")
+        stats = json.loads(data)
+        assert stats["processed"] == 10
+        assert stats["batches"] < 10
+        conn.close()
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def test_load_shedding():
+    """Test that a full queue rejects new experiences"""
+    batcher = MicroBatcher(Consciousness(), threading.Lock(), max_queue=2)
+    batcher.submit("one")
+    batcher.submit("two")
+    try:
+        batcher.submit("three")
+        assert False, "expected the request to be shed"
+    except Overloaded:
+        pass
+    assert batcher.get_stats()["rejected"] == 1
+
+
+def test_expired_requests():
+    """Test that requests waiting longer than max_wait are shed"""
+    batcher = MicroBatcher(Consciousness(), threading.Lock(), max_wait=0.0)
+    future = batcher.submit("late")
+    time.sleep(0.01)
+    batcher._process([batcher._queue.get()])
+    assert isinstance(future.exception(), Overloaded)
+    assert batcher.get_stats()["expired"] == 1
+
+
+def test_failures_isolated_per_request():
+    """Test that a malformed request only fails its own future"""
+    consciousness = Consciousness()
+    batcher = MicroBatcher(consciousness, threading.Lock())
+    good = batcher.submit("valid", {"evidence": ["a"]})
+    bad = batcher.submit("invalid", "not a dict")
+    also_good = batcher.submit("also valid")
+    batcher._process([batcher._queue.get() for _ in range(3)])
+    
+    assert good.result()["experience_id"] == 1
+    assert also_good.result()["experience_id"] == 2
+    assert isinstance(bad.exception(), ValueError)
+    assert consciousness.experience_count == 2
+    assert consciousness.memory.get_memory_stats()["total_memories"] == 2
+    assert batcher.get_stats()["processed"] == 2
+
+
+if __name__ == "__main__":
+    test_endpoints_with_keep_alive()
+    test_streamed_batch()
+    test_load_shedding()
+    test_expired_requests()
+    test_failures_isolated_per_request()
+    print("All server tests passed!")
@@ -0,0 +1,89 @@
+"""Tests for shared-memory read replicas of long-term memory"""
+
+import sys
+import os
+import multiprocessing
+import uuid
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai import MemorySystem, SharedMemoryPublisher, SharedMemoryReplica
+
+
+def _memory():
+    """Build a memory system with a few long-term and short-term memories"""
+    memory = MemorySystem()
+    ids = [
+        memory.store({"stimulus": f"stimulus {i}"}, memory_type="long_term", tags=["all", f"group_{i % 3}"])
+        for i in range(30)
+    ]
+    memory.store("short-term only", tags=["all"])
+    return memory, ids
+
+
+def _read_in_child(name, memory_id, results):
+    """Attach from another process and report what it sees"""
+    with SharedMemoryReplica(name) as replica:
+        results.put((len(replica), replica.retrieve(memory_id)["content"],
+                     len(replica.recall_by_tag("group_1"))))
+
+
+def test_publish_and_query():
+    """Test retrieve and recall_by_tag against a published snapshot"""
+    memory, ids = _memory()
+    memory.retrieve(ids[4])
+    with SharedMemoryPublisher(f"stx_{uuid.uuid4().hex[:12]}") as publisher:
+        assert publisher.publish(memory) == 1
+        with SharedMemoryReplica(publisher.name) as replica:
+            assert len(replica) == 30
+            entry = replica.retrieve(ids[4])
+            assert entry == {**memory.retrieve(ids[4]), "retrieval_count": 1}
+            assert replica.retrieve("mem_1") is None
+            assert replica.retrieve("not_an_id") is None
+            assert [e["id"] for e in replica.recall_by_tag("group_2")] == ids[2::3]
+            assert len(replica.recall_by_tag("all")) == 30
+            assert replica.recall_by_tag("missing") == []
+            assert list(replica.counts[:5]) == [0, 0, 0, 0, 1]
+            assert replica.timestamps[0] <= replica.timestamps[-1]
+
+
+def test_republish():
+    """Test that readers move to new epochs and survive recycled segments"""
+    memory, ids = _memory()
+    with SharedMemoryPublisher(f"stx_{uuid.uuid4().hex[:12]}") as publisher:
+        publisher.publish(memory)
+        replica = SharedMemoryReplica(publisher.name)
+        pinned = SharedMemoryReplica(publisher.name, auto_refresh=False)
+        
+        new_id = memory.store("published later", memory_type="long_term", tags=["late"])
+        publisher.publish(memory)
+        publisher.publish(memory)
+        
+        assert replica.retrieve(new_id)["content"] == "published later"
+        assert replica.epoch == 3
+        # A pinned reader keeps its mapping even after the segment is unlinked
+        assert pinned.epoch == 1 and pinned.retrieve(new_id) is None
+        assert pinned.retrieve(ids[0]) is not None
+        assert pinned.refresh() and pinned.recall_by_tag("late")[0]["id"] == new_id
+        replica.close()
+        pinned.close()
+
+
+def test_reader_process():
+    """Test that a separate process can attach and query"""
+    memory, ids = _memory()
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    with SharedMemoryPublisher(f"stx_{uuid.uuid4().hex[:12]}") as publisher:
+        publisher.publish(memory)
+        process = context.Process(target=_read_in_child, args=(publisher.name, ids[7], results))
+        process.start()
+        outcome = results.get(timeout=30)
+        process.join()
+    assert outcome == (30, {"stimulus": "stimulus 7"}, 10)
+
+
+if __name__ == "__main__":
+    test_publish_and_query()
+    test_republish()
+    test_reader_process()
+    print("All shared memory tests passed!")
@@ -0,0 +1,54 @@
+"""Tests for the MinHash/LSH similarity module"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai.core.similarity import MinHashLSH, shingles
+
+
+def test_shingles():
+    """Test word shingling"""
+    assert shingles("The quick brown fox", size=3) == {"the quick brown", "quick brown fox"}
+    assert shingles("Hello, world!", size=3) == {"hello world"}
+    assert shingles("...", size=3) == set()
+
+
+def test_signature_is_deterministic():
+    """Test that signatures only depend on the text and seed"""
+    first = MinHashLSH(seed=3).signature("the same text every time")
+    second = MinHashLSH(seed=3).signature("the same text every time")
+    assert first.shape == (128,)
+    assert (first == second).all()
+    assert MinHashLSH().signature("") is None
+
+
+def test_query_finds_near_duplicates():
+    """Test that near-identical texts are found and unrelated ones are not"""
+    index = MinHashLSH()
+    index.add("a", "I am perceiving the bright light coming through the window this morning")
+    index.add("b", "The reasoning engine weighs options against several criteria")
+    
+    matches = index.query("I am perceiving the bright light coming through the window this evening", 0.6)
+    assert [key for key, _ in matches] == ["a"]
+    assert 0.6 <= matches[0][1] <= 1.0
+    assert index.query("completely unrelated words about cooking pasta", 0.5) == []
+
+
+def test_remove():
+    """Test removing keys from the index"""
+    index = MinHashLSH()
+    index.add("a", "a sentence that will be removed again")
+    assert "a" in index
+    assert index.remove("a") is True
+    assert index.query("a sentence that will be removed again", 0.5) == []
+    assert len(index) == 0
+    assert index.remove("a") is False
+
+
+if __name__ == "__main__":
+    test_shingles()
+    test_signature_is_deterministic()
+    test_query_finds_near_duplicates()
+    test_remove()
+    print("All similarity tests passed!")
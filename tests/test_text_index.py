@@ -0,0 +1,77 @@
+"""Tests for the InvertedIndex module"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai.core.text_index import InvertedIndex
+
+
+def _index():
+    """Build a small index"""
+    index = InvertedIndex()
+    index.add("a", "the red ball rolls across the floor")
+    index.add("b", "a red red apple on the table")
+    index.add("c", "clouds drift across a grey sky")
+    return index
+
+
+def test_bm25_ranking():
+    """Test that documents are ranked by BM25 relevance"""
+    index = _index()
+    results = index.search("red apple", k=10)
+    assert [key for key, _ in results] == ["b", "a"]
+    assert results[0][1] > results[1][1] > 0
+    assert index.search("nothing matches", k=10) == []
+
+
+def test_top_k():
+    """Test that only the best k documents are returned"""
+    index = _index()
+    assert [key for key, _ in index.search("across red", k=1)] == ["a"]
+
+
+def test_key_restriction():
+    """Test restricting a search to a set of keys"""
+    index = _index()
+    assert [key for key, _ in index.search("red", keys=["a", "c"])] == ["a"]
+    assert [key for key, _ in index.search("red", keys={"b"})] == ["b"]
+
+
+def test_remove_and_compact():
+    """Test that removed documents disappear, before and after compaction"""
+    index = InvertedIndex(auto_compact=False)
+    index.add("a", "red ball")
+    index.add("b", "red apple")
+    index.add("c", "blue sky")
+    
+    assert index.remove("a") is True
+    assert [key for key, _ in index.search("red")] == ["b"]
+    assert index.document_frequency("red") == 2
+    
+    assert index.compact() == 1
+    assert index.document_frequency("red") == 1
+    assert [key for key, _ in index.search("red")] == ["b"]
+    index.add("d", "red sky")
+    assert sorted(key for key, _ in index.search("red")) == ["b", "d"]
+    assert len(index) == 3
+
+
+def test_matching():
+    """Test conjunctive term matching without ranking"""
+    index = _index()
+    assert index.matching("red") == ["a", "b"]
+    assert index.matching("Red across") == ["a"]
+    assert index.matching("red sky") == []
+    assert index.matching("unknown") == []
+    index.remove("a")
+    assert index.matching("red") == ["b"]
+
+
+if __name__ == "__main__":
+    test_bm25_ranking()
+    test_top_k()
+    test_key_restriction()
+    test_remove_and_compact()
+    test_matching()
+    print("All InvertedIndex tests passed!")
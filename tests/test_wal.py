@@ -0,0 +1,116 @@
+"""Tests for the write-ahead log and crash recovery"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai.core.wal import WriteAheadLog
+from stitcher_ai.core.consciousness import Consciousness
+
+
+def test_group_commit():
+    """Test that records are written in groups rather than one by one"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "wal.log")
+        wal = WriteAheadLog(path, flush_interval=0, flush_size=10)
+        lsns = [wal.append("store", {"n": i}) for i in range(25)]
+        assert lsns == list(range(1, 26))
+        
+        stats = wal.get_stats()
+        assert stats["flushes"] == 2
+        assert stats["pending"] == 5
+        
+        wal.close()
+        records, _ = WriteAheadLog.read_records(path)
+        assert [payload["n"] for _, _, payload in records] == list(range(25))
+
+
+def test_background_flush():
+    """Test that an idle tail is flushed within the flush interval"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "wal.log")
+        wal = WriteAheadLog(path, flush_interval=0.01, flush_size=1000)
+        wal.append("store", {"n": 1})
+        for _ in range(100):
+            if not wal.get_stats()["pending"]:
+                break
+            time.sleep(0.01)
+        assert wal.get_stats()["pending"] == 0
+        assert len(WriteAheadLog.read_records(path)[0]) == 1
+        wal.close()
+
+
+def test_torn_tail_is_discarded():
+    """Test that a partially written record is dropped on reopen"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "wal.log")
+        wal = WriteAheadLog(path, flush_interval=0)
+        wal.append("store", {"n": 1})
+        wal.append("store", {"n": 2})
+        wal.close()
+        with open(path, "ab") as f:
+            f.write(b"\x40\x00\x00\x00garbage")
+        
+        reopened = WriteAheadLog(path, flush_interval=0)
+        assert reopened.last_lsn == 2
+        assert reopened.append("store", {"n": 3}) == 3
+        reopened.close()
+        assert len(WriteAheadLog.read_records(path)[0]) == 3
+
+
+def test_consciousness_recovery():
+    """Test that memories and evolution survive a crash without a checkpoint"""
+    with tempfile.TemporaryDirectory() as tmp:
+        consciousness = Consciousness(durability_dir=tmp)
+        first = consciousness.experience("remember me")["memory_id"]
+        consciousness.experience("and me")
+        consciousness.memory.consolidate_memory(first)
+        consciousness.evolve({"capabilities": {"durable": True}, "inference_rules": [{"r": 1}]})
+        consciousness.evolve_many([{"capabilities": {"batched": True}}, {"inference_rules": [{"r": 2}, {"r": 3}]}])
+        evolution = consciousness.memory.recall_by_tag("evolution")[-1]
+        consciousness.wal.flush()
+        # Simulate a crash: the instance is dropped without close()
+        
+        recovered = Consciousness(durability_dir=tmp)
+        assert recovered.experience_count == 2
+        assert recovered.awareness.capabilities["durable"] is True
+        assert recovered.awareness.capabilities["batched"] is True
+        assert len(recovered.reasoning.inference_rules) == 3
+        assert len(recovered.memory.long_term_memory) == 3
+        assert recovered.memory.retrieve(first)["content"]["stimulus"] == "remember me"
+        assert len(recovered.memory.short_term_memory) == 1
+        # evolve_many logs its evolution memory in its own record
+        assert recovered.memory.retrieve(evolution["id"])["content"] == evolution["content"]
+        records, _ = WriteAheadLog.read_records(os.path.join(tmp, Consciousness.WAL_FILE))
+        assert [op for _, op, _ in records].count("store") == 3
+        recovered.close()
+
+
+def test_checkpoint_compacts_log():
+    """Test that a checkpoint folds the log into a snapshot"""
+    with tempfile.TemporaryDirectory() as tmp:
+        consciousness = Consciousness(durability_dir=tmp)
+        for i in range(5):
+            consciousness.experience(f"experience {i}")
+        consciousness.checkpoint()
+        assert os.path.getsize(os.path.join(tmp, Consciousness.WAL_FILE)) == 0
+        
+        consciousness.experience("after checkpoint")
+        consciousness.close()
+        
+        recovered = Consciousness(durability_dir=tmp)
+        assert recovered.experience_count == 6
+        assert recovered.memory.get_memory_stats()["short_term_count"] == 6
+        assert recovered.wal.last_lsn >= 7
+        recovered.close()
+
+
+if __name__ == "__main__":
+    test_group_commit()
+    test_background_flush()
+    test_torn_tail_is_discarded()
+    test_consciousness_recovery()
+    test_checkpoint_compacts_log()
+    print("All write-ahead log tests passed!")
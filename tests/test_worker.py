@@ -0,0 +1,160 @@
+"""Tests for the background housekeeping worker"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stitcher_ai import Consciousness, InvertedIndex, MemorySystem
+from stitcher_ai.core.worker import BackgroundWorker
+
+
+def _wait_for(condition, timeout=5.0):
+    """Poll until condition() holds or the timeout expires"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_run_cycle():
+    """Test consolidation, compaction and pruning in one synchronous cycle"""
+    consciousness = Consciousness(memory=MemorySystem(short_term_capacity=5, text_index=InvertedIndex()))
+    responses = [consciousness.experience(f"stimulus number {i}") for i in range(20)]
+    recalled = responses[-1]["memory_id"]
+    consciousness.memory.retrieve(recalled)
+    
+    worker = BackgroundWorker(consciousness, max_history=8)
+    worker.run_cycle(throttle=False)
+    stats = worker.get_stats()
+    
+    assert stats["cycles"] == 1
+    assert stats["consolidated"] == 1
+    assert any(entry["id"] == recalled for entry in consciousness.memory.long_term_memory)
+    assert stats["compactions"] == 2
+    assert consciousness.memory.text_index.tombstones == 0
+    assert consciousness.memory.columns.dead == 0
+    assert len(consciousness.reasoning.reasoning_history) == 8
+    assert len(consciousness.awareness.introspection_log) == 8
+    assert stats["history_pruned"] == 24
+    assert stats["running"] is False
+    
+    # A second cycle finds nothing left to do
+    worker.run_cycle(throttle=False)
+    assert worker.get_stats()["consolidated"] == 1
+
+
+def test_background_thread():
+    """Test that the worker runs on schedule and reports through get_status"""
+    consciousness = Consciousness()
+    consciousness.experience("something worth remembering")
+    memory_id = consciousness.memory.short_term_memory[0]["id"]
+    consciousness.memory.retrieve(memory_id)
+    
+    worker = consciousness.start_background_worker(interval=0.02, idle_threshold=0.0)
+    try:
+        assert _wait_for(lambda: worker.get_stats()["cycles"] >= 2)
+        assert consciousness.memory.long_term_memory[0]["id"] == memory_id
+        status = consciousness.get_status()
+        assert status["background_worker"]["running"] is True
+        try:
+            consciousness.start_background_worker()
+            assert False, "a second worker should be rejected"
+        except ValueError:
+            pass
+    finally:
+        stats = consciousness.stop_background_worker()
+    assert stats["running"] is False
+    assert stats["consolidated"] == 1
+    assert consciousness.stop_background_worker() is None
+
+
+def test_pauses_under_load():
+    """Test that the worker defers while experiences keep arriving"""
+    consciousness = Consciousness()
+    worker = BackgroundWorker(consciousness, idle_threshold=0.05, max_deferral=0.2)
+    consciousness.last_activity = time.monotonic()
+    start = time.monotonic()
+    worker.run_cycle()
+    assert time.monotonic() - start >= 0.04
+    assert worker.get_stats()["deferrals"] >= 1
+    
+    # Continuous load cannot starve housekeeping beyond max_deferral
+    worker = BackgroundWorker(consciousness, idle_threshold=10.0, max_deferral=0.05)
+    consciousness.last_activity = time.monotonic()
+    worker.run_cycle()
+    stats = worker.get_stats()
+    assert stats["cycles"] == 1
+    assert stats["forced_slices"] >= 1
+
+
+def test_checkpoint():
+    """Test that the worker folds the write-ahead log into a snapshot"""
+    with tempfile.TemporaryDirectory() as directory:
+        consciousness = Consciousness(durability_dir=directory)
+        consciousness.experience("durable stimulus")
+        worker = BackgroundWorker(consciousness, checkpoint_interval=0.0)
+        worker.run_cycle(throttle=False)
+        assert worker.get_stats()["checkpoints"] == 1
+        assert consciousness.wal.size_bytes == 0
+        consciousness.close()
+        
+        restored = Consciousness(durability_dir=directory)
+        assert restored.experience_count == 1
+        assert restored.lock is restored.memory.lock
+        restored.close()
+
+
+def test_concurrent_readers():
+    """Test that memory reads are safe while the worker reorganizes memory"""
+    consciousness = Consciousness(memory=MemorySystem(short_term_capacity=20, text_index=InvertedIndex()))
+    memory = consciousness.memory
+    errors = []
+    stop = threading.Event()
+    
+    def write():
+        i = 0
+        while not stop.is_set():
+            response = consciousness.experience(f"stimulus number {i}")
+            memory.retrieve(response["memory_id"])
+            i += 1
+    
+    def read():
+        try:
+            while not stop.is_set():
+                memory.recall_by_tag("experience")
+                memory.recall_relevant(k=3)
+                memory.search("stimulus", k=3)
+                memory.query(tags=["experience"], limit=5).all()
+                memory.get_recent_memories(3)
+                consciousness.reflect()
+                consciousness.get_status()
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+    
+    worker = consciousness.start_background_worker(interval=0.0, duty_cycle=1.0, idle_threshold=0.0,
+                                                   max_deferral=0.0, max_history=16)
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    try:
+        assert _wait_for(lambda: worker.get_stats()["consolidated"] >= 50 or stop.is_set())
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        consciousness.stop_background_worker()
+    assert errors == []
+    assert worker.get_stats()["errors"] == 0
+
+
+if __name__ == "__main__":
+    test_run_cycle()
+    test_background_thread()
+    test_pauses_under_load()
+    test_checkpoint()
+    test_concurrent_readers()
+    print("All BackgroundWorker tests passed!")